@@ -0,0 +1,136 @@
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+CHECKPOINT_FILE_NAME = "checkpoint.json"
+# DuckDB database file and its spill directory are reused between resumed runs
+PERSISTENT_RUN_FILES_PREFIX = "db.duckdb"
+
+
+class RunCheckpoint:
+    """
+    Completed stages of a conversion kept in a persistent run directory.
+
+    Each completed stage saves its outputs (paths, SQL queries and reader state) together
+    with a list of directories existing at that moment. Directories created by a stage that
+    was interrupted are removed before resuming. Datasets deleted on purpose after their last
+    use are recorded, so they can be told apart from files missing unexpectedly.
+    """
+
+    def __init__(self, run_dir_path: Path) -> None:
+        """
+        Open checkpoint of the run directory.
+
+        Args:
+            run_dir_path (Path): Persistent directory with intermediate files of the run.
+        """
+        self.run_dir_path = run_dir_path
+        self.checkpoint_file_path = run_dir_path / CHECKPOINT_FILE_NAME
+        self.fingerprint: Optional[str] = None
+        self.stages: dict[str, Any] = {}
+        self.directories: list[str] = []
+        self.deleted_directories: list[str] = []
+        if self.checkpoint_file_path.exists():
+            checkpoint = json.loads(self.checkpoint_file_path.read_text())
+            self.fingerprint = checkpoint["fingerprint"]
+            self.stages = checkpoint["stages"]
+            self.directories = checkpoint["directories"]
+            self.deleted_directories = checkpoint["deleted_directories"]
+
+    @property
+    def last_completed_stage(self) -> Optional[str]:
+        """Name of the last completed stage."""
+        return next(reversed(self.stages), None)
+
+    def get_stale_paths(self, fingerprint: str) -> list[Path]:
+        """
+        Get paths of intermediate files that can't be reused by the run.
+
+        All files are stale if the checkpoint was saved for a different fingerprint,
+        otherwise only directories created after the last completed stage are stale.
+
+        Args:
+            fingerprint (str): Fingerprint of the input file and conversion parameters.
+
+        Returns:
+            list[Path]: Paths to remove before resuming.
+        """
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.stages = {}
+            self.directories = []
+            self.deleted_directories = []
+            self._save()
+
+        return [
+            path
+            for path in self.run_dir_path.iterdir()
+            if path.is_dir()
+            and path.name not in self.directories
+            and not path.name.startswith(PERSISTENT_RUN_FILES_PREFIX)
+        ]
+
+    def is_completed(self, stage: str) -> bool:
+        """Check if the stage has been completed."""
+        return stage in self.stages
+
+    def get_outputs(self, stage: str) -> Any:
+        """Get saved outputs of the completed stage."""
+        return self.stages[stage]
+
+    def complete(self, stage: str, outputs: Any) -> None:
+        """
+        Mark the stage as completed and save its outputs.
+
+        Args:
+            stage (str): Name of the stage.
+            outputs (Any): JSON serializable outputs of the stage.
+        """
+        self.stages[stage] = outputs
+        self.directories = sorted(
+            path.name for path in self.run_dir_path.iterdir() if path.is_dir()
+        )
+        # Datasets can be created again after being deleted (e.g. when retrying a stage)
+        self.deleted_directories = [
+            directory for directory in self.deleted_directories if directory not in self.directories
+        ]
+        self._save()
+
+    def mark_deleted(self, paths: Iterable[Path]) -> None:
+        """
+        Record datasets deleted on purpose after their last use.
+
+        Only directories placed directly in the run directory are datasets, other paths
+        are ignored.
+
+        Args:
+            paths (Iterable[Path]): Paths of deleted directories.
+        """
+        deleted_directories = {
+            path.name for path in paths if path.parent == self.run_dir_path
+        }.difference(self.deleted_directories)
+        if not deleted_directories:
+            return
+
+        self.deleted_directories = sorted([*self.deleted_directories, *deleted_directories])
+        self._save()
+
+    def get_deleted_paths(self) -> list[Path]:
+        """Get paths of datasets deleted on purpose after their last use."""
+        return [self.run_dir_path / directory for directory in self.deleted_directories]
+
+    def _save(self) -> None:
+        tmp_checkpoint_file_path = self.checkpoint_file_path.with_suffix(".json.tmp")
+        tmp_checkpoint_file_path.write_text(
+            json.dumps(
+                {
+                    "fingerprint": self.fingerprint,
+                    "stages": self.stages,
+                    "directories": self.directories,
+                    "deleted_directories": self.deleted_directories,
+                }
+            )
+        )
+        # Replacing the file is atomic, so interrupted save doesn't corrupt the checkpoint
+        tmp_checkpoint_file_path.replace(self.checkpoint_file_path)
@@ -10,6 +10,9 @@ class GeometryNotCoveredError(Exception): ...
 class InvalidGeometryFilter(Exception): ...
 
 
+class InconsistentCheckpointError(RuntimeError): ...
+
+
 class MultiprocessingRuntimeError(RuntimeError): ...
 
 
@@ -1,31 +1,333 @@
+from collections.abc import Iterable
 from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Literal, NamedTuple, Optional
 
-import geoarrow.pyarrow as ga
+import numpy as np
 import pyarrow as pa
-from shapely import STRtree
+import pyarrow.parquet as pq
+import shapely
 from shapely.geometry.base import BaseGeometry
 
-from quackosm._parquet_multiprocessing import map_parquet_dataset
+from quackosm._parquet_multiprocessing import (
+    RESULT_FILE_FORMAT,
+    ParquetWorkerPool,
+    map_parquet_dataset,
+)
 from quackosm._rich_progress import TaskProgressBar
 
+INTERSECTION_ENGINE = Literal["auto", "python", "duckdb"]
+
+GEOMETRY_FILTER_GRID_SIZE = 512
+GRID_CELL_OUTSIDE = 0
+GRID_CELL_INSIDE = 1
+GRID_CELL_BOUNDARY = 2
+# Cells are classified slightly enlarged, so rounding errors while assigning points
+# to cells can't change the result.
+GRID_CELL_MARGIN_RATIO = 0.01
+# Geometries with at least this number of polygons are kept as separate parts
+# of a polygon set instead of being dissolved into a single union.
+POLYGON_SET_MIN_PARTS = 256
+
+_cached_polygon_set_tree: Optional[tuple[BaseGeometry, shapely.STRtree]] = None
+
+
+def is_polygon_set(geometry: BaseGeometry) -> bool:
+    """Check if geometry is a polygon set with separate (possibly overlapping) parts."""
+    return geometry.geom_type == "GeometryCollection" and bool(
+        np.isin(
+            shapely.get_type_id(shapely.get_parts(geometry)),
+            (shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON),
+        ).all()
+    )
+
+
+def merge_geometries(geometries: Iterable[BaseGeometry]) -> BaseGeometry:
+    """
+    Merge geometries into a single geometry filter.
+
+    Small number of polygons is dissolved into a single union. Bigger sets are kept
+    as separate parts of a polygon set (`GeometryCollection`), since calculating
+    the union of thousands of polygons is slow and results in a huge multipolygon.
+
+    Args:
+        geometries (Iterable[BaseGeometry]): Geometries to merge.
+
+    Returns:
+        BaseGeometry: Union of the geometries or a polygon set.
+    """
+    parts = shapely.get_parts(np.array(list(geometries), dtype=object))
+    if len(parts) >= POLYGON_SET_MIN_PARTS:
+        return shapely.geometrycollections(parts)
+
+    return shapely.union_all(parts)
+
+
+def clip_polygon_set(polygon_set: BaseGeometry, geometry: BaseGeometry) -> BaseGeometry:
+    """Clip polygon set parts with a geometry, without dissolving parts together."""
+    parts = shapely.get_parts(polygon_set)
+    clipped_parts = shapely.intersection(
+        parts[_get_polygon_set_tree(polygon_set).query(geometry, predicate="intersects")],
+        geometry,
+    )
+    return shapely.geometrycollections(
+        shapely.get_parts(clipped_parts[~shapely.is_empty(clipped_parts)])
+    )
+
+
+def _get_polygon_set_tree(polygon_set: BaseGeometry) -> shapely.STRtree:
+    # Tree is built only once per process for the same polygon set object
+    global _cached_polygon_set_tree  # noqa: PLW0603
+    if _cached_polygon_set_tree is None or _cached_polygon_set_tree[0] is not polygon_set:
+        _cached_polygon_set_tree = (polygon_set, shapely.STRtree(shapely.get_parts(polygon_set)))
+    return _cached_polygon_set_tree[1]
+
+
+def _intersects_xy(geometry_filter: BaseGeometry, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    if not is_polygon_set(geometry_filter):
+        return shapely.intersects_xy(geometry_filter, x, y)
+
+    points_indices, _ = _get_polygon_set_tree(geometry_filter).query(
+        shapely.points(x, y), predicate="intersects"
+    )
+    is_intersecting = np.zeros(len(x), dtype=bool)
+    is_intersecting[points_indices] = True
+    return is_intersecting
+
+
+def _intersects_geometries(geometry_filter: BaseGeometry, geometries: np.ndarray) -> np.ndarray:
+    if not is_polygon_set(geometry_filter):
+        return shapely.intersects(geometry_filter, geometries)
+
+    geometries_indices, _ = _get_polygon_set_tree(geometry_filter).query(
+        geometries, predicate="intersects"
+    )
+    is_intersecting = np.zeros(len(geometries), dtype=bool)
+    is_intersecting[geometries_indices] = True
+    return is_intersecting
+
+
+class GeometryFilterGrid(NamedTuple):
+    """Regular grid over the geometry filter bounds with classified cells."""
+
+    bounds: tuple[float, float, float, float]
+    cells: np.ndarray
+
+
+def build_geometry_filter_grid(
+    geometry_filter: BaseGeometry, grid_size: int = GEOMETRY_FILTER_GRID_SIZE
+) -> GeometryFilterGrid:
+    """
+    Classify grid cells as fully inside, fully outside or on the boundary of the geometry.
+
+    Args:
+        geometry_filter (BaseGeometry): Geometry used for filtering.
+        grid_size (int, optional): Number of cells along each axis of the geometry bounds.
+            Defaults to `GEOMETRY_FILTER_GRID_SIZE`.
+
+    Returns:
+        GeometryFilterGrid: Geometry bounds with an array of cells classes.
+    """
+    min_x, min_y, max_x, max_y = geometry_filter.bounds
+    columns = grid_size if max_x > min_x else 1
+    rows = grid_size if max_y > min_y else 1
+    cell_width = (max_x - min_x) / columns
+    cell_height = (max_y - min_y) / rows
+    margin = max(cell_width, cell_height) * GRID_CELL_MARGIN_RATIO
+
+    cells_min_x, cells_min_y = np.meshgrid(
+        min_x + np.arange(columns) * cell_width, min_y + np.arange(rows) * cell_height
+    )
+    cells_boxes = shapely.box(
+        cells_min_x.ravel() - margin,
+        cells_min_y.ravel() - margin,
+        cells_min_x.ravel() + cell_width + margin,
+        cells_min_y.ravel() + cell_height + margin,
+    )
+
+    cells = np.full(len(cells_boxes), GRID_CELL_OUTSIDE, dtype=np.uint8)
+    if is_polygon_set(geometry_filter):
+        # Each part is tested only with cells covering its bounds,
+        # cell is inside only if it's inside of a single part of the polygon set
+        is_intersecting = np.zeros(len(cells_boxes), dtype=bool)
+        is_inside = np.zeros(len(cells_boxes), dtype=bool)
+        for part in shapely.get_parts(geometry_filter):
+            part_min_x, part_min_y, part_max_x, part_max_y = part.bounds
+            # Neighbouring cells are included, since cells are enlarged with the margin
+            first_column, last_column = _cells_range(
+                part_min_x, part_max_x, min_x, cell_width, columns
+            )
+            first_row, last_row = _cells_range(part_min_y, part_max_y, min_y, cell_height, rows)
+            part_cells_indices = (
+                np.arange(first_row, last_row + 1)[:, None] * columns
+                + np.arange(first_column, last_column + 1)[None, :]
+            ).ravel()
+
+            shapely.prepare(part)
+            part_cells_indices = part_cells_indices[
+                shapely.intersects(part, cells_boxes[part_cells_indices])
+            ]
+            is_intersecting[part_cells_indices] = True
+            is_inside[
+                part_cells_indices[shapely.contains_properly(part, cells_boxes[part_cells_indices])]
+            ] = True
+        cells[is_intersecting] = GRID_CELL_BOUNDARY
+        cells[is_inside] = GRID_CELL_INSIDE
+    else:
+        shapely.prepare(geometry_filter)
+        is_intersecting = shapely.intersects(geometry_filter, cells_boxes)
+        cells[is_intersecting] = GRID_CELL_BOUNDARY
+        is_inside = shapely.contains_properly(geometry_filter, cells_boxes[is_intersecting])
+        cells[np.flatnonzero(is_intersecting)[is_inside]] = GRID_CELL_INSIDE
+
+    return GeometryFilterGrid(
+        bounds=(min_x, min_y, max_x, max_y), cells=cells.reshape(rows, columns)
+    )
+
+
+def _cells_range(
+    min_value: float, max_value: float, grid_min_value: float, cell_size: float, size: int
+) -> tuple[int, int]:
+    if cell_size == 0:
+        return 0, size - 1
+
+    first_cell = int((min_value - grid_min_value) / cell_size) - 1
+    last_cell = int((max_value - grid_min_value) / cell_size) + 1
+    return max(first_cell, 0), min(last_cell, size - 1)
+
+
+def load_geometry_filter_grid(
+    geometry_filter: BaseGeometry, cache_path: Optional[Path] = None
+) -> GeometryFilterGrid:
+    """
+    Load geometry filter grid from the cache or build it and save it in the cache.
+
+    Args:
+        geometry_filter (BaseGeometry): Geometry used for filtering.
+        cache_path (Optional[Path], optional): Path of the cached grid file. If `None`,
+            grid won't be cached. Defaults to `None`.
+
+    Returns:
+        GeometryFilterGrid: Geometry bounds with an array of cells classes.
+    """
+    if cache_path is not None and cache_path.exists():
+        with np.load(cache_path) as cached_grid:
+            return GeometryFilterGrid(
+                bounds=tuple(cached_grid["bounds"].tolist()), cells=cached_grid["cells"]
+            )
+
+    grid = build_geometry_filter_grid(geometry_filter)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_cache_path = cache_path.with_name(f"{cache_path.stem}_tmp.npz")
+        np.savez(tmp_cache_path, bounds=np.array(grid.bounds), cells=grid.cells)
+        tmp_cache_path.replace(cache_path)
+
+    return grid
+
+
+def _classify_points_with_grid(
+    grid: GeometryFilterGrid, x: np.ndarray, y: np.ndarray
+) -> np.ndarray:
+    min_x, min_y, max_x, max_y = grid.bounds
+    rows, columns = grid.cells.shape
+    is_in_bounds = (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+
+    x_scale = columns / (max_x - min_x) if max_x > min_x else 0
+    y_scale = rows / (max_y - min_y) if max_y > min_y else 0
+    column_indices = np.minimum(((x[is_in_bounds] - min_x) * x_scale).astype(np.int64), columns - 1)
+    row_indices = np.minimum(((y[is_in_bounds] - min_y) * y_scale).astype(np.int64), rows - 1)
+
+    points_classes = np.full(len(x), GRID_CELL_OUTSIDE, dtype=np.uint8)
+    points_classes[is_in_bounds] = grid.cells[row_indices, column_indices]
+    return points_classes
+
+
+def _classify_bboxes_with_grid(
+    grid: GeometryFilterGrid,
+    bboxes_min_x: np.ndarray,
+    bboxes_min_y: np.ndarray,
+    bboxes_max_x: np.ndarray,
+    bboxes_max_y: np.ndarray,
+) -> np.ndarray:
+    min_x, min_y, max_x, max_y = grid.bounds
+    rows, columns = grid.cells.shape
+    is_in_bounds = (
+        (bboxes_max_x >= min_x)
+        & (bboxes_min_x <= max_x)
+        & (bboxes_max_y >= min_y)
+        & (bboxes_min_y <= max_y)
+    )
+    is_within_bounds = (
+        (bboxes_min_x >= min_x)
+        & (bboxes_max_x <= max_x)
+        & (bboxes_min_y >= min_y)
+        & (bboxes_max_y <= max_y)
+    )
+
+    x_scale = columns / (max_x - min_x) if max_x > min_x else 0
+    y_scale = rows / (max_y - min_y) if max_y > min_y else 0
+
+    def _cell_indices(values: np.ndarray, min_value: float, scale: float, size: int) -> np.ndarray:
+        return np.clip(((values - min_value) * scale).astype(np.int64), 0, size - 1)
+
+    first_columns = _cell_indices(bboxes_min_x[is_in_bounds], min_x, x_scale, columns)
+    last_columns = _cell_indices(bboxes_max_x[is_in_bounds], min_x, x_scale, columns)
+    first_rows = _cell_indices(bboxes_min_y[is_in_bounds], min_y, y_scale, rows)
+    last_rows = _cell_indices(bboxes_max_y[is_in_bounds], min_y, y_scale, rows)
+    number_of_cells = (last_columns - first_columns + 1) * (last_rows - first_rows + 1)
+
+    # Summed-area tables count cells of a given class in any range of cells in constant time
+    def _count_cells(cell_class: int) -> np.ndarray:
+        summed_area = np.zeros((rows + 1, columns + 1), dtype=np.int64)
+        summed_area[1:, 1:] = (grid.cells == cell_class).cumsum(axis=0).cumsum(axis=1)
+        return (
+            summed_area[last_rows + 1, last_columns + 1]
+            - summed_area[first_rows, last_columns + 1]
+            - summed_area[last_rows + 1, first_columns]
+            + summed_area[first_rows, first_columns]
+        )
+
+    in_bounds_classes = np.full(len(number_of_cells), GRID_CELL_BOUNDARY, dtype=np.uint8)
+    in_bounds_classes[_count_cells(GRID_CELL_OUTSIDE) == number_of_cells] = GRID_CELL_OUTSIDE
+    in_bounds_classes[
+        (_count_cells(GRID_CELL_INSIDE) == number_of_cells) & is_within_bounds[is_in_bounds]
+    ] = GRID_CELL_INSIDE
+
+    bboxes_classes = np.full(len(bboxes_min_x), GRID_CELL_OUTSIDE, dtype=np.uint8)
+    bboxes_classes[is_in_bounds] = in_bounds_classes
+    return bboxes_classes
+
 
 def _intersect_nodes(
     table: pa.Table,
     geometry_filter: BaseGeometry,
+    geometry_filter_grid: Optional[GeometryFilterGrid] = None,
 ) -> pa.Table:  # pragma: no cover
-    points_array = ga.to_geopandas(
-        ga.point().from_geobuffers(
-            None,
-            x=table["lon"].to_numpy(),
-            y=table["lat"].to_numpy(),
-        )
-    )
+    # Geometry is prepared only once per worker, since the same object is reused
+    # for all row groups processed by the worker.
+    shapely.prepare(geometry_filter)
 
-    tree = STRtree(points_array)
+    x = table["lon"].to_numpy()
+    y = table["lat"].to_numpy()
 
-    intersecting_ids_array = table["id"].take(tree.query(geometry_filter, predicate="intersects"))
+    if geometry_filter_grid is None:
+        min_x, min_y, max_x, max_y = geometry_filter.bounds
+        candidates_indices = np.flatnonzero(
+            (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+        )
+        inside_indices = np.array([], dtype=np.int64)
+    else:
+        points_classes = _classify_points_with_grid(geometry_filter_grid, x, y)
+        candidates_indices = np.flatnonzero(points_classes == GRID_CELL_BOUNDARY)
+        inside_indices = np.flatnonzero(points_classes == GRID_CELL_INSIDE)
+
+    is_intersecting = _intersects_xy(geometry_filter, x[candidates_indices], y[candidates_indices])
+    intersecting_indices = np.sort(
+        np.concatenate((inside_indices, candidates_indices[is_intersecting]))
+    )
+    intersecting_ids_array = table["id"].take(intersecting_indices)
 
     return pa.table({"id": intersecting_ids_array})
 
@@ -34,23 +336,139 @@ def intersect_nodes_with_geometry(
     tmp_dir_path: Path,
     geometry_filter: BaseGeometry,
     progress_bar: Optional[TaskProgressBar] = None,
+    geometry_filter_grid_cache_path: Optional[Path] = None,
+    dataset_path: Optional[Path] = None,
+    worker_pool: Optional[ParquetWorkerPool] = None,
+    result_format: RESULT_FILE_FORMAT = "parquet",
 ) -> None:
     """
-    Intersects nodes points with geometry filter using spatial index with multiprocessing.
+    Intersects nodes points with geometry filter using prepared geometry with multiprocessing.
+
+    Points in grid cells fully inside or fully outside of the geometry filter are classified
+    without testing the geometry, only points in cells on the boundary are tested exactly.
+    Polygon sets are tested with an STRtree of their parts.
 
     Args:
         tmp_dir_path (Path): Path of the working directory.
         geometry_filter (BaseGeometry): Geometry used for filtering.
         progress_bar (Optional[TaskProgressBar]): Progress bar to show task status.
             Defaults to `None`
+        geometry_filter_grid_cache_path (Optional[Path]): Path of the cached geometry filter
+            grid. If `None`, grid won't be cached. Defaults to `None`.
+        dataset_path (Optional[Path]): Path of the nodes dataset to intersect. If `None`,
+            `nodes_valid_with_tags` dataset from the working directory is used.
+            Defaults to `None`.
+        worker_pool (Optional[ParquetWorkerPool]): Existing pool of workers to reuse.
+            If `None`, a new pool will be started. Defaults to `None`.
+        result_format (RESULT_FILE_FORMAT): Format of the saved intersecting nodes ids.
+            Defaults to "parquet".
     """
-    dataset_path = tmp_dir_path / "nodes_valid_with_tags"
+    dataset_path = dataset_path or tmp_dir_path / "nodes_valid_with_tags"
     destination_path = tmp_dir_path / "nodes_intersecting_ids"
 
+    geometry_filter_grid = load_geometry_filter_grid(
+        geometry_filter, cache_path=geometry_filter_grid_cache_path
+    )
+
     map_parquet_dataset(
         dataset_path=dataset_path,
         destination_path=destination_path,
         progress_bar=progress_bar,
-        function=partial(_intersect_nodes, geometry_filter=geometry_filter),
+        function=partial(
+            _intersect_nodes,
+            geometry_filter=geometry_filter,
+            geometry_filter_grid=geometry_filter_grid,
+        ),
         columns=["id", "lat", "lon"],
+        worker_pool=worker_pool,
+        result_format=result_format,
     )
+
+    if not any(destination_path.iterdir()):
+        empty_table = pa.table({"id": pa.array([], type=pa.int64())})
+        if result_format == "arrow":
+            with pa.ipc.new_file(destination_path / "empty.arrow", empty_table.schema) as writer:
+                writer.write_table(empty_table)
+        else:
+            pq.write_table(empty_table, destination_path / "empty.parquet")
+
+
+def classify_ways_bboxes_with_geometry(
+    dataset_path: Path,
+    destination_path: Path,
+    geometry_filter: BaseGeometry,
+    geometry_filter_grid_cache_path: Optional[Path] = None,
+) -> None:
+    """
+    Classifies ways bounding boxes as inside, outside or on the boundary of geometry filter.
+
+    Bounding boxes are classified using only the geometry filter grid. Ways with bounding
+    boxes fully inside of the geometry filter always intersect it, ways with bounding boxes
+    fully outside never do, and only ways on the boundary have to be checked further.
+    Ids of ways outside of the geometry filter aren't saved.
+
+    Args:
+        dataset_path (Path): Path of the ways bounding boxes dataset with `id`, `min_lon`,
+            `min_lat`, `max_lon` and `max_lat` columns.
+        destination_path (Path): Path of the destination with `id` and `bbox_class` columns.
+        geometry_filter (BaseGeometry): Geometry used for filtering.
+        geometry_filter_grid_cache_path (Optional[Path]): Path of the cached geometry filter
+            grid. If `None`, grid won't be cached. Defaults to `None`.
+    """
+    geometry_filter_grid = load_geometry_filter_grid(
+        geometry_filter, cache_path=geometry_filter_grid_cache_path
+    )
+    result_schema = pa.schema([("id", pa.int64()), ("bbox_class", pa.uint8())])
+
+    destination_path.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(destination_path / "data_0.parquet", result_schema) as writer:
+        for pq_file in pq.ParquetDataset(dataset_path).files:
+            for batch in pq.ParquetFile(pq_file).iter_batches(
+                columns=["id", "min_lon", "min_lat", "max_lon", "max_lat"]
+            ):
+                bboxes_classes = _classify_bboxes_with_grid(
+                    geometry_filter_grid,
+                    batch["min_lon"].to_numpy(),
+                    batch["min_lat"].to_numpy(),
+                    batch["max_lon"].to_numpy(),
+                    batch["max_lat"].to_numpy(),
+                )
+                not_outside_indices = np.flatnonzero(bboxes_classes != GRID_CELL_OUTSIDE)
+                writer.write_table(
+                    pa.table(
+                        {
+                            "id": batch["id"].take(not_outside_indices),
+                            "bbox_class": bboxes_classes[not_outside_indices],
+                        },
+                        schema=result_schema,
+                    )
+                )
+
+
+def intersect_lines_with_geometry(
+    lines_reader: pa.RecordBatchReader,
+    destination_path: Path,
+    geometry_filter: BaseGeometry,
+) -> None:
+    """
+    Intersects lines with geometry filter and saves ids of intersecting ones.
+
+    Polygon sets are tested with an STRtree of their parts, so only parts with bounding
+    boxes touching a line are tested exactly.
+
+    Args:
+        lines_reader (pa.RecordBatchReader): Batches with `id` and `wkb` line geometry columns.
+        destination_path (Path): Path of the destination with `id` column.
+        geometry_filter (BaseGeometry): Geometry used for filtering.
+    """
+    shapely.prepare(geometry_filter)
+    result_schema = pa.schema([("id", pa.int64())])
+
+    destination_path.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(destination_path / "data_0.parquet", result_schema) as writer:
+        for batch in lines_reader:
+            lines = shapely.from_wkb(batch["wkb"].to_numpy(zero_copy_only=False))
+            intersecting_indices = np.flatnonzero(_intersects_geometries(geometry_filter, lines))
+            writer.write_table(
+                pa.table({"id": batch["id"].take(intersecting_indices)}, schema=result_schema)
+            )
@@ -0,0 +1,179 @@
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pyarrow.parquet as pq
+
+# Coordinates are saved as unsigned integers shifted by this offset,
+# so zero-filled (sparse) parts of the memory-mapped file mean missing nodes.
+COORDINATES_OFFSET = 2_000_000_000
+# Dense index is used if at least this fraction of ids in the ids range exist.
+DENSE_INDEX_MINIMAL_FILL_RATIO = 0.25
+
+
+class NodesLocationsIndex:
+    """
+    Memory-mapped index of nodes locations.
+
+    Coordinates are stored as integers with 1e-7 degree precision. Dense index keeps
+    coordinates in an array indexed directly by the node id, sparse index keeps sorted
+    nodes ids next to coordinates and uses binary search for lookups.
+    """
+
+    def __init__(self, index_dir_path: Union[str, Path]) -> None:
+        """
+        Open existing nodes locations index.
+
+        Args:
+            index_dir_path (Union[str, Path]): Directory with saved index files.
+        """
+        index_dir_path = Path(index_dir_path)
+        metadata = np.load(index_dir_path / "metadata.npy")
+        self.min_id, self.number_of_nodes, self.is_dense = (
+            int(metadata[0]),
+            int(metadata[1]),
+            bool(metadata[2]),
+        )
+        coordinates_length = int(metadata[3]) if self.is_dense else max(self.number_of_nodes, 1)
+        self.coordinates = np.memmap(
+            index_dir_path / "coordinates.bin",
+            dtype=np.uint32,
+            mode="r",
+            shape=(coordinates_length, 2),
+        )
+        self.ids = (
+            None
+            if self.is_dense
+            else np.memmap(
+                index_dir_path / "ids.bin",
+                dtype=np.int64,
+                mode="r",
+                shape=(max(self.number_of_nodes, 1),),
+            )
+        )
+
+    @classmethod
+    def build(
+        cls, nodes_locations_files: list[Path], index_dir_path: Union[str, Path]
+    ) -> "NodesLocationsIndex":
+        """
+        Build nodes locations index from parquet files.
+
+        Args:
+            nodes_locations_files (list[Path]): Parquet files with `id` and fixed-point
+                `lon` and `lat` columns. Files sorted by id with separate ids ranges are
+                copied directly, otherwise sparse index is sorted after copying.
+            index_dir_path (Union[str, Path]): Directory where index files will be saved.
+
+        Returns:
+            NodesLocationsIndex: Opened index.
+        """
+        index_dir_path = Path(index_dir_path)
+        index_dir_path.mkdir(parents=True, exist_ok=True)
+
+        files_with_ranges = []
+        for file_path in nodes_locations_files:
+            metadata = pq.ParquetFile(file_path).metadata
+            if metadata.num_rows == 0:
+                continue
+            id_column_index = metadata.schema.names.index("id")
+            row_groups_statistics = [
+                metadata.row_group(row_group_index).column(id_column_index).statistics
+                for row_group_index in range(metadata.num_row_groups)
+            ]
+            files_with_ranges.append(
+                (
+                    min(statistics.min for statistics in row_groups_statistics),
+                    max(statistics.max for statistics in row_groups_statistics),
+                    metadata.num_rows,
+                    file_path,
+                )
+            )
+        files_with_ranges.sort()
+
+        number_of_nodes = sum(file_range[2] for file_range in files_with_ranges)
+        min_id = files_with_ranges[0][0] if files_with_ranges else 0
+        max_id = max((file_range[1] for file_range in files_with_ranges), default=0)
+        ids_range_length = max_id - min_id + 1
+        is_dense = number_of_nodes >= ids_range_length * DENSE_INDEX_MINIMAL_FILL_RATIO
+
+        coordinates = np.memmap(
+            index_dir_path / "coordinates.bin",
+            dtype=np.uint32,
+            mode="w+",
+            shape=(ids_range_length if is_dense else max(number_of_nodes, 1), 2),
+        )
+        ids = (
+            None
+            if is_dense
+            else np.memmap(
+                index_dir_path / "ids.bin",
+                dtype=np.int64,
+                mode="w+",
+                shape=(max(number_of_nodes, 1),),
+            )
+        )
+
+        position = 0
+        for _, _, _, file_path in files_with_ranges:
+            for batch in pq.ParquetFile(file_path).iter_batches(columns=["id", "lon", "lat"]):
+                batch_ids = batch.column("id").to_numpy()
+                batch_coordinates = np.column_stack(
+                    (
+                        batch.column("lon").to_numpy().astype(np.int64) + COORDINATES_OFFSET,
+                        batch.column("lat").to_numpy().astype(np.int64) + COORDINATES_OFFSET,
+                    )
+                ).astype(np.uint32)
+                if ids is None:
+                    coordinates[batch_ids - min_id] = batch_coordinates
+                else:
+                    ids[position : position + len(batch_ids)] = batch_ids
+                    coordinates[position : position + len(batch_ids)] = batch_coordinates
+                position += len(batch_ids)
+
+        if ids is not None and np.any(ids[1:] < ids[:-1]):
+            sorted_positions = np.argsort(ids, kind="stable")
+            ids[:] = ids[sorted_positions]
+            coordinates[:] = coordinates[sorted_positions]
+            del sorted_positions
+
+        coordinates.flush()
+        if ids is not None:
+            ids.flush()
+        del coordinates, ids
+
+        np.save(
+            index_dir_path / "metadata.npy",
+            np.array([min_id, number_of_nodes, int(is_dense), ids_range_length], dtype=np.int64),
+        )
+
+        return cls(index_dir_path)
+
+    def lookup(self, nodes_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find locations of nodes.
+
+        Args:
+            nodes_ids (np.ndarray): Array of nodes ids.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Boolean mask of found nodes and an array
+                of fixed-point (lon, lat) pairs for found nodes.
+        """
+        nodes_ids = np.asarray(nodes_ids, dtype=np.int64)
+        if self.number_of_nodes == 0:
+            return np.zeros(len(nodes_ids), dtype=bool), np.empty((0, 2), dtype=np.int64)
+
+        if self.ids is None:
+            positions = nodes_ids - self.min_id
+            is_in_range = (positions >= 0) & (positions < len(self.coordinates))
+        else:
+            positions = np.searchsorted(self.ids, nodes_ids)
+            is_in_range = positions < self.number_of_nodes
+            is_in_range[is_in_range] = self.ids[positions[is_in_range]] == nodes_ids[is_in_range]
+
+        coordinates = self.coordinates[positions[is_in_range]]
+        is_found = is_in_range.copy()
+        is_found[is_in_range] = coordinates[:, 0] != 0
+
+        return is_found, (coordinates[coordinates[:, 0] != 0].astype(np.int64) - COORDINATES_OFFSET)
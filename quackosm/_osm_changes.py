@@ -0,0 +1,217 @@
+import gzip
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from quackosm._constants import FEATURES_INDEX, GEOMETRY_COLUMN
+
+OSM_CHANGE_ACTIONS = ("create", "modify", "delete")
+OSM_ELEMENT_KINDS = ("node", "way", "relation")
+DECODED_PBF_STATE_METADATA_KEY = b"quackosm:decoded_pbf_state"
+
+DECODED_ELEMENTS_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("tags", pa.map_(pa.string(), pa.string())),
+        ("refs", pa.list_(pa.int64())),
+        ("ref_roles", pa.list_(pa.string())),
+        ("ref_types", pa.list_(pa.string())),
+        ("lon", pa.float64()),
+        ("lat", pa.float64()),
+    ]
+)
+
+
+class OsmChanges(NamedTuple):
+    """Elements changed in the osmChange file, with the last state of each element."""
+
+    changed_elements: dict[str, pa.Table]
+    changed_ids: dict[str, list[int]]
+
+
+def read_osm_changes(osc_path: Union[str, Path]) -> OsmChanges:
+    """
+    Read osmChange (`*.osc` or `*.osc.gz`) file.
+
+    If an element changes multiple times in the file, only the last change is kept.
+
+    Args:
+        osc_path (Union[str, Path]): Path of the osmChange file.
+
+    Returns:
+        OsmChanges: Created and modified elements in the decoded PBF schema, and ids
+            of all created, modified and deleted elements, split by element kind.
+    """
+    osc_path = Path(osc_path)
+    last_changes: dict[str, dict[int, Optional[dict[str, Any]]]] = {
+        kind: {} for kind in OSM_ELEMENT_KINDS
+    }
+
+    opener = gzip.open if osc_path.suffix == ".gz" else open
+    with opener(osc_path, "rb") as osc_file:
+        current_action = None
+        for event, element in ET.iterparse(osc_file, events=("start", "end")):
+            if event == "start":
+                if element.tag in OSM_CHANGE_ACTIONS:
+                    current_action = element.tag
+                continue
+
+            if element.tag in OSM_CHANGE_ACTIONS:
+                current_action = None
+                element.clear()
+            elif element.tag in OSM_ELEMENT_KINDS and current_action is not None:
+                element_id = int(element.attrib["id"])
+                last_changes[element.tag].pop(element_id, None)
+                last_changes[element.tag][element_id] = (
+                    None if current_action == "delete" else _parse_osm_element(element)
+                )
+                element.clear()
+
+    return OsmChanges(
+        changed_elements={
+            kind: pa.Table.from_pylist(
+                [
+                    {"id": element_id, **element}
+                    for element_id, element in kind_changes.items()
+                    if element is not None
+                ],
+                schema=DECODED_ELEMENTS_SCHEMA,
+            )
+            for kind, kind_changes in last_changes.items()
+        },
+        changed_ids={
+            kind: list(kind_changes.keys()) for kind, kind_changes in last_changes.items()
+        },
+    )
+
+
+def _parse_osm_element(element: ET.Element) -> dict[str, Any]:
+    tags = [(tag.attrib["k"], tag.attrib["v"]) for tag in element.iter("tag")]
+    parsed_element: dict[str, Any] = {"tags": tags or None}
+
+    if element.tag == "node":
+        parsed_element["lon"] = float(element.attrib["lon"])
+        parsed_element["lat"] = float(element.attrib["lat"])
+    elif element.tag == "way":
+        parsed_element["refs"] = [int(nd.attrib["ref"]) for nd in element.iter("nd")]
+    else:
+        members = list(element.iter("member"))
+        parsed_element["refs"] = [int(member.attrib["ref"]) for member in members]
+        parsed_element["ref_roles"] = [member.attrib.get("role", "") for member in members]
+        parsed_element["ref_types"] = [member.attrib["type"] for member in members]
+
+    return parsed_element
+
+
+def get_decoded_pbf_state(result_file_path: Union[str, Path]) -> Optional[str]:
+    """Read key of the decoded PBF state saved in the result file metadata."""
+    metadata = pq.read_schema(result_file_path).metadata or {}
+    state = metadata.get(DECODED_PBF_STATE_METADATA_KEY)
+    return state.decode() if state is not None else None
+
+
+def replace_features_in_parquet_file(
+    result_file_path: Union[str, Path],
+    changed_features_path: Optional[Union[str, Path]],
+    affected_feature_ids: set[str],
+    decoded_pbf_state: str,
+) -> None:
+    """
+    Replace affected features in the result file with rebuilt ones.
+
+    Row groups without affected features are copied without changes, affected row groups
+    are saved without affected features and rebuilt features are appended at the end.
+
+    Args:
+        result_file_path (Union[str, Path]): Path of the result file to update.
+        changed_features_path (Optional[Union[str, Path]]): Path of the file with rebuilt
+            features. If `None`, affected features will be only removed.
+        affected_feature_ids (set[str]): Ids of all features affected by changes.
+        decoded_pbf_state (str): Key of the decoded PBF state saved in the result metadata.
+    """
+    result_file_path = Path(result_file_path)
+    result_file = pq.ParquetFile(result_file_path)
+    changed_features = (
+        pq.read_table(changed_features_path) if changed_features_path is not None else None
+    )
+
+    schemas = [result_file.schema_arrow]
+    if changed_features is not None:
+        schemas.append(changed_features.schema)
+    unified_schema = pa.unify_schemas(schemas)
+    fields = [field for field in unified_schema if field.name != GEOMETRY_COLUMN]
+    fields.append(unified_schema.field(GEOMETRY_COLUMN))
+    unified_schema = pa.schema(fields).with_metadata(
+        {
+            **(result_file.schema_arrow.metadata or {}),
+            b"geo": _merge_geo_metadata(
+                result_file.schema_arrow.metadata,
+                changed_features.schema.metadata if changed_features is not None else None,
+            ),
+            DECODED_PBF_STATE_METADATA_KEY: decoded_pbf_state.encode(),
+        }
+    )
+    affected_feature_ids_array = pa.array(list(affected_feature_ids), type=pa.string())
+
+    tmp_result_file_path = result_file_path.with_name(f"{result_file_path.name}.tmp")
+    with pq.ParquetWriter(tmp_result_file_path, unified_schema) as writer:
+        for row_group_index in range(result_file.num_row_groups):
+            row_group = result_file.read_row_group(row_group_index)
+            is_affected = pc.is_in(row_group[FEATURES_INDEX], value_set=affected_feature_ids_array)
+            if pc.any(is_affected).as_py():
+                row_group = row_group.filter(pc.invert(is_affected))
+            if row_group.num_rows > 0:
+                writer.write_table(_conform_table_to_schema(row_group, unified_schema))
+
+        if changed_features is not None and changed_features.num_rows > 0:
+            writer.write_table(_conform_table_to_schema(changed_features, unified_schema))
+
+    tmp_result_file_path.replace(result_file_path)
+
+
+def _conform_table_to_schema(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    return pa.table(
+        [
+            (
+                table[field.name].cast(field.type)
+                if field.name in table.column_names
+                else pa.nulls(table.num_rows, type=field.type)
+            )
+            for field in schema
+        ],
+        schema=schema,
+    )
+
+
+def _merge_geo_metadata(
+    result_metadata: Optional[dict[bytes, bytes]],
+    changed_features_metadata: Optional[dict[bytes, bytes]],
+) -> bytes:
+    if not result_metadata or b"geo" not in result_metadata:
+        return (changed_features_metadata or {}).get(b"geo", b"{}")
+
+    geo_metadata = json.loads(result_metadata[b"geo"])
+    if not changed_features_metadata or b"geo" not in changed_features_metadata:
+        return result_metadata[b"geo"]
+
+    result_column = geo_metadata["columns"][GEOMETRY_COLUMN]
+    changed_column = json.loads(changed_features_metadata[b"geo"])["columns"][GEOMETRY_COLUMN]
+
+    result_column["geometry_types"] = sorted(
+        set(result_column.get("geometry_types", [])) | set(changed_column.get("geometry_types", []))
+    )
+    if "bbox" in result_column and "bbox" in changed_column:
+        result_bbox, changed_bbox = result_column["bbox"], changed_column["bbox"]
+        result_column["bbox"] = [
+            min(result_bbox[0], changed_bbox[0]),
+            min(result_bbox[1], changed_bbox[1]),
+            max(result_bbox[2], changed_bbox[2]),
+            max(result_bbox[3], changed_bbox[3]),
+        ]
+
+    return json.dumps(geo_metadata).encode()
@@ -1,9 +1,13 @@
+import hashlib
 import multiprocessing
+import pickle
+import time
 import traceback
+import weakref
+from collections import deque
+from multiprocessing.connection import Connection, wait
 from pathlib import Path
-from queue import Empty, Queue
-from time import sleep
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Literal, NamedTuple, Optional, Union, cast
 
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -15,68 +19,386 @@ from quackosm._rich_progress import TaskProgressBar
 # https://docs.pola.rs/user-guide/misc/multiprocessing/
 ctx: multiprocessing.context.SpawnContext = multiprocessing.get_context("spawn")
 
+# Results can be saved as parquet files or as uncompressed Arrow IPC files,
+# which can be memory-mapped and read without decoding.
+RESULT_FILE_FORMAT = Literal["parquet", "arrow"]
+# Row groups are split into slices with at most this number of rows, so the function
+# is applied to bounded batches and the progress is reported more often.
+MAX_ROWS_PER_TASK = 100_000
 
-def _job(
-    queue: Queue[tuple[str, int]],
-    save_path: Path,
-    function: Callable[[pa.Table], pa.Table],
-    columns: Optional[list[str]] = None,
-) -> None:  # pragma: no cover
-    current_pid = multiprocessing.current_process().pid
 
-    filepath = save_path / f"{current_pid}.parquet"
+class _MapTask(NamedTuple):
+    file_name: str
+    row_group_index: int
+    offset: int
+    length: int
+
+
+class WorkerStatistics(NamedTuple):
+    """Summary of the work done by a single worker during one map call."""
+
+    pid: int
+    tasks: int
+    rows: int
+    decoded_rows: int
+    busy_seconds: float
+
+
+class _RowGroupSlicesReader:
+    """
+    Reads increasing slices of a row group, decoding only the rows up to the slice end.
+
+    Rows before the slice start are skipped without being kept in memory.
+    """
+
+    def __init__(
+        self, file_name: str, row_group_index: int, columns: Optional[list[str]], batch_size: int
+    ) -> None:
+        self.key = (file_name, row_group_index, columns)
+        self._batches = pq.ParquetFile(file_name).iter_batches(
+            batch_size=batch_size, row_groups=[row_group_index], columns=columns
+        )
+        self._buffered_batches: list[pa.RecordBatch] = []
+        self.buffer_start = 0
+        self.decoded_rows = 0
+
+    def read(self, offset: int, length: int) -> pa.Table:
+        if offset >= self.decoded_rows:
+            self._buffered_batches = []
+            self.buffer_start = self.decoded_rows
+
+        while self.decoded_rows < offset + length:
+            batch = next(self._batches)
+            self.decoded_rows += len(batch)
+            if self.decoded_rows <= offset:
+                self.buffer_start = self.decoded_rows
+            else:
+                self._buffered_batches.append(batch)
+
+        buffer = pa.Table.from_batches(self._buffered_batches)
+        row_group_slice = buffer.slice(offset - self.buffer_start, length)
+        # Rows after the slice are kept for the next one
+        self._buffered_batches = buffer.slice(offset + length - self.buffer_start).to_batches()
+        self.buffer_start = offset + length
+        return row_group_slice
+
+
+def _pool_worker(connection: Connection) -> None:  # pragma: no cover
+    current_pid = multiprocessing.current_process().pid
+    function: Optional[Callable[[pa.Table], pa.Table]] = None
     writer = None
-    while not queue.empty():
-        try:
-            file_name, row_group_index = None, None
-            file_name, row_group_index = queue.get_nowait()
+    # Worker usually gets consecutive slices of the same row group, so the reader is reused
+    row_group_reader: Optional[_RowGroupSlicesReader] = None
+
+    while True:
+        message = connection.recv()
+        command = message[0]
+
+        if command == "load":
+            function = pickle.loads(message[1])
+        elif command == "task":
+            _, task, destination_path, columns, result_format = message
+            file_name, row_group_index, offset, length = task
+            try:
+                start_time = time.perf_counter()
+                if (
+                    row_group_reader is None
+                    or row_group_reader.key != (file_name, row_group_index, columns)
+                    or row_group_reader.buffer_start > offset
+                ):
+                    row_group_reader = _RowGroupSlicesReader(
+                        file_name, row_group_index, columns, batch_size=length
+                    )
+                previously_decoded_rows = row_group_reader.decoded_rows
+                row_group_table = row_group_reader.read(offset, length)
+                decoded_rows = row_group_reader.decoded_rows - previously_decoded_rows
+                if len(row_group_table) > 0:
+                    if function is None:
+                        raise RuntimeError("Function to apply hasn't been loaded.")
+                    result_table = function(row_group_table)
+
+                    if not writer:
+                        writer = _open_result_writer(
+                            destination_path, current_pid, result_table.schema, result_format
+                        )
+
+                    writer.write_table(result_table)
+                connection.send(
+                    (
+                        "done",
+                        (len(row_group_table), decoded_rows, time.perf_counter() - start_time),
+                    )
+                )
+            except Exception:
+                msg = (
+                    f"Error in worker (PID: {current_pid},"
+                    f" Parquet: {file_name}, Row group: {row_group_index})"
+                )
+                connection.send(("error", f"{msg}\n\nOriginal {traceback.format_exc()}"))
+        elif command == "flush":
+            if writer:
+                writer.close()
+                writer = None
+            row_group_reader = None
+            connection.send(("flushed", None))
+        elif command == "stop":
+            break
 
-            pq_file = pq.ParquetFile(file_name)
-            row_group_table = pq_file.read_row_group(row_group_index, columns=columns)
-            if len(row_group_table) == 0:
-                continue
 
-            result_table = function(row_group_table)
+def _open_result_writer(
+    destination_path: Path, pid: Optional[int], schema: pa.Schema, result_format: RESULT_FILE_FORMAT
+) -> Union[pq.ParquetWriter, pa.ipc.RecordBatchFileWriter]:  # pragma: no cover
+    if result_format == "arrow":
+        return pa.ipc.new_file(destination_path / f"{pid}.arrow", schema)
 
-            if not writer:
-                writer = pq.ParquetWriter(filepath, result_table.schema)
+    return pq.ParquetWriter(destination_path / f"{pid}.parquet", schema)
 
-            writer.write_table(result_table)
-        except Empty:
+
+def read_arrow_dataset(dataset_path: Path) -> Optional[pa.Table]:
+    """
+    Read Arrow IPC files saved by the workers without copying the data.
+
+    Files are memory-mapped, so the returned table is backed by the files content.
+
+    Args:
+        dataset_path (Path): Path of the directory with Arrow IPC files.
+
+    Returns:
+        Optional[pa.Table]: Table with all results or `None` if there aren't any files.
+    """
+    tables = [
+        pa.ipc.open_file(pa.memory_map(str(file_path))).read_all()
+        for file_path in sorted(dataset_path.glob("*.arrow"))
+    ]
+    if not tables:
+        return None
+
+    return pa.concat_tables(tables)
+
+
+class _PoolWorker:
+    def __init__(self) -> None:
+        self.connection, child_connection = ctx.Pipe()
+        self.process = ctx.Process(target=_pool_worker, args=(child_connection,), daemon=True)
+        self.process.start()
+        self.pid = cast("int", self.process.pid)
+        child_connection.close()
+        self.loaded_function_key: Optional[str] = None
+
+    def send_task(
+        self,
+        task: _MapTask,
+        destination_path: Path,
+        columns: Optional[list[str]],
+        result_format: RESULT_FILE_FORMAT,
+    ) -> None:
+        self.connection.send(("task", tuple(task), destination_path, columns, result_format))
+
+    def receive(self) -> tuple[str, Any]:
+        try:
+            return self.connection.recv()  # type: ignore[no-any-return]
+        except EOFError as ex:
+            raise MultiprocessingRuntimeError(
+                f"Worker (PID: {self.pid}) exited unexpectedly"
+                f" with exit code {self.process.exitcode}."
+            ) from ex
+
+
+def _take_next_task(
+    connection: Connection,
+    workers_row_group_tasks: dict[Connection, deque[_MapTask]],
+    row_groups_tasks: deque[deque[_MapTask]],
+) -> Optional[_MapTask]:
+    worker_tasks = workers_row_group_tasks[connection]
+    if not worker_tasks and row_groups_tasks:
+        worker_tasks.extend(row_groups_tasks.popleft())
+    elif not worker_tasks:
+        # Second half of the busiest worker slices is stolen, so both workers keep
+        # reading consecutive slices
+        busiest_worker_tasks = max(workers_row_group_tasks.values(), key=len)
+        stolen_tasks = [busiest_worker_tasks.pop() for _ in range(len(busiest_worker_tasks) // 2)]
+        worker_tasks.extend(reversed(stolen_tasks))
+
+    if not worker_tasks:
+        return None
+
+    return worker_tasks.popleft()
+
+
+def _stop_workers(workers: list[_PoolWorker]) -> None:
+    for worker in workers:
+        try:
+            worker.connection.send(("stop",))
+        except OSError:
             pass
-        except Exception as ex:
-            if file_name is not None and row_group_index is not None:
-                queue.put((file_name, row_group_index))
+    for worker in workers:
+        worker.process.join(timeout=1)
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join()
+        worker.connection.close()
+    workers.clear()
+
+
+class ParquetWorkerPool:
+    """
+    Long-lived pool of worker processes applying a function over parquet row groups.
 
-            msg = (
-                f"Error in worker (PID: {current_pid},"
-                f" Parquet: {file_name}, Row group: {row_group_index})"
-            )
-            raise MultiprocessingRuntimeError(msg) from ex
+    Workers are started lazily on the first use and kept alive between calls. The mapped
+    function is sent to each worker only when it changes, so big objects bound to it
+    (like a geometry filter) are unpickled once per worker.
+    """
 
-    if writer:
-        writer.close()
+    def __init__(self, number_of_workers: Optional[int] = None) -> None:
+        """
+        Initialize ParquetWorkerPool.
+
+        Args:
+            number_of_workers (Optional[int], optional): Max number of worker processes.
+                If `None`, will use the number of available CPUs. Defaults to `None`.
+        """
+        self.number_of_workers = number_of_workers or multiprocessing.cpu_count()
+        self._workers: list[_PoolWorker] = []
+        self.last_map_statistics: list[WorkerStatistics] = []
+        self._finalizer = weakref.finalize(self, _stop_workers, self._workers)
+
+    def map(
+        self,
+        dataset_path: Path,
+        destination_path: Path,
+        function: Callable[[pa.Table], pa.Table],
+        columns: Optional[list[str]] = None,
+        progress_bar: Optional[TaskProgressBar] = None,
+        result_format: RESULT_FILE_FORMAT = "parquet",
+        max_rows_per_task: int = MAX_ROWS_PER_TASK,
+    ) -> None:
+        """
+        Apply a function over parquet dataset row groups in the worker processes.
+
+        Row groups are split into slices of bounded size. Each worker processes slices
+        of the row group it took in order, decoding rows only once. Idle workers take
+        the next row group and, when there are no more row groups left, steal the second
+        half of the remaining slices from the busiest worker, so a single big row group
+        is spread over all workers. Time spent by each worker is saved
+        in the `last_map_statistics` attribute.
+
+        Will save results in multiple files in a destination path.
+
+        Args:
+            dataset_path (Path): Path of the parquet dataset.
+            destination_path (Path): Path of the destination.
+            function (Callable[[pa.Table], pa.Table]): Function to apply over a row group table.
+                Will save resulting table in a new parquet file.
+            columns (Optional[list[str]]): List of columns to read. Defaults to `None`.
+            progress_bar (Optional[TaskProgressBar]): Progress bar to show task status.
+                Defaults to `None`.
+            result_format (RESULT_FILE_FORMAT): Format of the saved results. Arrow IPC files
+                can be read with `read_arrow_dataset` without decoding. Defaults to "parquet".
+            max_rows_per_task (int): Max number of rows processed by the function at once.
+                Defaults to `MAX_ROWS_PER_TASK`.
+        """
+        dataset = pq.ParquetDataset(dataset_path)
+
+        row_groups_tasks: deque[deque[_MapTask]] = deque()
+        for pq_file in dataset.files:
+            metadata = pq.ParquetFile(pq_file).metadata
+            for row_group in range(metadata.num_row_groups):
+                num_rows = metadata.row_group(row_group).num_rows
+                if num_rows == 0:
+                    continue
+                row_groups_tasks.append(
+                    deque(
+                        _MapTask(
+                            pq_file, row_group, offset, min(max_rows_per_task, num_rows - offset)
+                        )
+                        for offset in range(0, num_rows, max_rows_per_task)
+                    )
+                )
+
+        total = sum(len(row_group_tasks) for row_group_tasks in row_groups_tasks)
+        if progress_bar:  # pragma: no cover
+            progress_bar.create_manual_bar(total=total)
 
+        destination_path.mkdir(parents=True, exist_ok=True)
+        self.last_map_statistics = []
+        if total == 0:
+            return
 
-class WorkerSpawnProcess(ctx.Process):  # type: ignore[name-defined,misc]
-    def __init__(self, *args: Any, **kwargs: Any):
-        multiprocessing.Process.__init__(self, *args, **kwargs)
-        self._pconn, self._cconn = multiprocessing.Pipe()
-        self._exception: Optional[tuple[Exception, str]] = None
+        function_bytes = pickle.dumps(function)
+        function_key = hashlib.sha256(function_bytes).hexdigest()
 
-    def run(self) -> None:  # pragma: no cover
         try:
-            multiprocessing.Process.run(self)
-            self._cconn.send(None)
-        except Exception as e:
-            tb: str = traceback.format_exc()
-            self._cconn.send((e, tb))
-
-    @property
-    def exception(self) -> Optional[tuple[Exception, str]]:
-        if self._pconn.poll():
-            self._exception = self._pconn.recv()
-        return self._exception
+            number_of_active_workers = min(self.number_of_workers, total)
+            while len(self._workers) < number_of_active_workers:
+                self._workers.append(_PoolWorker())
+            active_workers = self._workers[:number_of_active_workers]
+
+            for worker in active_workers:
+                if worker.loaded_function_key != function_key:
+                    worker.connection.send(("load", function_bytes))
+                    worker.loaded_function_key = function_key
+
+            workers_row_group_tasks: dict[Connection, deque[_MapTask]] = {
+                worker.connection: deque() for worker in active_workers
+            }
+            busy_workers: dict[Connection, _PoolWorker] = {}
+
+            for worker in active_workers:
+                task = _take_next_task(worker.connection, workers_row_group_tasks, row_groups_tasks)
+                if task is not None:
+                    worker.send_task(task, destination_path, columns, result_format)
+                    busy_workers[worker.connection] = worker
+
+            workers_tasks = {worker.pid: 0 for worker in active_workers}
+            workers_rows = {worker.pid: 0 for worker in active_workers}
+            workers_decoded_rows = {worker.pid: 0 for worker in active_workers}
+            workers_busy_seconds = {worker.pid: 0.0 for worker in active_workers}
+            finished_tasks = 0
+            while busy_workers:
+                for ready_connection in wait(list(busy_workers.keys())):
+                    connection = cast("Connection", ready_connection)
+                    worker = busy_workers.pop(connection)
+                    status, details = worker.receive()
+                    if status == "error":
+                        raise MultiprocessingRuntimeError(details)
+
+                    task_rows, task_decoded_rows, task_seconds = details
+                    workers_tasks[worker.pid] += 1
+                    workers_rows[worker.pid] += task_rows
+                    workers_decoded_rows[worker.pid] += task_decoded_rows
+                    workers_busy_seconds[worker.pid] += task_seconds
+                    finished_tasks += 1
+                    if progress_bar:  # pragma: no cover
+                        progress_bar.update_manual_bar(current_progress=finished_tasks)
+
+                    task = _take_next_task(connection, workers_row_group_tasks, row_groups_tasks)
+                    if task is not None:
+                        worker.send_task(task, destination_path, columns, result_format)
+                        busy_workers[connection] = worker
+
+            for worker in active_workers:
+                worker.connection.send(("flush",))
+            for worker in active_workers:
+                worker.receive()
+
+            self.last_map_statistics = [
+                WorkerStatistics(
+                    pid=pid,
+                    tasks=workers_tasks[pid],
+                    rows=workers_rows[pid],
+                    decoded_rows=workers_decoded_rows[pid],
+                    busy_seconds=workers_busy_seconds[pid],
+                )
+                for pid in workers_tasks
+            ]
+        except BaseException:
+            # Workers state is unknown after a failure, new ones will be started on the next call
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Stop all worker processes."""
+        _stop_workers(self._workers)
 
 
 def map_parquet_dataset(
@@ -85,6 +407,8 @@ def map_parquet_dataset(
     function: Callable[[pa.Table], pa.Table],
     columns: Optional[list[str]] = None,
     progress_bar: Optional[TaskProgressBar] = None,
+    worker_pool: Optional[ParquetWorkerPool] = None,
+    result_format: RESULT_FILE_FORMAT = "parquet",
 ) -> None:
     """
     Apply a function over parquet dataset in a multiprocessing environment.
@@ -99,86 +423,32 @@ def map_parquet_dataset(
         columns (Optional[list[str]]): List of columns to read. Defaults to `None`.
         progress_bar (Optional[TaskProgressBar]): Progress bar to show task status.
             Defaults to `None`.
+        worker_pool (Optional[ParquetWorkerPool]): Existing pool of workers to reuse.
+            If `None`, a new pool will be started and closed after processing.
+            Defaults to `None`.
+        result_format (RESULT_FILE_FORMAT): Format of the saved results. Arrow IPC files
+            can be read with `read_arrow_dataset` without decoding. Defaults to "parquet".
     """
-    dataset = pq.ParquetDataset(dataset_path)
-
-    tuples_to_queue = []
-    for pq_file in dataset.files:
-        for row_group in range(pq.ParquetFile(pq_file).num_row_groups):
-            tuples_to_queue.append((pq_file, row_group))
-
-    total = len(tuples_to_queue)
-    if progress_bar:  # pragma: no cover
-        progress_bar.create_manual_bar(total=total)
-
-    queue: Queue[tuple[str, int]] = ctx.Manager().Queue()
-    for queue_tuple in tuples_to_queue:
-        queue.put(queue_tuple)
-
-    destination_path.mkdir(parents=True, exist_ok=True)
-
-    try:
-        processes = [
-            WorkerSpawnProcess(
-                target=_job,
-                args=(queue, destination_path, function, columns),
-            )
-            for _ in range(min(multiprocessing.cpu_count(), total))
-        ]
-        _run_processes(processes=processes, queue=queue, total=total, progress_bar=progress_bar)
-    finally:  # pragma: no cover
-        _report_exceptions(processes=processes)
-
-
-def _run_processes(
-    processes: list[WorkerSpawnProcess],
-    queue: Queue[tuple[str, int]],
-    total: int,
-    progress_bar: Optional[TaskProgressBar],
-) -> None:
-    # Run processes
-    for p in processes:
-        if queue.empty():
-            break
-        p.start()
-
-    sleep_time = 0.1
-    while any(process.is_alive() for process in processes):
-        if any(p.exception for p in processes):  # pragma: no cover
-            break
-
-        if progress_bar:  # pragma: no cover
-            progress_bar.update_manual_bar(current_progress=total - queue.qsize())
-
-        sleep(sleep_time)
-        sleep_time = min(1.0, sleep_time + 0.1)
-
-    if progress_bar:  # pragma: no cover
-        progress_bar.update_manual_bar(current_progress=total)
-
-
-def _report_exceptions(processes: list[WorkerSpawnProcess]) -> None:
-    # In case of exception
-    exceptions = []
-    for p in processes:
-        if p.is_alive():
-            p.terminate()
-            p.join()
-
-        if p.exception:
-            exceptions.append(p.exception)
-
-    if exceptions:
-        # use ExceptionGroup in Python3.11
-        _raise_multiple(exceptions)
-
-
-def _raise_multiple(exceptions: list[tuple[Exception, str]]) -> None:
-    if not exceptions:
+    if worker_pool is not None:
+        worker_pool.map(
+            dataset_path=dataset_path,
+            destination_path=destination_path,
+            function=function,
+            columns=columns,
+            progress_bar=progress_bar,
+            result_format=result_format,
+        )
         return
+
+    worker_pool = ParquetWorkerPool()
     try:
-        error, traceback = exceptions.pop()
-        msg = f"{error}\n\nOriginal {traceback}"
-        raise type(error)(msg)
+        worker_pool.map(
+            dataset_path=dataset_path,
+            destination_path=destination_path,
+            function=function,
+            columns=columns,
+            progress_bar=progress_bar,
+            result_format=result_format,
+        )
     finally:
-        _raise_multiple(exceptions)
+        worker_pool.close()
@@ -0,0 +1,256 @@
+import hashlib
+import lzma
+import struct
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple, Union
+
+PBF_HEADER_BLOB_TYPE = "OSMHeader"
+PBF_DATA_BLOB_TYPE = "OSMData"
+PBF_SORTED_FEATURE = "Sort.Type_then_ID"
+
+# Fields numbers from the fileformat.proto definition
+# https://github.com/openstreetmap/OSM-binary/blob/master/osmpbf/fileformat.proto
+BLOB_HEADER_TYPE_FIELD = 1
+BLOB_HEADER_DATASIZE_FIELD = 3
+BLOB_RAW_FIELD = 1
+BLOB_ZLIB_DATA_FIELD = 3
+BLOB_LZMA_DATA_FIELD = 4
+# https://github.com/openstreetmap/OSM-binary/blob/master/osmpbf/osmformat.proto
+HEADER_BLOCK_OPTIONAL_FEATURES_FIELD = 5
+
+PROTOBUF_VARINT_WIRE_TYPE = 0
+PROTOBUF_FIXED64_WIRE_TYPE = 1
+PROTOBUF_LENGTH_DELIMITED_WIRE_TYPE = 2
+PROTOBUF_FIXED32_WIRE_TYPE = 5
+
+COPY_BUFFER_SIZE = 16 * 1024 * 1024
+
+
+class PbfBlob(NamedTuple):
+    """Position of a single blob (with its BlobHeader) inside the `*.osm.pbf` file."""
+
+    offset: int
+    size: int
+    blob_type: str
+
+
+def _read_varint(buffer: bytes, position: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = buffer[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, position
+        shift += 7
+
+
+def _iterate_protobuf_fields(buffer: bytes) -> Iterator[tuple[int, Union[int, bytes]]]:
+    position = 0
+    while position < len(buffer):
+        key, position = _read_varint(buffer, position)
+        field_number, wire_type = key >> 3, key & 0x07
+        value: Union[int, bytes]
+        if wire_type == PROTOBUF_VARINT_WIRE_TYPE:
+            value, position = _read_varint(buffer, position)
+        elif wire_type == PROTOBUF_LENGTH_DELIMITED_WIRE_TYPE:
+            length, position = _read_varint(buffer, position)
+            value = buffer[position : position + length]
+            position += length
+        elif wire_type == PROTOBUF_FIXED64_WIRE_TYPE:
+            value = buffer[position : position + 8]
+            position += 8
+        elif wire_type == PROTOBUF_FIXED32_WIRE_TYPE:
+            value = buffer[position : position + 4]
+            position += 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type: {wire_type}.")
+
+        yield field_number, value
+
+
+def get_pbf_file_fingerprint(
+    pbf_path: Union[str, Path], number_of_samples: int = 16, sample_size: int = 1024 * 1024
+) -> str:
+    """
+    Calculate PBF file content fingerprint without reading the whole file.
+
+    Hashes the file size together with evenly spaced chunks of the file content
+    (including the beginning and the end of the file).
+    """
+    file_size = Path(pbf_path).stat().st_size
+    offsets = {
+        min(int(file_size * sample_idx / number_of_samples), max(file_size - sample_size, 0))
+        for sample_idx in range(number_of_samples + 1)
+    }
+
+    h = hashlib.new("sha256")
+    h.update(str(file_size).encode())
+    with open(pbf_path, "rb") as pbf_file:
+        for offset in sorted(offsets):
+            pbf_file.seek(offset)
+            h.update(pbf_file.read(sample_size))
+
+    return h.hexdigest()[:16]
+
+
+def read_pbf_blobs(pbf_path: Union[str, Path]) -> list[PbfBlob]:
+    """
+    Index positions of all blobs in the `*.osm.pbf` file.
+
+    Only BlobHeaders are parsed, blobs content is skipped without decompression.
+
+    Args:
+        pbf_path (Union[str, Path]): Path of the `*.osm.pbf` file.
+
+    Returns:
+        list[PbfBlob]: List of blobs in the file order.
+    """
+    blobs = []
+    with open(pbf_path, "rb") as pbf_file:
+        offset = 0
+        while True:
+            header_length_bytes = pbf_file.read(4)
+            if len(header_length_bytes) < 4:
+                break
+
+            header_length = struct.unpack(">I", header_length_bytes)[0]
+            blob_type = ""
+            data_size = 0
+            for field_number, value in _iterate_protobuf_fields(pbf_file.read(header_length)):
+                if field_number == BLOB_HEADER_TYPE_FIELD:
+                    blob_type = bytes(value).decode()  # type: ignore[arg-type]
+                elif field_number == BLOB_HEADER_DATASIZE_FIELD:
+                    data_size = int(value)  # type: ignore[arg-type]
+
+            pbf_file.seek(data_size, 1)
+            blob_size = 4 + header_length + data_size
+            blobs.append(PbfBlob(offset=offset, size=blob_size, blob_type=blob_type))
+            offset += blob_size
+
+    return blobs
+
+
+def read_pbf_header_optional_features(pbf_path: Union[str, Path]) -> list[str]:
+    """
+    Read optional features declared in the header block of the `*.osm.pbf` file.
+
+    Only the first blob of the file is read. Header blobs compressed with methods
+    other than zlib and lzma are treated as if they didn't declare any features.
+
+    Args:
+        pbf_path (Union[str, Path]): Path of the `*.osm.pbf` file.
+
+    Returns:
+        list[str]: List of optional features, like `Sort.Type_then_ID`.
+    """
+    with open(pbf_path, "rb") as pbf_file:
+        header_length_bytes = pbf_file.read(4)
+        if len(header_length_bytes) < 4:
+            return []
+
+        header_length = struct.unpack(">I", header_length_bytes)[0]
+        blob_type = ""
+        data_size = 0
+        for field_number, value in _iterate_protobuf_fields(pbf_file.read(header_length)):
+            if field_number == BLOB_HEADER_TYPE_FIELD:
+                blob_type = bytes(value).decode()  # type: ignore[arg-type]
+            elif field_number == BLOB_HEADER_DATASIZE_FIELD:
+                data_size = int(value)  # type: ignore[arg-type]
+
+        if blob_type != PBF_HEADER_BLOB_TYPE:
+            return []
+
+        blob_data = pbf_file.read(data_size)
+
+    header_block = None
+    for field_number, value in _iterate_protobuf_fields(blob_data):
+        if field_number == BLOB_RAW_FIELD:
+            header_block = bytes(value)  # type: ignore[arg-type]
+        elif field_number == BLOB_ZLIB_DATA_FIELD:
+            header_block = zlib.decompress(value)  # type: ignore[arg-type]
+        elif field_number == BLOB_LZMA_DATA_FIELD:
+            header_block = lzma.decompress(value)  # type: ignore[arg-type]
+
+    if header_block is None:
+        return []
+
+    return [
+        bytes(value).decode()  # type: ignore[arg-type]
+        for field_number, value in _iterate_protobuf_fields(header_block)
+        if field_number == HEADER_BLOCK_OPTIONAL_FEATURES_FIELD
+    ]
+
+
+def split_pbf_blobs_into_chunks(blobs: list[PbfBlob], number_of_chunks: int) -> list[list[PbfBlob]]:
+    """
+    Split data blobs into contiguous chunks with a similar total size.
+
+    Args:
+        blobs (list[PbfBlob]): List of blobs from the `*.osm.pbf` file.
+        number_of_chunks (int): Expected number of chunks. Might return less chunks
+            if there are not enough data blobs.
+
+    Returns:
+        list[list[PbfBlob]]: List of data blobs chunks.
+    """
+    data_blobs = [blob for blob in blobs if blob.blob_type == PBF_DATA_BLOB_TYPE]
+    if not data_blobs:
+        return []
+
+    total_size = sum(blob.size for blob in data_blobs)
+    chunk_size = total_size / max(1, min(number_of_chunks, len(data_blobs)))
+
+    chunks: list[list[PbfBlob]] = [[]]
+    current_chunk_size = 0
+    for blob in data_blobs:
+        if chunks[-1] and current_chunk_size + blob.size / 2 > chunk_size:
+            chunks.append([])
+            current_chunk_size = 0
+
+        chunks[-1].append(blob)
+        current_chunk_size += blob.size
+
+    return chunks
+
+
+def write_pbf_chunk(
+    pbf_path: Union[str, Path],
+    blobs: list[PbfBlob],
+    data_blobs: list[PbfBlob],
+    destination_path: Union[str, Path],
+) -> Path:
+    """
+    Save a subset of data blobs as a standalone `*.osm.pbf` file.
+
+    All header blobs from the source file are written at the beginning of the chunk,
+    so the result file can be read by any PBF reader.
+
+    Args:
+        pbf_path (Union[str, Path]): Path of the source `*.osm.pbf` file.
+        blobs (list[PbfBlob]): List of all blobs from the source file.
+        data_blobs (list[PbfBlob]): Data blobs to save in the chunk.
+        destination_path (Union[str, Path]): Path of the result file.
+
+    Returns:
+        Path: Path of the saved chunk.
+    """
+    header_blobs = [blob for blob in blobs if blob.blob_type == PBF_HEADER_BLOB_TYPE]
+    destination_path = Path(destination_path)
+    destination_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(pbf_path, "rb") as source_file, open(destination_path, "wb") as destination_file:
+        for blob in [*header_blobs, *data_blobs]:
+            source_file.seek(blob.offset)
+            remaining_bytes = blob.size
+            while remaining_bytes > 0:
+                buffer = source_file.read(min(COPY_BUFFER_SIZE, remaining_bytes))
+                if not buffer:
+                    raise ValueError(f"Unexpected end of the file: {pbf_path}.")
+                destination_file.write(buffer)
+                remaining_bytes -= len(buffer)
+
+    return destination_path
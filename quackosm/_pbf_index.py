@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import Optional, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from shapely.geometry import box
+from shapely.geometry.base import BaseGeometry
+
+from quackosm._pbf_blobs import PbfBlob, get_pbf_file_fingerprint
+
+PBF_INDEX_FILE_SUFFIX = ".idx.parquet"
+PBF_INDEX_FINGERPRINT_METADATA_KEY = b"quackosm:pbf_fingerprint"
+# Size of blobs ranges described by a single index entry.
+# Smaller ranges are more selective, but each one has to be decoded separately.
+PBF_INDEX_CHUNK_SIZE_BYTES = 4 * 1024 * 1024
+
+PBF_INDEX_SCHEMA = pa.schema(
+    [
+        ("chunk_index", pa.int64()),
+        ("offset", pa.int64()),
+        ("size", pa.int64()),
+        ("kind", pa.string()),
+        ("min_id", pa.int64()),
+        ("max_id", pa.int64()),
+        ("min_lon", pa.float64()),
+        ("min_lat", pa.float64()),
+        ("max_lon", pa.float64()),
+        ("max_lat", pa.float64()),
+    ]
+)
+
+
+def get_pbf_index_path(pbf_path: Union[str, Path]) -> Path:
+    """Get path of the sidecar index file saved next to the `*.osm.pbf` file."""
+    pbf_path = Path(pbf_path)
+    return pbf_path.with_name(f"{pbf_path.name}{PBF_INDEX_FILE_SUFFIX}")
+
+
+def get_pbf_chunk_range(data_blobs: list[PbfBlob]) -> PbfBlob:
+    """Merge contiguous data blobs into a single blobs range."""
+    offset = data_blobs[0].offset
+    size = data_blobs[-1].offset + data_blobs[-1].size - offset
+    return PbfBlob(offset=offset, size=size, blob_type=data_blobs[0].blob_type)
+
+
+def save_pbf_index(
+    pbf_path: Union[str, Path], chunks: list[list[PbfBlob]], chunks_statistics: pa.Table
+) -> Path:
+    """
+    Save the sidecar index file with blobs ranges statistics.
+
+    Args:
+        pbf_path (Union[str, Path]): Path of the indexed `*.osm.pbf` file.
+        chunks (list[list[PbfBlob]]): Data blobs chunks used for decoding.
+        chunks_statistics (pa.Table): Statistics calculated for each decoded chunk and element
+            kind. Must contain `chunk_index`, `kind`, ids range and nodes bounding box columns.
+
+    Returns:
+        Path: Path of the saved index file.
+    """
+    chunks_ranges = [get_pbf_chunk_range(chunk) for chunk in chunks]
+    chunk_indexes = chunks_statistics["chunk_index"].to_pylist()
+    index_table = pa.table(
+        {
+            "chunk_index": chunk_indexes,
+            "offset": [chunks_ranges[idx].offset for idx in chunk_indexes],
+            "size": [chunks_ranges[idx].size for idx in chunk_indexes],
+            **{
+                column: chunks_statistics[column]
+                for column in PBF_INDEX_SCHEMA.names
+                if column not in ("chunk_index", "offset", "size")
+            },
+        }
+    ).cast(PBF_INDEX_SCHEMA)
+    index_table = index_table.replace_schema_metadata(
+        {PBF_INDEX_FINGERPRINT_METADATA_KEY: get_pbf_file_fingerprint(pbf_path).encode()}
+    )
+
+    index_path = get_pbf_index_path(pbf_path)
+    tmp_index_path = index_path.with_name(f"{index_path.name}.tmp")
+    pq.write_table(index_table, tmp_index_path)
+    tmp_index_path.replace(index_path)
+
+    return index_path
+
+
+def load_pbf_index(pbf_path: Union[str, Path]) -> Optional[pa.Table]:
+    """
+    Load the sidecar index file if it exists and matches the `*.osm.pbf` file content.
+
+    Args:
+        pbf_path (Union[str, Path]): Path of the indexed `*.osm.pbf` file.
+
+    Returns:
+        Optional[pa.Table]: Index table or `None` if index doesn't exist or is outdated.
+    """
+    index_path = get_pbf_index_path(pbf_path)
+    if not index_path.exists():
+        return None
+
+    index_table = pq.read_table(index_path)
+    saved_fingerprint = (index_table.schema.metadata or {}).get(PBF_INDEX_FINGERPRINT_METADATA_KEY)
+    if saved_fingerprint != get_pbf_file_fingerprint(pbf_path).encode():
+        return None
+
+    return index_table
+
+
+def select_chunks_intersecting_geometry(
+    index_table: pa.Table, geometry_filter: BaseGeometry
+) -> set[int]:
+    """
+    Select chunks required to read elements intersecting with geometry filter.
+
+    Chunks with ways and relations are always required, chunks with nodes only
+    if nodes bounding box intersects with the geometry filter.
+
+    Args:
+        index_table (pa.Table): Index table.
+        geometry_filter (BaseGeometry): Geometry used for filtering.
+
+    Returns:
+        set[int]: Indexes of required chunks.
+    """
+    selected_chunks = set()
+    for row in index_table.to_pylist():
+        if row["kind"] != "node":
+            selected_chunks.add(row["chunk_index"])
+        elif row["min_lon"] is not None and geometry_filter.intersects(
+            box(row["min_lon"], row["min_lat"], row["max_lon"], row["max_lat"])
+        ):
+            selected_chunks.add(row["chunk_index"])
+
+    return selected_chunks
@@ -0,0 +1,97 @@
+import math
+from collections.abc import Iterable
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+# Memory needed to assemble a single way point (id, point and reference index) and a single way
+# (aggregation state and linestring list) in a ways group. Values are calibrated with
+# the `tests/benchmark/test_rows_per_group_memory.py` benchmark for both way assembly engines.
+WAY_POINT_MEMORY_BYTES = 128
+WAY_MEMORY_BYTES = 64
+# All ways groups processed at the same time have to fit in this part of the available memory
+ROWS_PER_GROUP_MEMORY_BUDGET_FRACTION = 0.5
+
+
+def count_parquet_rows(parquet_files: Iterable[Path]) -> int:
+    """
+    Count rows in parquet files using only their metadata.
+
+    Args:
+        parquet_files (Iterable[Path]): Paths of parquet files.
+
+    Returns:
+        int: Total number of rows.
+    """
+    return sum(pq.read_metadata(parquet_file).num_rows for parquet_file in parquet_files)
+
+
+def get_memory_budget(available_memory: int) -> int:
+    """Get part of the available memory shared by all ways groups processed at the same time."""
+    return int(available_memory * ROWS_PER_GROUP_MEMORY_BUDGET_FRACTION)
+
+
+def estimate_group_memory(rows_per_group: int, average_refs_per_way: float) -> int:
+    """
+    Estimate memory needed to assemble linestrings of a single ways group.
+
+    Args:
+        rows_per_group (int): Number of ways in a group.
+        average_refs_per_way (float): Average number of nodes references in a way.
+
+    Returns:
+        int: Estimated memory in bytes.
+    """
+    return math.ceil(
+        rows_per_group * (average_refs_per_way * WAY_POINT_MEMORY_BYTES + WAY_MEMORY_BYTES)
+    )
+
+
+def estimate_rows_per_group(
+    average_refs_per_way: float,
+    available_memory: int,
+    min_rows_per_group: int,
+    max_rows_per_group: int,
+    number_of_workers: int = 1,
+) -> int:
+    """
+    Estimate the biggest number of ways in a group that fits in the available memory.
+
+    Args:
+        average_refs_per_way (float): Average number of nodes references in a way.
+        available_memory (int): Available memory in bytes.
+        min_rows_per_group (int): Lower bound of the result.
+        max_rows_per_group (int): Upper bound of the result.
+        number_of_workers (int, optional): Number of groups processed at the same time,
+            sharing the memory budget. Defaults to 1.
+
+    Returns:
+        int: Number of rows per group.
+    """
+    memory_budget = get_memory_budget(available_memory) / max(number_of_workers, 1)
+    way_memory = max(average_refs_per_way, 1.0) * WAY_POINT_MEMORY_BYTES + WAY_MEMORY_BYTES
+    rows_per_group = int(memory_budget // way_memory)
+    return max(min_rows_per_group, min(rows_per_group, max_rows_per_group))
+
+
+def estimate_number_of_workers(
+    groups_memory: Iterable[int], available_memory: int, max_number_of_workers: int
+) -> int:
+    """
+    Estimate how many ways groups can be processed at the same time.
+
+    Args:
+        groups_memory (Iterable[int]): Estimated memory of each group in bytes.
+        available_memory (int): Available memory in bytes.
+        max_number_of_workers (int): Upper bound of the result.
+
+    Returns:
+        int: Number of workers.
+    """
+    max_group_memory = max(groups_memory, default=0)
+    if max_group_memory == 0:
+        return max(1, max_number_of_workers)
+
+    return max(
+        1, min(max_number_of_workers, get_memory_budget(available_memory) // max_group_memory)
+    )
@@ -0,0 +1,149 @@
+from typing import Literal
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# `duckdb` aggregates ways points with `list(point ORDER BY ref_idx)` and builds geometries
+# with spatial functions, `numpy` sorts points arrays and builds ragged offsets directly.
+WAY_ASSEMBLY_ENGINE = Literal["duckdb", "numpy"]
+
+POINT_TYPE = pa.struct([("x", pa.float64()), ("y", pa.float64())])
+# Coordinates are rounded before removing repeated points, the same as the DuckDB engine
+# does by casting points to DECIMAL(10, 7)
+COORDINATES_PRECISION = 7
+WKB_LITTLE_ENDIAN = 1
+WKB_LINESTRING_TYPE = 2
+WKB_POLYGON_TYPE = 3
+
+
+def assemble_ways_linestrings(ways_points: pa.Table) -> pa.Table:
+    """
+    Assemble ways linestrings from unnested ways points.
+
+    Points are sorted by the way id and the reference index and linestrings offsets
+    are calculated from the boundaries between ways ids.
+
+    Args:
+        ways_points (pa.Table): Table with `id`, `point` (struct with `x` and `y` fields)
+            and `ref_idx` columns.
+
+    Returns:
+        pa.Table: Table with `id` and `linestring` (list of points) columns.
+    """
+    ids = ways_points["id"].to_numpy()
+    points = ways_points["point"].combine_chunks()
+    x = points.field("x").to_numpy(zero_copy_only=False)
+    y = points.field("y").to_numpy(zero_copy_only=False)
+
+    order = np.lexsort((ways_points["ref_idx"].to_numpy(), ids))
+    ids, x, y = ids[order], x[order], y[order]
+
+    ways_starts = (
+        np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        if len(ids) > 0
+        else np.empty(0, dtype=np.int64)
+    )
+    offsets = np.r_[ways_starts, len(ids)].astype(np.int64)
+
+    linestrings = pa.LargeListArray.from_arrays(
+        pa.array(offsets, type=pa.int64()),
+        pa.StructArray.from_arrays([pa.array(x), pa.array(y)], fields=list(POINT_TYPE)),
+    )
+    return pa.table(
+        {
+            "id": pa.array(ids[offsets[:-1]], type=pa.int64()),
+            "linestring": linestrings,
+        }
+    )
+
+
+def build_ways_geometries(
+    linestrings: pa.Array, is_polygon_candidate: np.ndarray
+) -> tuple[pa.Array, np.ndarray]:
+    """
+    Build ways geometries as WKB from linestrings.
+
+    Repeated consecutive points are removed using the coordinates arrays. Ways are saved
+    as polygons if they are polygon candidates (based on tags), are closed (using
+    unrounded coordinates) and have at least 4 points left. Other ways are saved
+    as linestrings and missing linestrings are kept as nulls, the same as in the DuckDB engine.
+
+    Args:
+        linestrings (pa.Array): List array with points (structs with `x` and `y` fields).
+        is_polygon_candidate (np.ndarray): Boolean mask of ways that can be polygons
+            based on their tags.
+
+    Returns:
+        tuple[pa.Array, np.ndarray]: WKB geometries and a boolean mask of polygons.
+    """
+    is_valid = linestrings.is_valid().to_numpy(zero_copy_only=False)
+    lengths = pc.fill_null(pc.list_value_length(linestrings), 0).to_numpy().astype(np.int64)
+    points = pc.list_flatten(linestrings)
+    raw_x = points.field("x").to_numpy(zero_copy_only=False)
+    raw_y = points.field("y").to_numpy(zero_copy_only=False)
+    x = np.round(raw_x, COORDINATES_PRECISION)
+    y = np.round(raw_y, COORDINATES_PRECISION)
+
+    number_of_ways = len(lengths)
+    starts = np.cumsum(lengths) - lengths
+    ends = starts + lengths - 1
+    way_index = np.repeat(np.arange(number_of_ways), lengths)
+
+    is_way_start = np.zeros(len(x), dtype=bool)
+    is_way_start[starts[lengths > 0]] = True
+    is_repeated = np.r_[False, (x[1:] == x[:-1]) & (y[1:] == y[:-1])] & ~is_way_start
+    kept = ~is_repeated
+    kept_counts = np.bincount(way_index[kept], minlength=number_of_ways)
+    # Linestring with all points repeated keeps the first and the last point
+    is_collapsed = (kept_counts == 1) & (lengths > 1)
+    kept[ends[is_collapsed]] = True
+    kept_counts[is_collapsed] = 2
+
+    # DuckDB engine compares endpoints before rounding the coordinates
+    is_closed = np.zeros(number_of_ways, dtype=bool)
+    non_empty = lengths > 0
+    is_closed[non_empty] = (raw_x[starts[non_empty]] == raw_x[ends[non_empty]]) & (
+        raw_y[starts[non_empty]] == raw_y[ends[non_empty]]
+    )
+    is_polygon = is_polygon_candidate & is_closed & (kept_counts >= 4) & is_valid
+
+    geometries = _build_wkb(x[kept], y[kept], kept_counts, is_polygon)
+    if not is_valid.all():
+        geometries = pc.if_else(
+            pa.array(is_valid), geometries, pa.scalar(None, type=pa.large_binary())
+        )
+    return geometries, is_polygon
+
+
+def _build_wkb(
+    x: np.ndarray, y: np.ndarray, counts: np.ndarray, is_polygon: np.ndarray
+) -> pa.Array:
+    header_sizes = np.where(is_polygon, 13, 9)
+    sizes = header_sizes + 16 * counts
+    offsets = np.r_[0, np.cumsum(sizes)].astype(np.int64)
+    buffer = np.zeros(offsets[-1], dtype=np.uint8)
+    starts = offsets[:-1]
+
+    buffer[starts] = WKB_LITTLE_ENDIAN
+    _write_uint32(buffer, starts + 1, np.where(is_polygon, WKB_POLYGON_TYPE, WKB_LINESTRING_TYPE))
+    # Polygons have a single ring
+    _write_uint32(buffer, starts[is_polygon] + 5, np.ones(is_polygon.sum(), dtype=np.uint32))
+    _write_uint32(buffer, starts + header_sizes - 4, counts)
+
+    coordinates_starts = starts + header_sizes
+    point_index = np.arange(len(x)) - np.repeat(np.cumsum(counts) - counts, counts)
+    points_positions = np.repeat(coordinates_starts, counts) + 16 * point_index
+    coordinates_bytes = np.column_stack([x, y]).astype("<f8").view(np.uint8).reshape(-1, 16)
+    buffer[points_positions[:, None] + np.arange(16)] = coordinates_bytes
+
+    return pa.LargeBinaryArray.from_buffers(
+        pa.large_binary(),
+        len(counts),
+        [None, pa.py_buffer(offsets), pa.py_buffer(buffer)],
+    )
+
+
+def _write_uint32(buffer: np.ndarray, positions: np.ndarray, values: np.ndarray) -> None:
+    values_bytes = values.astype("<u4").view(np.uint8).reshape(-1, 4)
+    buffer[positions[:, None] + np.arange(4)] = values_bytes
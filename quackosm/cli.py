@@ -22,7 +22,12 @@ from quackosm.pbf_file_reader import _is_url_path
 if TYPE_CHECKING:
     from typing import Literal
 
+    import geopandas as gpd
+    from shapely.geometry.base import BaseGeometry
+
+    from quackosm._intersection import INTERSECTION_ENGINE
     from quackosm._rich_progress import VERBOSITY_MODE
+    from quackosm._ways_assembly import WAY_ASSEMBLY_ENGINE
 
 app = typer.Typer(context_settings={"help_option_names": ["-h", "--help"]}, rich_markup_mode="rich")
 
@@ -112,6 +117,21 @@ class GeoJsonGeometryParser(click.ParamType):  # type: ignore
             raise typer.BadParameter("Cannot parse provided GeoJSON") from None
 
 
+def _merge_geometries(geoseries: "gpd.GeoSeries") -> "BaseGeometry":
+    from shapely import get_num_geometries
+
+    from quackosm._intersection import POLYGON_SET_MIN_PARTS, merge_geometries
+
+    # Big sets of polygons are kept as separate parts instead of calculating the union
+    if get_num_geometries(geoseries.values).sum() >= POLYGON_SET_MIN_PARTS:
+        return merge_geometries(geoseries.values)
+
+    if not GEOPANDAS_NEW_API:
+        return geoseries.unary_union
+
+    return geoseries.union_all()
+
+
 class GeoFileGeometryParser(click.ParamType):  # type: ignore
     """Parser for geometry in geo file form."""
 
@@ -128,10 +148,7 @@ class GeoFileGeometryParser(click.ParamType):  # type: ignore
             import geopandas as gpd
 
             gdf = gpd.read_file(value)
-            if GEOPANDAS_NEW_API:
-                return gdf.union_all()
-            else:
-                return gdf.unary_union
+            return _merge_geometries(gdf.geometry)
         except Exception:
             raise typer.BadParameter("Cannot parse provided geo file") from None
 
@@ -174,10 +191,7 @@ class GeohashGeometryParser(click.ParamType):  # type: ignore
             for geohash in value.split(","):
                 bounds = geohash_bounds(geohash.strip())
                 geometries.append(box(*bounds))
-            if GEOPANDAS_NEW_API:
-                return gpd.GeoSeries(geometries).union_all()
-            else:
-                return gpd.GeoSeries(geometries).unary_union
+            return _merge_geometries(gpd.GeoSeries(geometries))
         except Exception:
             raise
 
@@ -213,10 +227,7 @@ class H3GeometryParser(click.ParamType):  # type: ignore
 
             geometries.append(parsed_geometry)
 
-        if not GEOPANDAS_NEW_API:
-            return gpd.GeoSeries(geometries).unary_union
-
-        return gpd.GeoSeries(geometries).union_all()
+        return _merge_geometries(gpd.GeoSeries(geometries))
 
 
 class S2GeometryParser(click.ParamType):  # type: ignore
@@ -249,10 +260,7 @@ class S2GeometryParser(click.ParamType):  # type: ignore
                     f"Cannot parse provided S2 value: {stripped_s2_index}"
                 ) from None
 
-        if not GEOPANDAS_NEW_API:
-            return gpd.GeoSeries(geometries).unary_union
-
-        return gpd.GeoSeries(geometries).union_all()
+        return _merge_geometries(gpd.GeoSeries(geometries))
 
 
 class OsmTagsFilterJsonParser(click.ParamType):  # type: ignore
@@ -673,6 +681,97 @@ def main(
             show_default=True,
         ),
     ] = True,
+    cache_decoded_pbf: Annotated[
+        bool,
+        typer.Option(
+            "--cache-decoded-pbf/",
+            help=(
+                "Whether to keep decoded PBF file elements in the working directory."
+                " Next runs on the same file with different filters will skip decoding."
+            ),
+            show_default=False,
+        ),
+    ] = False,
+    parallel_pbf_decoding: Annotated[
+        bool,
+        typer.Option(
+            "--parallel-pbf-decoding/",
+            help=(
+                "Whether to split the PBF file into chunks and decode them in a pool of processes."
+            ),
+            show_default=False,
+        ),
+    ] = False,
+    pbf_spatial_index: Annotated[
+        bool,
+        typer.Option(
+            "--pbf-spatial-index/",
+            help=(
+                "Whether to save a sidecar index file next to the PBF file and use it"
+                " to skip decoding nodes blobs disjoint with the geometry filter."
+            ),
+            show_default=False,
+        ),
+    ] = False,
+    nodes_locations_index: Annotated[
+        bool,
+        typer.Option(
+            "--nodes-locations-index/",
+            help=(
+                "Whether to resolve ways nodes coordinates using a memory-mapped nodes"
+                " locations index instead of joining ways with nodes in DuckDB."
+            ),
+            show_default=False,
+        ),
+    ] = False,
+    intersection_engine: Annotated[
+        str,
+        typer.Option(
+            "--intersection-engine",
+            help=(
+                "Engine used to intersect nodes with the geometry filter. Python uses a pool of"
+                " processes with prepared geometry, DuckDB uses ST_Intersects inside of the query"
+                " and auto selects one of them based on the geometry filter complexity."
+                " Polygon sets are always intersected with the Python engine."
+            ),
+            click_type=click.Choice(["auto", "python", "duckdb"], case_sensitive=False),
+            show_default="auto",
+        ),
+    ] = "auto",
+    cache_geometry_intersection: Annotated[
+        bool,
+        typer.Option(
+            "--cache-geometry-intersection/",
+            help=(
+                "Whether to keep ids of elements intersecting the geometry filter in the working"
+                " directory and reuse them in next runs with the same PBF file and geometry."
+            ),
+            show_default=False,
+        ),
+    ] = False,
+    way_assembly_engine: Annotated[
+        str,
+        typer.Option(
+            "--way-assembly-engine",
+            help=(
+                "Engine used to assemble ways geometries. DuckDB aggregates ways points with"
+                " spatial functions, numpy sorts points arrays and builds WKB geometries directly."
+            ),
+            click_type=click.Choice(["duckdb", "numpy"], case_sensitive=False),
+            show_default="duckdb",
+        ),
+    ] = "duckdb",
+    checkpoint_stages: Annotated[
+        bool,
+        typer.Option(
+            "--checkpoint-stages/",
+            help=(
+                "Whether to keep intermediate files in a persistent run directory and resume"
+                " an interrupted conversion from the last completed stage."
+            ),
+            show_default=False,
+        ),
+    ] = False,
     wkt_result: Annotated[
         bool,
         typer.Option(
@@ -769,6 +868,8 @@ def main(
             f"Provided incompatible parquet_version ({parquet_version}). Valid options: v1 and v2."
         )
     parquet_version = cast('Literal["v1", "v2"]', parquet_version)
+    intersection_engine = cast("INTERSECTION_ENGINE", intersection_engine.lower())
+    way_assembly_engine = cast("WAY_ASSEMBLY_ENGINE", way_assembly_engine.lower())
 
     number_of_geometries_provided = sum(
         geom is not None
@@ -862,6 +963,14 @@ def main(
                 else None
             ),
             ignore_metadata_tags=ignore_metadata_tags,
+            cache_decoded_pbf=cache_decoded_pbf,
+            parallel_pbf_decoding=parallel_pbf_decoding,
+            pbf_spatial_index=pbf_spatial_index,
+            nodes_locations_index=nodes_locations_index,
+            intersection_engine=intersection_engine,
+            cache_geometry_intersection=cache_geometry_intersection,
+            way_assembly_engine=way_assembly_engine,
+            checkpoint_stages=checkpoint_stages,
             filter_osm_ids=filter_osm_ids,  # type: ignore
             custom_sql_filter=custom_sql_filter,
             sort_result=sort_result,
@@ -891,6 +1000,14 @@ def main(
                 else None
             ),
             ignore_metadata_tags=ignore_metadata_tags,
+            cache_decoded_pbf=cache_decoded_pbf,
+            parallel_pbf_decoding=parallel_pbf_decoding,
+            pbf_spatial_index=pbf_spatial_index,
+            nodes_locations_index=nodes_locations_index,
+            intersection_engine=intersection_engine,
+            cache_geometry_intersection=cache_geometry_intersection,
+            way_assembly_engine=way_assembly_engine,
+            checkpoint_stages=checkpoint_stages,
             filter_osm_ids=filter_osm_ids,  # type: ignore
             custom_sql_filter=custom_sql_filter,
             sort_result=sort_result,
@@ -923,6 +1040,14 @@ def main(
                     else None
                 ),
                 ignore_metadata_tags=ignore_metadata_tags,
+                cache_decoded_pbf=cache_decoded_pbf,
+                parallel_pbf_decoding=parallel_pbf_decoding,
+                pbf_spatial_index=pbf_spatial_index,
+                nodes_locations_index=nodes_locations_index,
+                intersection_engine=intersection_engine,
+                cache_geometry_intersection=cache_geometry_intersection,
+                way_assembly_engine=way_assembly_engine,
+                checkpoint_stages=checkpoint_stages,
                 filter_osm_ids=filter_osm_ids,  # type: ignore
                 custom_sql_filter=custom_sql_filter,
                 sort_result=sort_result,
@@ -961,6 +1086,14 @@ def main(
                     else None
                 ),
                 ignore_metadata_tags=ignore_metadata_tags,
+                cache_decoded_pbf=cache_decoded_pbf,
+                parallel_pbf_decoding=parallel_pbf_decoding,
+                pbf_spatial_index=pbf_spatial_index,
+                nodes_locations_index=nodes_locations_index,
+                intersection_engine=intersection_engine,
+                cache_geometry_intersection=cache_geometry_intersection,
+                way_assembly_engine=way_assembly_engine,
+                checkpoint_stages=checkpoint_stages,
                 filter_osm_ids=filter_osm_ids,  # type: ignore
                 custom_sql_filter=custom_sql_filter,
                 sort_result=sort_result,
@@ -997,6 +1130,14 @@ def main(
                 else None
             ),
             ignore_metadata_tags=ignore_metadata_tags,
+            cache_decoded_pbf=cache_decoded_pbf,
+            parallel_pbf_decoding=parallel_pbf_decoding,
+            pbf_spatial_index=pbf_spatial_index,
+            nodes_locations_index=nodes_locations_index,
+            intersection_engine=intersection_engine,
+            cache_geometry_intersection=cache_geometry_intersection,
+            way_assembly_engine=way_assembly_engine,
+            checkpoint_stages=checkpoint_stages,
             filter_osm_ids=filter_osm_ids,  # type: ignore
             custom_sql_filter=custom_sql_filter,
             sort_result=sort_result,
@@ -1028,6 +1169,14 @@ def main(
                 else None
             ),
             ignore_metadata_tags=ignore_metadata_tags,
+            cache_decoded_pbf=cache_decoded_pbf,
+            parallel_pbf_decoding=parallel_pbf_decoding,
+            pbf_spatial_index=pbf_spatial_index,
+            nodes_locations_index=nodes_locations_index,
+            intersection_engine=intersection_engine,
+            cache_geometry_intersection=cache_geometry_intersection,
+            way_assembly_engine=way_assembly_engine,
+            checkpoint_stages=checkpoint_stages,
             filter_osm_ids=filter_osm_ids,  # type: ignore
             custom_sql_filter=custom_sql_filter,
             duckdb_table_name=duckdb_table_name or "quackosm",
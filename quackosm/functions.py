@@ -18,9 +18,11 @@ from quackosm._constants import (
     PARQUET_ROW_GROUP_SIZE,
     PARQUET_VERSION,
 )
+from quackosm._intersection import INTERSECTION_ENGINE
 from quackosm._osm_tags_filters import GroupedOsmTagsFilter, OsmTagsFilter
 from quackosm._osm_way_polygon_features import OsmWayPolygonConfig
 from quackosm._rich_progress import VERBOSITY_MODE
+from quackosm._ways_assembly import WAY_ASSEMBLY_ENGINE
 from quackosm.osm_extracts import OsmExtractSource, download_extract_by_query
 from quackosm.pbf_file_reader import PbfFileReader
 
@@ -62,6 +64,14 @@ def convert_pbf_to_duckdb(
     cpu_limit: Optional[int] = None,
     include_non_closed_relations: bool = False,
     include_node_only_relations: bool = False,
+    cache_decoded_pbf: bool = False,
+    parallel_pbf_decoding: bool = False,
+    pbf_spatial_index: bool = False,
+    nodes_locations_index: bool = False,
+    intersection_engine: INTERSECTION_ENGINE = "auto",
+    cache_geometry_intersection: bool = False,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+    checkpoint_stages: bool = False,
 ) -> Path:
     """
     Convert PBF file to DuckDB file.
@@ -142,6 +152,35 @@ def convert_pbf_to_duckdb(
             Common use cases: type='site' relations with location markers, type='network'
             relations with junction nodes. When False (default), node-only relations are
             excluded. Defaults to `False`.
+        cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements and
+            intermediate files that don't depend on the tags, geometry or custom SQL filters in
+            the `working_directory`. Next runs on the same file will skip decoding and start from
+            the filtering stage. Defaults to `False`.
+        parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks based
+            on the blobs offsets and decode them in a pool of processes. Can speed up decoding of
+            big files on machines with many cores. Defaults to `False`.
+        pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to the PBF
+            file and use it in next runs with a geometry filter to skip decoding nodes blobs
+            that aren't required. Defaults to `False`.
+        nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+            memory-mapped index and resolve ways nodes references with vectorised lookups instead
+            of joining ways with nodes in DuckDB. Defaults to `False`.
+        intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes with
+            the geometry filter. `python` uses a pool of processes with prepared geometry, `duckdb`
+            uses `ST_Intersects` inside of the DuckDB query and `auto` selects one of them based on
+            the geometry filter complexity and the number of nodes. Defaults to `auto`.
+        cache_geometry_intersection (bool, optional): If True, will keep ids of elements
+            intersecting the geometry filter in the `working_directory`, keyed by the PBF file
+            content fingerprint and the geometry filter hash. Next runs with the same file and
+            geometry filter will skip the intersection. Defaults to `False`.
+        way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+            geometries. `duckdb` aggregates ways points and builds geometries with DuckDB spatial
+            functions, `numpy` sorts points arrays and builds WKB geometries directly.
+            Defaults to `duckdb`.
+        checkpoint_stages (bool, optional): If True, will keep intermediate files in a persistent
+            run directory in the `working_directory` together with a list of completed stages.
+            Rerunning an interrupted conversion with the same parameters will resume from
+            the last completed stage. Defaults to `False`.
 
     Returns:
         Path: Path to the generated DuckDB file.
@@ -284,7 +323,7 @@ def convert_pbf_to_duckdb(
         │ 2168 rows (20 shown)                                                         3 columns │
         └────────────────────────────────────────────────────────────────────────────────────────┘
     """
-    result_path = PbfFileReader(
+    with PbfFileReader(
         tags_filter=tags_filter,
         geometry_filter=geometry_filter,
         custom_sql_filter=custom_sql_filter,
@@ -301,16 +340,25 @@ def convert_pbf_to_duckdb(
         cpu_limit=cpu_limit,
         include_non_closed_relations=include_non_closed_relations,
         include_node_only_relations=include_node_only_relations,
-    ).convert_pbf_to_duckdb(
-        pbf_path=pbf_path,
-        result_file_path=result_file_path,
-        keep_all_tags=keep_all_tags,
-        explode_tags=explode_tags,
-        sort_result=sort_result,
-        ignore_cache=ignore_cache,
-        filter_osm_ids=filter_osm_ids,
-        duckdb_table_name=duckdb_table_name,
-    )
+        cache_decoded_pbf=cache_decoded_pbf,
+        parallel_pbf_decoding=parallel_pbf_decoding,
+        pbf_spatial_index=pbf_spatial_index,
+        nodes_locations_index=nodes_locations_index,
+        intersection_engine=intersection_engine,
+        cache_geometry_intersection=cache_geometry_intersection,
+        way_assembly_engine=way_assembly_engine,
+        checkpoint_stages=checkpoint_stages,
+    ) as reader:
+        result_path = reader.convert_pbf_to_duckdb(
+            pbf_path=pbf_path,
+            result_file_path=result_file_path,
+            keep_all_tags=keep_all_tags,
+            explode_tags=explode_tags,
+            sort_result=sort_result,
+            ignore_cache=ignore_cache,
+            filter_osm_ids=filter_osm_ids,
+            duckdb_table_name=duckdb_table_name,
+        )
     return Path(result_path)
 
 
@@ -341,6 +389,14 @@ def convert_geometry_to_duckdb(
     cpu_limit: Optional[int] = None,
     include_non_closed_relations: bool = False,
     include_node_only_relations: bool = False,
+    cache_decoded_pbf: bool = False,
+    parallel_pbf_decoding: bool = False,
+    pbf_spatial_index: bool = False,
+    nodes_locations_index: bool = False,
+    intersection_engine: INTERSECTION_ENGINE = "auto",
+    cache_geometry_intersection: bool = False,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+    checkpoint_stages: bool = False,
 ) -> Path:
     """
     Get a DuckDB file with OpenStreetMap features within given geometry.
@@ -432,6 +488,35 @@ def convert_geometry_to_duckdb(
             Common use cases: type='site' relations with location markers, type='network'
             relations with junction nodes. When False (default), node-only relations are
             excluded. Defaults to `False`.
+        cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements and
+            intermediate files that don't depend on the tags, geometry or custom SQL filters in
+            the `working_directory`. Next runs on the same file will skip decoding and start from
+            the filtering stage. Defaults to `False`.
+        parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks based
+            on the blobs offsets and decode them in a pool of processes. Can speed up decoding of
+            big files on machines with many cores. Defaults to `False`.
+        pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to the PBF
+            file and use it in next runs with a geometry filter to skip decoding nodes blobs
+            that aren't required. Defaults to `False`.
+        nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+            memory-mapped index and resolve ways nodes references with vectorised lookups instead
+            of joining ways with nodes in DuckDB. Defaults to `False`.
+        intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes with
+            the geometry filter. `python` uses a pool of processes with prepared geometry, `duckdb`
+            uses `ST_Intersects` inside of the DuckDB query and `auto` selects one of them based on
+            the geometry filter complexity and the number of nodes. Defaults to `auto`.
+        cache_geometry_intersection (bool, optional): If True, will keep ids of elements
+            intersecting the geometry filter in the `working_directory`, keyed by the PBF file
+            content fingerprint and the geometry filter hash. Next runs with the same file and
+            geometry filter will skip the intersection. Defaults to `False`.
+        way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+            geometries. `duckdb` aggregates ways points and builds geometries with DuckDB spatial
+            functions, `numpy` sorts points arrays and builds WKB geometries directly.
+            Defaults to `duckdb`.
+        checkpoint_stages (bool, optional): If True, will keep intermediate files in a persistent
+            run directory in the `working_directory` together with a list of completed stages.
+            Rerunning an interrupted conversion with the same parameters will resume from
+            the last completed stage. Defaults to `False`.
 
     Returns:
         Path: Path to the generated DuckDB file.
@@ -529,7 +614,7 @@ def convert_geometry_to_duckdb(
         │ 1384 rows (20 shown)                                                                   │
         └────────────────────────────────────────────────────────────────────────────────────────┘
     """
-    result_path = PbfFileReader(
+    with PbfFileReader(
         tags_filter=tags_filter,
         geometry_filter=geometry_filter,
         custom_sql_filter=custom_sql_filter,
@@ -549,15 +634,24 @@ def convert_geometry_to_duckdb(
         cpu_limit=cpu_limit,
         include_non_closed_relations=include_non_closed_relations,
         include_node_only_relations=include_node_only_relations,
-    ).convert_geometry_to_duckdb(
-        result_file_path=result_file_path,
-        keep_all_tags=keep_all_tags,
-        explode_tags=explode_tags,
-        sort_result=sort_result,
-        ignore_cache=ignore_cache,
-        filter_osm_ids=filter_osm_ids,
-        duckdb_table_name=duckdb_table_name,
-    )
+        cache_decoded_pbf=cache_decoded_pbf,
+        parallel_pbf_decoding=parallel_pbf_decoding,
+        pbf_spatial_index=pbf_spatial_index,
+        nodes_locations_index=nodes_locations_index,
+        intersection_engine=intersection_engine,
+        cache_geometry_intersection=cache_geometry_intersection,
+        way_assembly_engine=way_assembly_engine,
+        checkpoint_stages=checkpoint_stages,
+    ) as reader:
+        result_path = reader.convert_geometry_to_duckdb(
+            result_file_path=result_file_path,
+            keep_all_tags=keep_all_tags,
+            explode_tags=explode_tags,
+            sort_result=sort_result,
+            ignore_cache=ignore_cache,
+            filter_osm_ids=filter_osm_ids,
+            duckdb_table_name=duckdb_table_name,
+        )
     return Path(result_path)
 
 
@@ -587,6 +681,14 @@ def convert_osm_extract_to_duckdb(
     cpu_limit: Optional[int] = None,
     include_non_closed_relations: bool = False,
     include_node_only_relations: bool = False,
+    cache_decoded_pbf: bool = False,
+    parallel_pbf_decoding: bool = False,
+    pbf_spatial_index: bool = False,
+    nodes_locations_index: bool = False,
+    intersection_engine: INTERSECTION_ENGINE = "auto",
+    cache_geometry_intersection: bool = False,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+    checkpoint_stages: bool = False,
 ) -> Path:
     """
     Get a single OpenStreetMap extract from a given source and transform it to a DuckDB file.
@@ -670,6 +772,35 @@ def convert_osm_extract_to_duckdb(
             Common use cases: type='site' relations with location markers, type='network'
             relations with junction nodes. When False (default), node-only relations are
             excluded. Defaults to `False`.
+        cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements and
+            intermediate files that don't depend on the tags, geometry or custom SQL filters in
+            the `working_directory`. Next runs on the same file will skip decoding and start from
+            the filtering stage. Defaults to `False`.
+        parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks based
+            on the blobs offsets and decode them in a pool of processes. Can speed up decoding of
+            big files on machines with many cores. Defaults to `False`.
+        pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to the PBF
+            file and use it in next runs with a geometry filter to skip decoding nodes blobs
+            that aren't required. Defaults to `False`.
+        nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+            memory-mapped index and resolve ways nodes references with vectorised lookups instead
+            of joining ways with nodes in DuckDB. Defaults to `False`.
+        intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes with
+            the geometry filter. `python` uses a pool of processes with prepared geometry, `duckdb`
+            uses `ST_Intersects` inside of the DuckDB query and `auto` selects one of them based on
+            the geometry filter complexity and the number of nodes. Defaults to `auto`.
+        cache_geometry_intersection (bool, optional): If True, will keep ids of elements
+            intersecting the geometry filter in the `working_directory`, keyed by the PBF file
+            content fingerprint and the geometry filter hash. Next runs with the same file and
+            geometry filter will skip the intersection. Defaults to `False`.
+        way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+            geometries. `duckdb` aggregates ways points and builds geometries with DuckDB spatial
+            functions, `numpy` sorts points arrays and builds WKB geometries directly.
+            Defaults to `duckdb`.
+        checkpoint_stages (bool, optional): If True, will keep intermediate files in a persistent
+            run directory in the `working_directory` together with a list of completed stages.
+            Rerunning an interrupted conversion with the same parameters will resume from
+            the last completed stage. Defaults to `False`.
 
     Returns:
         Path: Path to the generated DuckDB file.
@@ -731,7 +862,7 @@ def convert_osm_extract_to_duckdb(
     downloaded_osm_extract = download_extract_by_query(
         query=osm_extract_query, source=osm_extract_source, progressbar=verbosity_mode != "silent"
     )
-    result_path = PbfFileReader(
+    with PbfFileReader(
         tags_filter=tags_filter,
         geometry_filter=geometry_filter,
         custom_sql_filter=custom_sql_filter,
@@ -748,16 +879,25 @@ def convert_osm_extract_to_duckdb(
         cpu_limit=cpu_limit,
         include_non_closed_relations=include_non_closed_relations,
         include_node_only_relations=include_node_only_relations,
-    ).convert_pbf_to_duckdb(
-        pbf_path=downloaded_osm_extract,
-        result_file_path=result_file_path,
-        keep_all_tags=keep_all_tags,
-        explode_tags=explode_tags,
-        sort_result=sort_result,
-        ignore_cache=ignore_cache,
-        filter_osm_ids=filter_osm_ids,
-        duckdb_table_name=duckdb_table_name,
-    )
+        cache_decoded_pbf=cache_decoded_pbf,
+        parallel_pbf_decoding=parallel_pbf_decoding,
+        pbf_spatial_index=pbf_spatial_index,
+        nodes_locations_index=nodes_locations_index,
+        intersection_engine=intersection_engine,
+        cache_geometry_intersection=cache_geometry_intersection,
+        way_assembly_engine=way_assembly_engine,
+        checkpoint_stages=checkpoint_stages,
+    ) as reader:
+        result_path = reader.convert_pbf_to_duckdb(
+            pbf_path=downloaded_osm_extract,
+            result_file_path=result_file_path,
+            keep_all_tags=keep_all_tags,
+            explode_tags=explode_tags,
+            sort_result=sort_result,
+            ignore_cache=ignore_cache,
+            filter_osm_ids=filter_osm_ids,
+            duckdb_table_name=duckdb_table_name,
+        )
     return Path(result_path)
 
 
@@ -786,6 +926,14 @@ def convert_pbf_to_parquet(
     cpu_limit: Optional[int] = None,
     include_non_closed_relations: bool = False,
     include_node_only_relations: bool = False,
+    cache_decoded_pbf: bool = False,
+    parallel_pbf_decoding: bool = False,
+    pbf_spatial_index: bool = False,
+    nodes_locations_index: bool = False,
+    intersection_engine: INTERSECTION_ENGINE = "auto",
+    cache_geometry_intersection: bool = False,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+    checkpoint_stages: bool = False,
 ) -> Path:
     """
     Convert PBF file to GeoParquet file.
@@ -868,6 +1016,35 @@ def convert_pbf_to_parquet(
             Common use cases: type='site' relations with location markers, type='network'
             relations with junction nodes. When False (default), node-only relations are
             excluded. Defaults to `False`.
+        cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements and
+            intermediate files that don't depend on the tags, geometry or custom SQL filters in
+            the `working_directory`. Next runs on the same file will skip decoding and start from
+            the filtering stage. Defaults to `False`.
+        parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks based
+            on the blobs offsets and decode them in a pool of processes. Can speed up decoding of
+            big files on machines with many cores. Defaults to `False`.
+        pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to the PBF
+            file and use it in next runs with a geometry filter to skip decoding nodes blobs
+            that aren't required. Defaults to `False`.
+        nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+            memory-mapped index and resolve ways nodes references with vectorised lookups instead
+            of joining ways with nodes in DuckDB. Defaults to `False`.
+        intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes with
+            the geometry filter. `python` uses a pool of processes with prepared geometry, `duckdb`
+            uses `ST_Intersects` inside of the DuckDB query and `auto` selects one of them based on
+            the geometry filter complexity and the number of nodes. Defaults to `auto`.
+        cache_geometry_intersection (bool, optional): If True, will keep ids of elements
+            intersecting the geometry filter in the `working_directory`, keyed by the PBF file
+            content fingerprint and the geometry filter hash. Next runs with the same file and
+            geometry filter will skip the intersection. Defaults to `False`.
+        way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+            geometries. `duckdb` aggregates ways points and builds geometries with DuckDB spatial
+            functions, `numpy` sorts points arrays and builds WKB geometries directly.
+            Defaults to `duckdb`.
+        checkpoint_stages (bool, optional): If True, will keep intermediate files in a persistent
+            run directory in the `working_directory` together with a list of completed stages.
+            Rerunning an interrupted conversion with the same parameters will resume from
+            the last completed stage. Defaults to `False`.
 
     Returns:
         Path: Path to the generated GeoParquet file.
@@ -1008,7 +1185,7 @@ def convert_pbf_to_parquet(
         │ 2140 rows (20 shown)                                                         3 columns │
         └────────────────────────────────────────────────────────────────────────────────────────┘
     """
-    result_path = PbfFileReader(
+    with PbfFileReader(
         tags_filter=tags_filter,
         geometry_filter=geometry_filter,
         custom_sql_filter=custom_sql_filter,
@@ -1025,16 +1202,25 @@ def convert_pbf_to_parquet(
         cpu_limit=cpu_limit,
         include_non_closed_relations=include_non_closed_relations,
         include_node_only_relations=include_node_only_relations,
-    ).convert_pbf_to_parquet(
-        pbf_path=pbf_path,
-        result_file_path=result_file_path,
-        keep_all_tags=keep_all_tags,
-        explode_tags=explode_tags,
-        sort_result=sort_result,
-        ignore_cache=ignore_cache,
-        filter_osm_ids=filter_osm_ids,
-        save_as_wkt=save_as_wkt,
-    )
+        cache_decoded_pbf=cache_decoded_pbf,
+        parallel_pbf_decoding=parallel_pbf_decoding,
+        pbf_spatial_index=pbf_spatial_index,
+        nodes_locations_index=nodes_locations_index,
+        intersection_engine=intersection_engine,
+        cache_geometry_intersection=cache_geometry_intersection,
+        way_assembly_engine=way_assembly_engine,
+        checkpoint_stages=checkpoint_stages,
+    ) as reader:
+        result_path = reader.convert_pbf_to_parquet(
+            pbf_path=pbf_path,
+            result_file_path=result_file_path,
+            keep_all_tags=keep_all_tags,
+            explode_tags=explode_tags,
+            sort_result=sort_result,
+            ignore_cache=ignore_cache,
+            filter_osm_ids=filter_osm_ids,
+            save_as_wkt=save_as_wkt,
+        )
     return Path(result_path)
 
 
@@ -1065,6 +1251,14 @@ def convert_geometry_to_parquet(
     cpu_limit: Optional[int] = None,
     include_non_closed_relations: bool = False,
     include_node_only_relations: bool = False,
+    cache_decoded_pbf: bool = False,
+    parallel_pbf_decoding: bool = False,
+    pbf_spatial_index: bool = False,
+    nodes_locations_index: bool = False,
+    intersection_engine: INTERSECTION_ENGINE = "auto",
+    cache_geometry_intersection: bool = False,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+    checkpoint_stages: bool = False,
 ) -> Path:
     """
     Get a GeoParquet file with OpenStreetMap features within given geometry.
@@ -1158,6 +1352,35 @@ def convert_geometry_to_parquet(
             Common use cases: type='site' relations with location markers, type='network'
             relations with junction nodes. When False (default), node-only relations are
             excluded. Defaults to `False`.
+        cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements and
+            intermediate files that don't depend on the tags, geometry or custom SQL filters in
+            the `working_directory`. Next runs on the same file will skip decoding and start from
+            the filtering stage. Defaults to `False`.
+        parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks based
+            on the blobs offsets and decode them in a pool of processes. Can speed up decoding of
+            big files on machines with many cores. Defaults to `False`.
+        pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to the PBF
+            file and use it in next runs with a geometry filter to skip decoding nodes blobs
+            that aren't required. Defaults to `False`.
+        nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+            memory-mapped index and resolve ways nodes references with vectorised lookups instead
+            of joining ways with nodes in DuckDB. Defaults to `False`.
+        intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes with
+            the geometry filter. `python` uses a pool of processes with prepared geometry, `duckdb`
+            uses `ST_Intersects` inside of the DuckDB query and `auto` selects one of them based on
+            the geometry filter complexity and the number of nodes. Defaults to `auto`.
+        cache_geometry_intersection (bool, optional): If True, will keep ids of elements
+            intersecting the geometry filter in the `working_directory`, keyed by the PBF file
+            content fingerprint and the geometry filter hash. Next runs with the same file and
+            geometry filter will skip the intersection. Defaults to `False`.
+        way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+            geometries. `duckdb` aggregates ways points and builds geometries with DuckDB spatial
+            functions, `numpy` sorts points arrays and builds WKB geometries directly.
+            Defaults to `duckdb`.
+        checkpoint_stages (bool, optional): If True, will keep intermediate files in a persistent
+            run directory in the `working_directory` together with a list of completed stages.
+            Rerunning an interrupted conversion with the same parameters will resume from
+            the last completed stage. Defaults to `False`.
 
     Returns:
         Path: Path to the generated GeoParquet file.
@@ -1252,7 +1475,7 @@ def convert_geometry_to_parquet(
         │ 1384 rows (20 shown)                                                                   │
         └────────────────────────────────────────────────────────────────────────────────────────┘
     """
-    result_path = PbfFileReader(
+    with PbfFileReader(
         tags_filter=tags_filter,
         geometry_filter=geometry_filter,
         custom_sql_filter=custom_sql_filter,
@@ -1272,15 +1495,24 @@ def convert_geometry_to_parquet(
         cpu_limit=cpu_limit,
         include_non_closed_relations=include_non_closed_relations,
         include_node_only_relations=include_node_only_relations,
-    ).convert_geometry_to_parquet(
-        result_file_path=result_file_path,
-        keep_all_tags=keep_all_tags,
-        explode_tags=explode_tags,
-        sort_result=sort_result,
-        ignore_cache=ignore_cache,
-        filter_osm_ids=filter_osm_ids,
-        save_as_wkt=save_as_wkt,
-    )
+        cache_decoded_pbf=cache_decoded_pbf,
+        parallel_pbf_decoding=parallel_pbf_decoding,
+        pbf_spatial_index=pbf_spatial_index,
+        nodes_locations_index=nodes_locations_index,
+        intersection_engine=intersection_engine,
+        cache_geometry_intersection=cache_geometry_intersection,
+        way_assembly_engine=way_assembly_engine,
+        checkpoint_stages=checkpoint_stages,
+    ) as reader:
+        result_path = reader.convert_geometry_to_parquet(
+            result_file_path=result_file_path,
+            keep_all_tags=keep_all_tags,
+            explode_tags=explode_tags,
+            sort_result=sort_result,
+            ignore_cache=ignore_cache,
+            filter_osm_ids=filter_osm_ids,
+            save_as_wkt=save_as_wkt,
+        )
     return Path(result_path)
 
 
@@ -1310,6 +1542,14 @@ def convert_osm_extract_to_parquet(
     cpu_limit: Optional[int] = None,
     include_non_closed_relations: bool = False,
     include_node_only_relations: bool = False,
+    cache_decoded_pbf: bool = False,
+    parallel_pbf_decoding: bool = False,
+    pbf_spatial_index: bool = False,
+    nodes_locations_index: bool = False,
+    intersection_engine: INTERSECTION_ENGINE = "auto",
+    cache_geometry_intersection: bool = False,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+    checkpoint_stages: bool = False,
 ) -> Path:
     """
     Get a single OpenStreetMap extract from a given source and transform it to a GeoParquet file.
@@ -1395,6 +1635,35 @@ def convert_osm_extract_to_parquet(
             Common use cases: type='site' relations with location markers, type='network'
             relations with junction nodes. When False (default), node-only relations are
             excluded. Defaults to `False`.
+        cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements and
+            intermediate files that don't depend on the tags, geometry or custom SQL filters in
+            the `working_directory`. Next runs on the same file will skip decoding and start from
+            the filtering stage. Defaults to `False`.
+        parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks based
+            on the blobs offsets and decode them in a pool of processes. Can speed up decoding of
+            big files on machines with many cores. Defaults to `False`.
+        pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to the PBF
+            file and use it in next runs with a geometry filter to skip decoding nodes blobs
+            that aren't required. Defaults to `False`.
+        nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+            memory-mapped index and resolve ways nodes references with vectorised lookups instead
+            of joining ways with nodes in DuckDB. Defaults to `False`.
+        intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes with
+            the geometry filter. `python` uses a pool of processes with prepared geometry, `duckdb`
+            uses `ST_Intersects` inside of the DuckDB query and `auto` selects one of them based on
+            the geometry filter complexity and the number of nodes. Defaults to `auto`.
+        cache_geometry_intersection (bool, optional): If True, will keep ids of elements
+            intersecting the geometry filter in the `working_directory`, keyed by the PBF file
+            content fingerprint and the geometry filter hash. Next runs with the same file and
+            geometry filter will skip the intersection. Defaults to `False`.
+        way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+            geometries. `duckdb` aggregates ways points and builds geometries with DuckDB spatial
+            functions, `numpy` sorts points arrays and builds WKB geometries directly.
+            Defaults to `duckdb`.
+        checkpoint_stages (bool, optional): If True, will keep intermediate files in a persistent
+            run directory in the `working_directory` together with a list of completed stages.
+            Rerunning an interrupted conversion with the same parameters will resume from
+            the last completed stage. Defaults to `False`.
 
     Returns:
         Path: Path to the generated GeoParquet file.
@@ -1455,7 +1724,7 @@ def convert_osm_extract_to_parquet(
     downloaded_osm_extract = download_extract_by_query(
         query=osm_extract_query, source=osm_extract_source, progressbar=verbosity_mode != "silent"
     )
-    result_path = PbfFileReader(
+    with PbfFileReader(
         tags_filter=tags_filter,
         geometry_filter=geometry_filter,
         custom_sql_filter=custom_sql_filter,
@@ -1472,16 +1741,25 @@ def convert_osm_extract_to_parquet(
         cpu_limit=cpu_limit,
         include_non_closed_relations=include_non_closed_relations,
         include_node_only_relations=include_node_only_relations,
-    ).convert_pbf_to_parquet(
-        pbf_path=downloaded_osm_extract,
-        result_file_path=result_file_path,
-        keep_all_tags=keep_all_tags,
-        explode_tags=explode_tags,
-        sort_result=sort_result,
-        ignore_cache=ignore_cache,
-        filter_osm_ids=filter_osm_ids,
-        save_as_wkt=save_as_wkt,
-    )
+        cache_decoded_pbf=cache_decoded_pbf,
+        parallel_pbf_decoding=parallel_pbf_decoding,
+        pbf_spatial_index=pbf_spatial_index,
+        nodes_locations_index=nodes_locations_index,
+        intersection_engine=intersection_engine,
+        cache_geometry_intersection=cache_geometry_intersection,
+        way_assembly_engine=way_assembly_engine,
+        checkpoint_stages=checkpoint_stages,
+    ) as reader:
+        result_path = reader.convert_pbf_to_parquet(
+            pbf_path=downloaded_osm_extract,
+            result_file_path=result_file_path,
+            keep_all_tags=keep_all_tags,
+            explode_tags=explode_tags,
+            sort_result=sort_result,
+            ignore_cache=ignore_cache,
+            filter_osm_ids=filter_osm_ids,
+            save_as_wkt=save_as_wkt,
+        )
     return Path(result_path)
 
 
@@ -1509,6 +1787,14 @@ def convert_pbf_to_geodataframe(
     cpu_limit: Optional[int] = None,
     include_non_closed_relations: bool = False,
     include_node_only_relations: bool = False,
+    cache_decoded_pbf: bool = False,
+    parallel_pbf_decoding: bool = False,
+    pbf_spatial_index: bool = False,
+    nodes_locations_index: bool = False,
+    intersection_engine: INTERSECTION_ENGINE = "auto",
+    cache_geometry_intersection: bool = False,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+    checkpoint_stages: bool = False,
 ) -> gpd.GeoDataFrame:
     """
     Get features GeoDataFrame from a PBF file or list of PBF files.
@@ -1588,6 +1874,35 @@ def convert_pbf_to_geodataframe(
             Common use cases: type='site' relations with location markers, type='network'
             relations with junction nodes. When False (default), node-only relations are
             excluded. Defaults to `False`.
+        cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements and
+            intermediate files that don't depend on the tags, geometry or custom SQL filters in
+            the `working_directory`. Next runs on the same file will skip decoding and start from
+            the filtering stage. Defaults to `False`.
+        parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks based
+            on the blobs offsets and decode them in a pool of processes. Can speed up decoding of
+            big files on machines with many cores. Defaults to `False`.
+        pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to the PBF
+            file and use it in next runs with a geometry filter to skip decoding nodes blobs
+            that aren't required. Defaults to `False`.
+        nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+            memory-mapped index and resolve ways nodes references with vectorised lookups instead
+            of joining ways with nodes in DuckDB. Defaults to `False`.
+        intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes with
+            the geometry filter. `python` uses a pool of processes with prepared geometry, `duckdb`
+            uses `ST_Intersects` inside of the DuckDB query and `auto` selects one of them based on
+            the geometry filter complexity and the number of nodes. Defaults to `auto`.
+        cache_geometry_intersection (bool, optional): If True, will keep ids of elements
+            intersecting the geometry filter in the `working_directory`, keyed by the PBF file
+            content fingerprint and the geometry filter hash. Next runs with the same file and
+            geometry filter will skip the intersection. Defaults to `False`.
+        way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+            geometries. `duckdb` aggregates ways points and builds geometries with DuckDB spatial
+            functions, `numpy` sorts points arrays and builds WKB geometries directly.
+            Defaults to `duckdb`.
+        checkpoint_stages (bool, optional): If True, will keep intermediate files in a persistent
+            run directory in the `working_directory` together with a list of completed stages.
+            Rerunning an interrupted conversion with the same parameters will resume from
+            the last completed stage. Defaults to `False`.
 
     Returns:
         gpd.GeoDataFrame: GeoDataFrame with OSM features.
@@ -1705,7 +2020,7 @@ def convert_pbf_to_geodataframe(
         <BLANKLINE>
         [3109 rows x 2 columns]
     """
-    return PbfFileReader(
+    with PbfFileReader(
         tags_filter=tags_filter,
         geometry_filter=geometry_filter,
         custom_sql_filter=custom_sql_filter,
@@ -1722,14 +2037,23 @@ def convert_pbf_to_geodataframe(
         cpu_limit=cpu_limit,
         include_non_closed_relations=include_non_closed_relations,
         include_node_only_relations=include_node_only_relations,
-    ).convert_pbf_to_geodataframe(
-        pbf_path=pbf_path,
-        keep_all_tags=keep_all_tags,
-        explode_tags=explode_tags,
-        sort_result=sort_result,
-        ignore_cache=ignore_cache,
-        filter_osm_ids=filter_osm_ids,
-    )
+        cache_decoded_pbf=cache_decoded_pbf,
+        parallel_pbf_decoding=parallel_pbf_decoding,
+        pbf_spatial_index=pbf_spatial_index,
+        nodes_locations_index=nodes_locations_index,
+        intersection_engine=intersection_engine,
+        cache_geometry_intersection=cache_geometry_intersection,
+        way_assembly_engine=way_assembly_engine,
+        checkpoint_stages=checkpoint_stages,
+    ) as reader:
+        return reader.convert_pbf_to_geodataframe(
+            pbf_path=pbf_path,
+            keep_all_tags=keep_all_tags,
+            explode_tags=explode_tags,
+            sort_result=sort_result,
+            ignore_cache=ignore_cache,
+            filter_osm_ids=filter_osm_ids,
+        )
 
 
 def convert_geometry_to_geodataframe(
@@ -1757,6 +2081,14 @@ def convert_geometry_to_geodataframe(
     cpu_limit: Optional[int] = None,
     include_non_closed_relations: bool = False,
     include_node_only_relations: bool = False,
+    cache_decoded_pbf: bool = False,
+    parallel_pbf_decoding: bool = False,
+    pbf_spatial_index: bool = False,
+    nodes_locations_index: bool = False,
+    intersection_engine: INTERSECTION_ENGINE = "auto",
+    cache_geometry_intersection: bool = False,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+    checkpoint_stages: bool = False,
 ) -> gpd.GeoDataFrame:
     """
     Get features GeoDataFrame with OpenStreetMap features within given geometry.
@@ -1844,6 +2176,35 @@ def convert_geometry_to_geodataframe(
             Common use cases: type='site' relations with location markers, type='network'
             relations with junction nodes. When False (default), node-only relations are
             excluded. Defaults to `False`.
+        cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements and
+            intermediate files that don't depend on the tags, geometry or custom SQL filters in
+            the `working_directory`. Next runs on the same file will skip decoding and start from
+            the filtering stage. Defaults to `False`.
+        parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks based
+            on the blobs offsets and decode them in a pool of processes. Can speed up decoding of
+            big files on machines with many cores. Defaults to `False`.
+        pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to the PBF
+            file and use it in next runs with a geometry filter to skip decoding nodes blobs
+            that aren't required. Defaults to `False`.
+        nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+            memory-mapped index and resolve ways nodes references with vectorised lookups instead
+            of joining ways with nodes in DuckDB. Defaults to `False`.
+        intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes with
+            the geometry filter. `python` uses a pool of processes with prepared geometry, `duckdb`
+            uses `ST_Intersects` inside of the DuckDB query and `auto` selects one of them based on
+            the geometry filter complexity and the number of nodes. Defaults to `auto`.
+        cache_geometry_intersection (bool, optional): If True, will keep ids of elements
+            intersecting the geometry filter in the `working_directory`, keyed by the PBF file
+            content fingerprint and the geometry filter hash. Next runs with the same file and
+            geometry filter will skip the intersection. Defaults to `False`.
+        way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+            geometries. `duckdb` aggregates ways points and builds geometries with DuckDB spatial
+            functions, `numpy` sorts points arrays and builds WKB geometries directly.
+            Defaults to `duckdb`.
+        checkpoint_stages (bool, optional): If True, will keep intermediate files in a persistent
+            run directory in the `working_directory` together with a list of completed stages.
+            Rerunning an interrupted conversion with the same parameters will resume from
+            the last completed stage. Defaults to `False`.
 
     Returns:
         gpd.GeoDataFrame: GeoDataFrame with OSM features.
@@ -1898,7 +2259,7 @@ def convert_geometry_to_geodataframe(
         <BLANKLINE>
         [1384 rows x 2 columns]
     """
-    return PbfFileReader(
+    with PbfFileReader(
         tags_filter=tags_filter,
         geometry_filter=geometry_filter,
         custom_sql_filter=custom_sql_filter,
@@ -1918,13 +2279,22 @@ def convert_geometry_to_geodataframe(
         cpu_limit=cpu_limit,
         include_non_closed_relations=include_non_closed_relations,
         include_node_only_relations=include_node_only_relations,
-    ).convert_geometry_to_geodataframe(
-        keep_all_tags=keep_all_tags,
-        explode_tags=explode_tags,
-        sort_result=sort_result,
-        ignore_cache=ignore_cache,
-        filter_osm_ids=filter_osm_ids,
-    )
+        cache_decoded_pbf=cache_decoded_pbf,
+        parallel_pbf_decoding=parallel_pbf_decoding,
+        pbf_spatial_index=pbf_spatial_index,
+        nodes_locations_index=nodes_locations_index,
+        intersection_engine=intersection_engine,
+        cache_geometry_intersection=cache_geometry_intersection,
+        way_assembly_engine=way_assembly_engine,
+        checkpoint_stages=checkpoint_stages,
+    ) as reader:
+        return reader.convert_geometry_to_geodataframe(
+            keep_all_tags=keep_all_tags,
+            explode_tags=explode_tags,
+            sort_result=sort_result,
+            ignore_cache=ignore_cache,
+            filter_osm_ids=filter_osm_ids,
+        )
 
 
 def convert_osm_extract_to_geodataframe(
@@ -1951,6 +2321,14 @@ def convert_osm_extract_to_geodataframe(
     cpu_limit: Optional[int] = None,
     include_non_closed_relations: bool = False,
     include_node_only_relations: bool = False,
+    cache_decoded_pbf: bool = False,
+    parallel_pbf_decoding: bool = False,
+    pbf_spatial_index: bool = False,
+    nodes_locations_index: bool = False,
+    intersection_engine: INTERSECTION_ENGINE = "auto",
+    cache_geometry_intersection: bool = False,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+    checkpoint_stages: bool = False,
 ) -> gpd.GeoDataFrame:
     """
     Get a single OpenStreetMap extract from a given source and return it as a GeoDataFrame.
@@ -2030,6 +2408,35 @@ def convert_osm_extract_to_geodataframe(
             Common use cases: type='site' relations with location markers, type='network'
             relations with junction nodes. When False (default), node-only relations are
             excluded. Defaults to `False`.
+        cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements and
+            intermediate files that don't depend on the tags, geometry or custom SQL filters in
+            the `working_directory`. Next runs on the same file will skip decoding and start from
+            the filtering stage. Defaults to `False`.
+        parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks based
+            on the blobs offsets and decode them in a pool of processes. Can speed up decoding of
+            big files on machines with many cores. Defaults to `False`.
+        pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to the PBF
+            file and use it in next runs with a geometry filter to skip decoding nodes blobs
+            that aren't required. Defaults to `False`.
+        nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+            memory-mapped index and resolve ways nodes references with vectorised lookups instead
+            of joining ways with nodes in DuckDB. Defaults to `False`.
+        intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes with
+            the geometry filter. `python` uses a pool of processes with prepared geometry, `duckdb`
+            uses `ST_Intersects` inside of the DuckDB query and `auto` selects one of them based on
+            the geometry filter complexity and the number of nodes. Defaults to `auto`.
+        cache_geometry_intersection (bool, optional): If True, will keep ids of elements
+            intersecting the geometry filter in the `working_directory`, keyed by the PBF file
+            content fingerprint and the geometry filter hash. Next runs with the same file and
+            geometry filter will skip the intersection. Defaults to `False`.
+        way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+            geometries. `duckdb` aggregates ways points and builds geometries with DuckDB spatial
+            functions, `numpy` sorts points arrays and builds WKB geometries directly.
+            Defaults to `duckdb`.
+        checkpoint_stages (bool, optional): If True, will keep intermediate files in a persistent
+            run directory in the `working_directory` together with a list of completed stages.
+            Rerunning an interrupted conversion with the same parameters will resume from
+            the last completed stage. Defaults to `False`.
 
     Returns:
         gpd.GeoDataFrame: GeoDataFrame with OSM features.
@@ -2083,7 +2490,7 @@ def convert_osm_extract_to_geodataframe(
     downloaded_osm_extract = download_extract_by_query(
         query=osm_extract_query, source=osm_extract_source, progressbar=verbosity_mode != "silent"
     )
-    return PbfFileReader(
+    with PbfFileReader(
         tags_filter=tags_filter,
         geometry_filter=geometry_filter,
         custom_sql_filter=custom_sql_filter,
@@ -2100,14 +2507,23 @@ def convert_osm_extract_to_geodataframe(
         cpu_limit=cpu_limit,
         include_non_closed_relations=include_non_closed_relations,
         include_node_only_relations=include_node_only_relations,
-    ).convert_pbf_to_geodataframe(
-        pbf_path=downloaded_osm_extract,
-        keep_all_tags=keep_all_tags,
-        explode_tags=explode_tags,
-        sort_result=sort_result,
-        ignore_cache=ignore_cache,
-        filter_osm_ids=filter_osm_ids,
-    )
+        cache_decoded_pbf=cache_decoded_pbf,
+        parallel_pbf_decoding=parallel_pbf_decoding,
+        pbf_spatial_index=pbf_spatial_index,
+        nodes_locations_index=nodes_locations_index,
+        intersection_engine=intersection_engine,
+        cache_geometry_intersection=cache_geometry_intersection,
+        way_assembly_engine=way_assembly_engine,
+        checkpoint_stages=checkpoint_stages,
+    ) as reader:
+        return reader.convert_pbf_to_geodataframe(
+            pbf_path=downloaded_osm_extract,
+            keep_all_tags=keep_all_tags,
+            explode_tags=explode_tags,
+            sort_result=sort_result,
+            ignore_cache=ignore_cache,
+            filter_osm_ids=filter_osm_ids,
+        )
 
 
 convert_pbf_to_gpq = deprecate(
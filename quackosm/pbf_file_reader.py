@@ -8,12 +8,14 @@ import hashlib
 import itertools
 import json
 import multiprocessing
+import os
 import secrets
 import shutil
 import tempfile
 import time
 import warnings
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from functools import partial
 from math import ceil, floor
 from pathlib import Path
 from time import sleep
@@ -28,6 +30,7 @@ import psutil
 import pyarrow as pa
 import pyarrow.compute as pc
 import pyarrow.parquet as pq
+import shapely
 import shapely.wkt as wktlib
 from geoarrow.pyarrow import io
 from pandas.util._decorators import deprecate, deprecate_kwarg
@@ -44,6 +47,7 @@ from rq_geo_toolkit.multiprocessing_utils import WorkerProcess
 from shapely.geometry import LinearRing, Polygon
 from shapely.geometry.base import BaseGeometry, BaseMultipartGeometry
 
+from quackosm._checkpoints import RunCheckpoint
 from quackosm._constants import (
     FEATURES_INDEX,
     GEOMETRY_COLUMN,
@@ -56,11 +60,29 @@ from quackosm._constants import (
 )
 from quackosm._exceptions import (
     EmptyResultWarning,
+    InconsistentCheckpointError,
     InvalidGeometryFilter,
     MultiprocessingRuntimeError,
 )
 from quackosm._geoparquet_metadata import get_geoparquet_metadata
-from quackosm._intersection import intersect_nodes_with_geometry
+from quackosm._intersection import (
+    GEOMETRY_FILTER_GRID_SIZE,
+    GRID_CELL_BOUNDARY,
+    GRID_CELL_INSIDE,
+    INTERSECTION_ENGINE,
+    classify_ways_bboxes_with_geometry,
+    clip_polygon_set,
+    intersect_lines_with_geometry,
+    intersect_nodes_with_geometry,
+    is_polygon_set,
+)
+from quackosm._nodes_locations_index import NodesLocationsIndex
+from quackosm._osm_changes import (
+    OsmChanges,
+    get_decoded_pbf_state,
+    read_osm_changes,
+    replace_features_in_parquet_file,
+)
 from quackosm._osm_tags_filters import (
     GroupedOsmTagsFilter,
     OsmTagsFilter,
@@ -69,6 +91,23 @@ from quackosm._osm_tags_filters import (
     merge_osm_tags_filter,
 )
 from quackosm._osm_way_polygon_features import OsmWayPolygonConfig, parse_dict_to_config_object
+from quackosm._parquet_multiprocessing import ParquetWorkerPool, read_arrow_dataset
+from quackosm._pbf_blobs import (
+    PBF_DATA_BLOB_TYPE,
+    PBF_SORTED_FEATURE,
+    PbfBlob,
+    get_pbf_file_fingerprint,
+    read_pbf_blobs,
+    read_pbf_header_optional_features,
+    split_pbf_blobs_into_chunks,
+    write_pbf_chunk,
+)
+from quackosm._pbf_index import (
+    PBF_INDEX_CHUNK_SIZE_BYTES,
+    load_pbf_index,
+    save_pbf_index,
+    select_chunks_intersecting_geometry,
+)
 from quackosm._rich_progress import (
     FORCE_TERMINAL,
     VERBOSITY_MODE,
@@ -76,7 +115,19 @@ from quackosm._rich_progress import (
     TaskProgressTracker,
     log_message,
 )
+from quackosm._rows_per_group import (
+    count_parquet_rows,
+    estimate_group_memory,
+    estimate_number_of_workers,
+    estimate_rows_per_group,
+    get_memory_budget,
+)
 from quackosm._typing import is_expected_type
+from quackosm._ways_assembly import (
+    WAY_ASSEMBLY_ENGINE,
+    assemble_ways_linestrings,
+    build_ways_geometries,
+)
 from quackosm.osm_extracts import (
     OsmExtractSource,
     download_extracts_pbf_files,
@@ -88,6 +139,17 @@ __all__ = [
 ]
 
 MEMORY_1GB = 1024**3
+# Nodes coordinates are stored as integers with 1e-7 degree precision (same as in the PBF file)
+NODES_COORDINATES_SCALE = 10_000_000
+PBF_DECODED_TAG_KEYS_STATISTICS_FILE_NAME = "tag_keys_statistics.parquet"
+# Geometry filters with more parts are covered by a single bounding box
+GEOMETRY_FILTER_MAX_COVERING_BOXES = 16
+# In the `auto` intersection engine mode, DuckDB is used for simple geometry filters
+# or when the number of nodes multiplied by the number of vertices is small enough
+INTERSECTION_ENGINE_AUTO_MAX_DUCKDB_VERTICES = 1_000
+INTERSECTION_ENGINE_AUTO_MAX_DUCKDB_COST = 1_000_000_000
+# Lower bound of the DuckDB memory limit of a worker constructing ways groups linestrings
+LINESTRINGS_WORKER_MIN_MEMORY = MEMORY_1GB // 4
 
 GEOMETRY_TYPES_MAPPING = {
     "POINT": "Point",
@@ -133,6 +195,13 @@ class PbfFileReader:
         relations_with_unnested_node_refs: "duckdb.DuckDBPyRelation"
         relations_node_only_filtered_ids: "duckdb.DuckDBPyRelation"
 
+    class DecodedOSMParquetFiles(NamedTuple):
+        """List of parquet files with elements decoded from the `*.osm.pbf` file, split by kind."""
+
+        nodes: "duckdb.DuckDBPyRelation"
+        ways: "duckdb.DuckDBPyRelation"
+        relations: "duckdb.DuckDBPyRelation"
+
     if DUCKDB_ABOVE_130:
         ROWS_PER_GROUP_MEMORY_CONFIG = {
             0: 10_000,
@@ -177,6 +246,14 @@ class PbfFileReader:
         ignore_metadata_tags: bool = True,
         include_non_closed_relations: bool = False,
         include_node_only_relations: bool = False,
+        cache_decoded_pbf: bool = False,
+        parallel_pbf_decoding: bool = False,
+        pbf_spatial_index: bool = False,
+        nodes_locations_index: bool = False,
+        intersection_engine: INTERSECTION_ENGINE = "auto",
+        cache_geometry_intersection: bool = False,
+        way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+        checkpoint_stages: bool = False,
         debug_memory: bool = False,
         debug_times: bool = False,
         cpu_limit: Optional[int] = None,
@@ -196,7 +273,9 @@ class PbfFileReader:
                 would return parks, all amenity types, bakeries and bicycle shops.
                 If `None`, handler will allow all of the tags to be parsed. Defaults to `None`.
             geometry_filter (BaseGeometry, optional): Region which can be used to filter only
-                intersecting OSM objects. Defaults to `None`.
+                intersecting OSM objects. A `GeometryCollection` of polygons is treated as
+                a polygon set: parts are kept separate (can overlap) and are tested with
+                an STRtree instead of being dissolved into a single union. Defaults to `None`.
             custom_sql_filter (str, optional): Allows users to pass custom SQL conditions used
                 to filter OSM features. It will be embedded into predefined queries and requires
                 DuckDB syntax to operate on tags map object. Defaults to `None`.
@@ -271,6 +350,46 @@ class PbfFileReader:
                 When False (default), node-only relations are excluded from the output.
 
                 Defaults to `False` (maintains backward compatibility).
+            cache_decoded_pbf (bool, optional): If True, will keep decoded PBF file elements
+                and intermediate files that don't depend on the tags, geometry or custom SQL
+                filters in the `working_directory`, keyed by the PBF file content fingerprint.
+                Next runs on the same file will skip decoding and start from the filtering
+                stage. Defaults to `False`.
+            parallel_pbf_decoding (bool, optional): If True, will split the PBF file into chunks
+                based on the blobs offsets and decode them in a pool of processes. Can speed up
+                decoding of big files on machines with many cores. Defaults to `False`.
+            pbf_spatial_index (bool, optional): If True, will save a sidecar index file next to
+                the PBF file, with blobs offsets, element types, ids ranges and nodes bounding
+                boxes. Next runs with a geometry filter will skip decoding nodes blobs that are
+                disjoint with the filter and aren't required to construct intersecting ways and
+                relations. Index isn't used together with `cache_decoded_pbf`, since the cache
+                requires the whole file to be decoded. Defaults to `False`.
+            nodes_locations_index (bool, optional): If True, will save nodes coordinates in a
+                memory-mapped index (dense, indexed by the node id, or sparse with sorted ids)
+                and resolve ways nodes references with vectorised lookups in batches instead
+                of joining ways with nodes in DuckDB. Lowers memory usage of ways grouping
+                for big files. Defaults to `False`.
+            intersection_engine (INTERSECTION_ENGINE, optional): Engine used to intersect nodes
+                with the geometry filter. `python` uses a pool of processes with prepared
+                geometry, `duckdb` uses `ST_Intersects` inside of the DuckDB query and `auto`
+                selects one of them based on the number of the geometry filter vertices and
+                the number of nodes to intersect. Polygon sets are always intersected with
+                the `python` engine. Defaults to `auto`.
+            cache_geometry_intersection (bool, optional): If True, will keep ids of nodes, ways
+                and relations intersecting the geometry filter in the `working_directory`, keyed
+                by the PBF file content fingerprint and the geometry filter hash. Next runs with
+                the same file and geometry filter will skip the intersection and start from
+                the tags filtering. Defaults to `False`.
+            way_assembly_engine (WAY_ASSEMBLY_ENGINE, optional): Engine used to assemble ways
+                geometries. `duckdb` aggregates ways points and builds geometries with DuckDB
+                spatial functions, `numpy` sorts points arrays, removes repeated points and
+                detects closed ways on coordinates arrays and builds WKB geometries directly.
+                Defaults to `duckdb`.
+            checkpoint_stages (bool, optional): If True, will keep intermediate files in
+                a persistent run directory in the `working_directory` together with a list
+                of completed stages. Rerunning an interrupted conversion with the same file
+                and parameters will resume from the last completed stage. Run directory is
+                removed after a successful conversion. Defaults to `False`.
             debug_memory (bool, optional): If turned on, will keep all temporary files after
                 operation for debugging. Defaults to `False`.
             debug_times (bool, optional): If turned on, will report timestamps at which second each
@@ -292,6 +411,7 @@ class PbfFileReader:
         )
         self.expanded_tags_filter: Optional[Union[GroupedOsmTagsFilter, OsmTagsFilter]] = None
         self.merged_tags_filter: Optional[Union[GroupedOsmTagsFilter, OsmTagsFilter]] = None
+        self.tag_keys_statistics: Optional[dict[str, dict[str, int]]] = None
 
         self.custom_sql_filter = custom_sql_filter
 
@@ -300,6 +420,21 @@ class PbfFileReader:
         self.ignore_metadata_tags = ignore_metadata_tags
         self.include_non_closed_relations = include_non_closed_relations
         self.include_node_only_relations = include_node_only_relations
+        self.cache_decoded_pbf = cache_decoded_pbf
+        self.decoded_pbf_cache_path: Optional[Path] = None
+        self._decoded_pbf_state_key: Optional[str] = None
+        self.parallel_pbf_decoding = parallel_pbf_decoding
+        self.pbf_spatial_index = pbf_spatial_index
+        self.nodes_locations_index = nodes_locations_index
+        self.intersection_engine = intersection_engine
+        self.cache_geometry_intersection = cache_geometry_intersection
+        self.way_assembly_engine = way_assembly_engine
+        self.checkpoint_stages = checkpoint_stages
+        self._run_checkpoint: Optional[RunCheckpoint] = None
+        self.geometry_intersection_cache_path: Optional[Path] = None
+        self.is_pbf_file_sorted = False
+        self._nodes_locations_index: Optional[NodesLocationsIndex] = None
+        self._worker_pool: Optional[ParquetWorkerPool] = None
         self.osm_extract_source = osm_extract_source
         self.working_directory = Path(working_directory)
         self.working_directory.mkdir(parents=True, exist_ok=True)
@@ -316,6 +451,7 @@ class PbfFileReader:
         self.parquet_version = parquet_version
 
         self.internal_rows_per_group: int = 0
+        self._decoded_ways_count: Optional[int] = None
         self.internal_parquet_compression = "zstd"
 
         self.cpu_limit = (
@@ -364,6 +500,24 @@ class PbfFileReader:
             msg="Use `convert_geometry_to_geodataframe` instead. Deprecated since 0.8.1 version.",
         )
 
+    def __enter__(self) -> "PbfFileReader":
+        """Use the reader as a context manager closing its worker processes on exit."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the reader."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop worker processes reused between conversions.
+
+        Reader can still be used after closing, workers are started again on the next use.
+        """
+        if self._worker_pool is not None:
+            self._worker_pool.close()
+            self._worker_pool = None
+
     @property
     def task_progress_tracker(self) -> TaskProgressTracker:
         """Get task progress tracker."""
@@ -613,18 +767,21 @@ class PbfFileReader:
 
             try:
                 self.encountered_query_exception = False
-                self.connection = _set_up_duckdb_connection(
-                    tmp_dir_path=self.tmp_dir_path, threads_limit=self.cpu_limit
-                )
-
                 original_geometry_filter = self.geometry_filter
 
-                if pbf_extract_geometry is not None:
+                if pbf_extract_geometry is not None and is_polygon_set(
+                    cast("BaseGeometry", self.geometry_filter)
+                ):
+                    self.geometry_filter = clip_polygon_set(
+                        cast("BaseGeometry", self.geometry_filter),
+                        cast("BaseGeometry", pbf_extract_geometry),
+                    )
+                elif pbf_extract_geometry is not None:
                     self.geometry_filter = cast("BaseGeometry", self.geometry_filter).intersection(
                         cast("BaseGeometry", pbf_extract_geometry)
                     )
 
-                result_file_path = result_file_path or self._generate_result_file_path(
+                default_result_file_path = self._generate_result_file_path(
                     pbf_path,
                     filter_osm_ids=filter_osm_ids,
                     keep_all_tags=keep_all_tags,
@@ -632,6 +789,17 @@ class PbfFileReader:
                     save_as_wkt=save_as_wkt,
                     sort_result=sort_result,
                 )
+                result_file_path = result_file_path or default_result_file_path
+                if self.checkpoint_stages:
+                    # Default result file name identifies the file and all conversion parameters
+                    self.tmp_dir_path = (
+                        Path(self.working_directory) / "runs" / default_result_file_path.stem
+                    )
+                    self.tmp_dir_path.mkdir(parents=True, exist_ok=True)
+
+                self.connection = _set_up_duckdb_connection(
+                    tmp_dir_path=self.tmp_dir_path, threads_limit=self.cpu_limit
+                )
                 parsed_geoparquet_file = self._parse_pbf_file(
                     pbf_path=pbf_path,
                     result_file_path=Path(result_file_path),
@@ -644,13 +812,245 @@ class PbfFileReader:
                 )
 
                 self.geometry_filter = original_geometry_filter
-
-                return parsed_geoparquet_file
             finally:
+                self._run_checkpoint = None
                 if self.connection is not None:
                     self.connection.close()
                     self.connection = None
 
+            if self.checkpoint_stages:
+                self._delete_directories(self.tmp_dir_path)
+
+            return parsed_geoparquet_file
+
+    def apply_changes(
+        self,
+        pbf_path: Union[str, Path],
+        osc_path: Union[str, Path],
+        result_file_path: Union[str, Path],
+        keep_all_tags: bool = False,
+        explode_tags: Optional[bool] = None,
+        save_as_wkt: bool = False,
+    ) -> Path:
+        """
+        Update existing GeoParquet file with changes from the osmChange file.
+
+        Changes are applied to the decoded PBF file elements kept in the cache. Only features
+        created, modified or deleted in the osmChange file and features depending on them
+        (ways with changed nodes and relations with changed members) are rebuilt and replaced
+        in the result file. Result file has to be generated by a reader with the same
+        configuration and with the same `keep_all_tags`, `explode_tags` and `save_as_wkt`
+        parameters. Replaced features are appended at the end of the file, so the result
+        won't be sorted by geometry anymore.
+
+        Multiple osmChange files can be applied one after another, the state of decoded
+        elements is tracked in the result file metadata.
+
+        Args:
+            pbf_path (Union[str, Path]): Path of the `*.osm.pbf` file used to generate
+                the result file.
+            osc_path (Union[str, Path]): Path of the `*.osc` or `*.osc.gz` file with changes.
+            result_file_path (Union[str, Path]): Path of the GeoParquet file to update.
+            keep_all_tags (bool, optional): Works only with the `tags_filter` parameter.
+                Whether to keep all tags related to the element, or return only those defined
+                in the `tags_filter`. Defaults to `False`.
+            explode_tags (bool, optional): Whether to split tags into columns based on OSM tag keys.
+                If `None`, will be set based on `tags_filter` and `keep_all_tags` parameters.
+                Defaults to `None`.
+            save_as_wkt (bool): Whether the result file is saved with geometry in the WKT form.
+                Defaults to `False`.
+
+        Returns:
+            Path: Path to the updated GeoParquet file.
+        """
+        result_file_path = Path(result_file_path)
+        if not result_file_path.exists():
+            raise FileNotFoundError(f"Result file {result_file_path} doesn't exist.")
+
+        if explode_tags is None:
+            explode_tags = (
+                self.tags_filter is not None and self.is_tags_filter_positive and not keep_all_tags
+            )
+
+        pbf_file_fingerprint = get_pbf_file_fingerprint(pbf_path)
+        current_state_key = get_decoded_pbf_state(result_file_path) or pbf_file_fingerprint
+        h = hashlib.new("sha256")
+        h.update(current_state_key.encode())
+        with open(osc_path, "rb") as osc_file:
+            h.update(osc_file.read())
+        new_state_key = h.hexdigest()[:16]
+
+        original_cache_decoded_pbf = self.cache_decoded_pbf
+        self.cache_decoded_pbf = True
+        self._task_progress_tracker = TaskProgressTracker(
+            verbosity_mode=self.verbosity_mode, total_file_steps=1, debug=self.debug_times
+        )
+        try:
+            affected_feature_ids = self._apply_changes_to_decoded_pbf(
+                pbf_path=pbf_path,
+                osm_changes=read_osm_changes(osc_path),
+                current_state_key=current_state_key,
+                new_state_key=new_state_key,
+                is_base_state=current_state_key == pbf_file_fingerprint,
+            )
+
+            with tempfile.TemporaryDirectory(dir=self.working_directory.resolve()) as tmp_dir_name:
+                changed_features_path = None
+                # Empty list of OSM ids means no filtering
+                if affected_feature_ids:
+                    self._decoded_pbf_state_key = new_state_key
+                    changed_features_path = self._convert_single_pbf_to_parquet(
+                        pbf_path,
+                        result_file_path=Path(tmp_dir_name) / "changed_features.parquet",
+                        keep_all_tags=keep_all_tags,
+                        explode_tags=explode_tags,
+                        sort_result=False,
+                        ignore_cache=True,
+                        filter_osm_ids=sorted(affected_feature_ids),
+                        save_as_wkt=save_as_wkt,
+                    )
+
+                with self.task_progress_tracker.get_basic_spinner("Replacing changed features"):
+                    replace_features_in_parquet_file(
+                        result_file_path=result_file_path,
+                        changed_features_path=changed_features_path,
+                        affected_feature_ids=affected_feature_ids,
+                        decoded_pbf_state=new_state_key,
+                    )
+        finally:
+            self.cache_decoded_pbf = original_cache_decoded_pbf
+            self._decoded_pbf_state_key = None
+            self.decoded_pbf_cache_path = None
+            self.task_progress_tracker.stop()
+
+        return result_file_path
+
+    def _apply_changes_to_decoded_pbf(
+        self,
+        pbf_path: Union[str, Path],
+        osm_changes: OsmChanges,
+        current_state_key: str,
+        new_state_key: str,
+        is_base_state: bool,
+    ) -> set[str]:
+        """Save new state of decoded elements and return ids of features affected by changes."""
+        with tempfile.TemporaryDirectory(dir=self.working_directory.resolve()) as self.tmp_dir_name:
+            self.tmp_dir_path = Path(self.tmp_dir_name)
+            self.connection = _set_up_duckdb_connection(
+                tmp_dir_path=self.tmp_dir_path, threads_limit=self.cpu_limit
+            )
+            try:
+                self._decoded_pbf_state_key = current_state_key
+                self.decoded_pbf_cache_path = self._generate_decoded_pbf_cache_path(pbf_path)
+                decoded_cache_path = cast(
+                    "Path", self._get_decoded_pbf_cache_dataset_path("pbf_decoded")
+                )
+                if not decoded_cache_path.exists() and not is_base_state:
+                    raise ValueError(
+                        f"Decoded PBF file state {current_state_key} required to apply changes"
+                        f" doesn't exist in the cache ({decoded_cache_path})."
+                    )
+                self.internal_rows_per_group = PbfFileReader.ROWS_PER_GROUP_MEMORY_CONFIG[0]
+                decoded_osm_parquet_files = self._decode_pbf_file(pbf_path)
+
+                self._decoded_pbf_state_key = new_state_key
+                self.decoded_pbf_cache_path = self._generate_decoded_pbf_cache_path(pbf_path)
+                new_decoded_cache_path = cast(
+                    "Path", self._get_decoded_pbf_cache_dataset_path("pbf_decoded")
+                )
+
+                with self.task_progress_tracker.get_basic_spinner("Applying OSM changes"):
+                    new_decoded_path = self.tmp_dir_path / "pbf_decoded_changed"
+                    decoded_relations = {
+                        "node": decoded_osm_parquet_files.nodes,
+                        "way": decoded_osm_parquet_files.ways,
+                        "relation": decoded_osm_parquet_files.relations,
+                    }
+                    for kind, decoded_relation in decoded_relations.items():
+                        self.connection.register(
+                            f"changed_{kind}_elements", osm_changes.changed_elements[kind]
+                        )
+                        self.connection.register(
+                            f"changed_{kind}_ids",
+                            pa.table(
+                                {"id": pa.array(osm_changes.changed_ids[kind], type=pa.int64())}
+                            ),
+                        )
+                        kind_path = new_decoded_path / f"kind={kind}"
+                        kind_path.mkdir(parents=True)
+                        self.connection.sql(
+                            f"""
+                            COPY (
+                                SELECT
+                                    d.id, d.tags,
+                                    {"d.refs" if kind != "node" else "NULL::BIGINT[]"} AS refs,
+                                    {"d.ref_roles" if kind == "relation" else "NULL::VARCHAR[]"}
+                                        AS ref_roles,
+                                    {"d.ref_types" if kind == "relation" else "NULL::VARCHAR[]"}
+                                        AS ref_types,
+                                    {"d.lon" if kind == "node" else "NULL::DOUBLE"} AS lon,
+                                    {"d.lat" if kind == "node" else "NULL::DOUBLE"} AS lat
+                                FROM ({decoded_relation.sql_query()}) d
+                                ANTI JOIN changed_{kind}_ids c ON d.id = c.id
+                                UNION ALL
+                                SELECT id, tags, refs, ref_roles, ref_types, lon, lat
+                                FROM changed_{kind}_elements
+                            ) TO '{kind_path / "data.parquet"}' (
+                                FORMAT 'parquet',
+                                {PbfFileReader.parquet_version_query}
+                                ROW_GROUP_SIZE_BYTES '16MB',
+                                COMPRESSION '{self.internal_parquet_compression}'
+                            )
+                            """
+                        )
+                    _copy_parquet_dataset(new_decoded_path, new_decoded_cache_path)
+
+                    affected_ways_ids = self.connection.sql(
+                        f"""
+                        SELECT id FROM changed_way_ids
+                        UNION
+                        SELECT w.id
+                        FROM (
+                            SELECT id, UNNEST(refs) AS ref
+                            FROM read_parquet('{new_decoded_path / "kind=way"}/*.parquet')
+                        ) w
+                        SEMI JOIN changed_node_ids n ON w.ref = n.id
+                        """
+                    ).arrow()
+                    self.connection.register("affected_way_ids", affected_ways_ids)
+                    affected_relations_ids = self.connection.sql(
+                        f"""
+                        SELECT id FROM changed_relation_ids
+                        UNION
+                        SELECT r.id
+                        FROM (
+                            SELECT
+                                id,
+                                UNNEST(refs) AS ref,
+                                UNNEST(ref_types) AS ref_type
+                            FROM read_parquet('{new_decoded_path / "kind=relation"}/*.parquet')
+                        ) r
+                        WHERE (r.ref_type = 'node' AND r.ref IN (SELECT id FROM changed_node_ids))
+                        OR (r.ref_type = 'way' AND r.ref IN (SELECT id FROM affected_way_ids))
+                        OR (
+                            r.ref_type = 'relation'
+                            AND r.ref IN (SELECT id FROM changed_relation_ids)
+                        )
+                        """
+                    ).arrow()
+            finally:
+                self.connection.close()
+                self.connection = None
+
+        return {
+            *(f"node/{node_id}" for node_id in osm_changes.changed_ids["node"]),
+            *(f"way/{way_id}" for way_id in affected_ways_ids["id"].to_pylist()),
+            *(
+                f"relation/{relation_id}"
+                for relation_id in affected_relations_ids["id"].to_pylist()
+            ),
+        }
+
     def convert_geometry_to_parquet(
         self,
         result_file_path: Optional[Union[str, Path]] = None,
@@ -1173,19 +1573,46 @@ class PbfFileReader:
             else:
                 break
 
-        elements = self.connection.sql(f"SELECT * FROM ST_READOSM('{Path(pbf_path)}');")
+        self._nodes_locations_index = None
+        self.decoded_pbf_cache_path = (
+            self._generate_decoded_pbf_cache_path(pbf_path) if self.cache_decoded_pbf else None
+        )
+        self.geometry_intersection_cache_path = (
+            self._generate_geometry_intersection_cache_path(pbf_path)
+            if self.cache_geometry_intersection and self.geometry_filter is not None
+            else None
+        )
+        self._run_checkpoint = (
+            self._open_run_checkpoint(pbf_path) if self.checkpoint_stages else None
+        )
 
-        if self.tags_filter is None:
-            self.expanded_tags_filter = None
-            self.merged_tags_filter = None
+        prefiltered_elements_outputs = self._get_completed_stage_outputs("prefiltered_elements")
+        if prefiltered_elements_outputs is None:
+            converted_osm_parquet_files = self._decode_and_prefilter_elements_ids(
+                pbf_path, filter_osm_ids
+            )
+            self._complete_stage(
+                "prefiltered_elements",
+                {
+                    "osm_parquet_files": {
+                        name: relation.sql_query()
+                        for name, relation in converted_osm_parquet_files._asdict().items()
+                    },
+                    "is_pbf_file_sorted": self.is_pbf_file_sorted,
+                    "expanded_tags_filter": self.expanded_tags_filter,
+                    "merged_tags_filter": self.merged_tags_filter,
+                    "tag_keys_statistics": self.tag_keys_statistics,
+                    "decoded_ways_count": self._decoded_ways_count,
+                },
+            )
         else:
-            self.expanded_tags_filter = self._expand_osm_tags_filter(elements)
-            self.merged_tags_filter = merge_osm_tags_filter(self.expanded_tags_filter)
-
-        converted_osm_parquet_files = self._prefilter_elements_ids(elements, filter_osm_ids)
+            converted_osm_parquet_files = self._restore_prefiltered_elements_ids(
+                prefiltered_elements_outputs
+            )
 
         self._delete_directories(
             [
+                "pbf_decoded",
                 "nodes_filtered_non_distinct_ids",
                 "nodes_prepared_ids",
                 "ways_valid_ids",
@@ -1195,64 +1622,92 @@ class PbfFileReader:
             ],
         )
 
-        filtered_nodes_with_geometry_path = self._get_filtered_nodes_with_geometry(
-            converted_osm_parquet_files
+        filtered_nodes_with_geometry_path = self._run_stage_saving_path(
+            "filtered_nodes_with_geometry",
+            partial(self._get_filtered_nodes_with_geometry, converted_osm_parquet_files),
         )
         self._delete_directories("nodes_filtered_ids")
 
-        filtered_ways_with_linestrings = self._get_filtered_ways_with_linestrings(
-            osm_parquet_files=converted_osm_parquet_files
-        )
-        required_ways_with_linestrings = self._get_required_ways_with_linestrings(
-            osm_parquet_files=converted_osm_parquet_files
-        )
+        ways_with_linestrings_outputs = self._get_completed_stage_outputs("ways_with_linestrings")
+        if ways_with_linestrings_outputs is None:
+            filtered_ways_with_linestrings, required_ways_with_linestrings = (
+                self._get_filtered_and_required_ways_with_linestrings(
+                    osm_parquet_files=converted_osm_parquet_files
+                )
+            )
+            self._complete_stage(
+                "ways_with_linestrings",
+                {
+                    "filtered_ways": filtered_ways_with_linestrings.sql_query(),
+                    "required_ways": required_ways_with_linestrings.sql_query(),
+                },
+            )
+        else:
+            filtered_ways_with_linestrings, required_ways_with_linestrings = (
+                self._restore_relation(ways_with_linestrings_outputs["filtered_ways"]),
+                self._restore_relation(ways_with_linestrings_outputs["required_ways"]),
+            )
         # Note: nodes_valid_with_tags is needed for node-only relations, so don't delete yet
+        self._nodes_locations_index = None
         self._delete_directories(
             [
+                "nodes_locations_index",
                 "ways_required_grouped",
                 "ways_required_ids",
                 "ways_with_unnested_nodes_refs",
-                "required_ways_ids_grouped",
-                "required_ways_grouped",
-                "required_ways_tmp",
-                "filtered_ways_ids_grouped",
-                "filtered_ways_grouped",
-                "filtered_ways_tmp",
+                "ways_grouped",
+                "ways_grouped_tmp",
             ],
         )
 
-        filtered_ways_with_proper_geometry_path = self._get_filtered_ways_with_proper_geometry(
-            converted_osm_parquet_files, filtered_ways_with_linestrings
+        filtered_ways_with_proper_geometry_path = self._run_stage_saving_path(
+            "filtered_ways_with_geometry",
+            partial(
+                self._get_filtered_ways_with_proper_geometry,
+                converted_osm_parquet_files,
+                filtered_ways_with_linestrings,
+            ),
         )
         self._delete_directories(
             [
                 "ways_prepared_ids",
                 "ways_filtered_ids",
                 "ways_all_with_tags",
-                "filtered_ways_with_linestrings",
+                "filtered_ways_with_wkb_geometry",
             ],
         )
 
-        filtered_relations_with_geometry_path = self._get_filtered_relations_with_geometry(
-            converted_osm_parquet_files, required_ways_with_linestrings
+        filtered_relations_with_geometry_path = self._run_stage_saving_path(
+            "filtered_relations_with_geometry",
+            partial(
+                self._get_filtered_relations_with_geometry,
+                converted_osm_parquet_files,
+                required_ways_with_linestrings,
+            ),
         )
 
         # Process node-only relations (relations with only nodes) if enabled
         if self.include_node_only_relations:
-            filtered_node_only_relations_with_geometry_path = (
-                self._get_filtered_node_only_relations_with_geometry(converted_osm_parquet_files)
+            filtered_node_only_relations_with_geometry_path = self._run_stage_saving_path(
+                "filtered_node_only_relations_with_geometry",
+                partial(
+                    self._get_filtered_node_only_relations_with_geometry,
+                    converted_osm_parquet_files,
+                ),
             )
 
         # Now we can delete nodes_valid_with_tags after node-only relations are processed
         self._delete_directories(
             [
                 "nodes_valid_with_tags",
+                "nodes_locations",
                 "relations_all_with_tags",
                 "relations_with_unnested_way_refs",
                 "relations_with_unnested_node_refs",
                 "relations_filtered_ids",
                 "relations_node_only_filtered_ids",
-                "required_ways_with_linestrings",
+                "ways_ids_with_membership",
+                "ways_with_linestrings",
                 "valid_relation_parts",
                 "valid_relations_tmp",
                 "relation_inner_parts",
@@ -1293,6 +1748,99 @@ class PbfFileReader:
 
         return result_file_path
 
+    def _open_run_checkpoint(self, pbf_path: Union[str, Path]) -> RunCheckpoint:
+        run_checkpoint = RunCheckpoint(self.tmp_dir_path)
+        self._delete_directories(
+            run_checkpoint.get_stale_paths(fingerprint=get_pbf_file_fingerprint(pbf_path)),
+            override_debug=True,
+        )
+        if run_checkpoint.last_completed_stage and not self.verbosity_mode == "silent":
+            log_message(
+                "Resuming conversion after the last completed stage"
+                f" ({run_checkpoint.last_completed_stage})."
+            )
+        return run_checkpoint
+
+    def _get_completed_stage_outputs(self, stage: str) -> Optional[dict[str, Any]]:
+        if self._run_checkpoint is None or not self._run_checkpoint.is_completed(stage):
+            return None
+
+        outputs = cast("dict[str, Any]", self._run_checkpoint.get_outputs(stage))
+        self.task_progress_tracker.major_step_number = outputs["major_step_number"]
+        return outputs
+
+    def _complete_stage(self, stage: str, outputs: dict[str, Any]) -> None:
+        if self._run_checkpoint is None:
+            return
+
+        self._run_checkpoint.complete(
+            stage,
+            {**outputs, "major_step_number": self.task_progress_tracker.major_step_number},
+        )
+
+    def _run_stage_saving_path(self, stage: str, function: Callable[[], Path]) -> Path:
+        outputs = self._get_completed_stage_outputs(stage)
+        if outputs is not None:
+            return Path(outputs["path"])
+
+        result_path = function()
+        self._complete_stage(stage, {"path": str(result_path)})
+        return result_path
+
+    def _restore_relation(self, sql_query: str) -> "duckdb.DuckDBPyRelation":
+        try:
+            return self.connection.sql(sql_query)
+        except duckdb.IOException as ex:
+            raise InconsistentCheckpointError(
+                f"Checkpoint in {self.tmp_dir_path} is inconsistent, files of a completed stage"
+                " are missing. Remove this directory to start the conversion from the beginning."
+            ) from ex
+
+    def _restore_optional_relation(self, sql_query: str) -> Optional["duckdb.DuckDBPyRelation"]:
+        """Restore relation of a completed stage, or None if its files were deleted on purpose."""
+        run_checkpoint = cast("RunCheckpoint", self._run_checkpoint)
+        if any(f"{path}/" in sql_query for path in run_checkpoint.get_deleted_paths()):
+            return None
+
+        return self._restore_relation(sql_query)
+
+    def _restore_prefiltered_elements_ids(
+        self, outputs: dict[str, Any]
+    ) -> ConvertedOSMParquetFiles:
+        self.is_pbf_file_sorted = outputs["is_pbf_file_sorted"]
+        self.expanded_tags_filter = outputs["expanded_tags_filter"]
+        self.merged_tags_filter = outputs["merged_tags_filter"]
+        self.tag_keys_statistics = outputs["tag_keys_statistics"]
+        self._decoded_ways_count = outputs["decoded_ways_count"]
+        # Datasets deleted after their last use in the completed stages are restored as None
+        return PbfFileReader.ConvertedOSMParquetFiles._make(
+            self._restore_optional_relation(outputs["osm_parquet_files"][name])
+            for name in PbfFileReader.ConvertedOSMParquetFiles._fields
+        )
+
+    def _decode_and_prefilter_elements_ids(
+        self, pbf_path: Union[str, Path], filter_osm_ids: list[str]
+    ) -> ConvertedOSMParquetFiles:
+        decoded_osm_parquet_files = self._decode_pbf_file(pbf_path)
+        self.is_pbf_file_sorted = PBF_SORTED_FEATURE in read_pbf_header_optional_features(pbf_path)
+
+        if self.tags_filter is None:
+            self.expanded_tags_filter = None
+            self.merged_tags_filter = None
+            self.tag_keys_statistics = None
+        else:
+            with self.task_progress_tracker.get_basic_spinner("Preparing OSM tags filter"):
+                tag_keys_statistics = self._get_decoded_tag_keys_statistics(
+                    decoded_osm_parquet_files
+                )
+                self.expanded_tags_filter = self._expand_osm_tags_filter(tag_keys_statistics)
+                self.merged_tags_filter = merge_osm_tags_filter(self.expanded_tags_filter)
+                self.tag_keys_statistics = {kind: {} for kind in ("node", "way", "relation")}
+                for kind, tag, count in tag_keys_statistics.fetchall():
+                    self.tag_keys_statistics[kind][tag] = count
+
+        return self._prefilter_elements_ids(decoded_osm_parquet_files, filter_osm_ids)
+
     def _generate_result_file_path(
         self,
         pbf_path: Union[str, Path, Iterable[Union[str, Path]]],
@@ -1388,6 +1936,61 @@ class PbfFileReader:
 
         return Path(self.working_directory) / result_file_name
 
+    def _generate_decoded_pbf_cache_path(self, pbf_path: Union[str, Path]) -> Path:
+        pbf_file_name = Path(pbf_path).name.removesuffix(".osm.pbf")
+        # Decoded PBF state after applying OSM changes is saved under its own key
+        pbf_file_fingerprint = self._decoded_pbf_state_key or get_pbf_file_fingerprint(pbf_path)
+
+        return (
+            Path(self.working_directory)
+            / "decoded_pbf_cache"
+            / f"{pbf_file_name}_{pbf_file_fingerprint}"
+        )
+
+    def _generate_geometry_intersection_cache_path(self, pbf_path: Union[str, Path]) -> Path:
+        pbf_file_name = Path(pbf_path).name.removesuffix(".osm.pbf")
+        pbf_file_fingerprint = self._decoded_pbf_state_key or get_pbf_file_fingerprint(pbf_path)
+
+        return (
+            Path(self.working_directory)
+            / "geometry_intersection_cache"
+            / f"{pbf_file_name}_{pbf_file_fingerprint}_{self._generate_geometry_hash()}"
+        )
+
+    def _get_geometry_intersection_cache_dataset_path(self, dataset_name: str) -> Optional[Path]:
+        if self.geometry_intersection_cache_path is None:
+            return None
+
+        if dataset_name.startswith("relations"):
+            # Intersecting relations depend on the relation types filter
+            non_closed_relations_part = (
+                "_nonclosedrelas" if self.include_non_closed_relations else ""
+            )
+            return (
+                self.geometry_intersection_cache_path
+                / f"relations{non_closed_relations_part}"
+                / dataset_name
+            )
+
+        return self.geometry_intersection_cache_path / dataset_name
+
+    def _get_decoded_pbf_cache_dataset_path(self, dataset_name: str) -> Optional[Path]:
+        if self.decoded_pbf_cache_path is None:
+            return None
+
+        if dataset_name == "pbf_decoded":
+            return self.decoded_pbf_cache_path / dataset_name
+
+        # Prefiltered datasets depend on the tags clause and the relation types filter
+        metadata_tags_part = "" if self.ignore_metadata_tags else "_with_metadata"
+        non_closed_relations_part = "_nonclosedrelas" if self.include_non_closed_relations else ""
+
+        return (
+            self.decoded_pbf_cache_path
+            / f"prefiltered{metadata_tags_part}{non_closed_relations_part}"
+            / dataset_name
+        )
+
     def _check_if_valid_geometry_filter(self) -> None:
         if self.geometry_filter is None:
             return
@@ -1409,6 +2012,12 @@ class PbfFileReader:
 
     def _generate_geometry_hash(self) -> str:
         clipping_geometry_hash_part = "noclip"
+        if self.geometry_filter is not None and is_polygon_set(self.geometry_filter):
+            h = hashlib.new("sha256")
+            for part_wkb in self._get_normalized_polygon_set_parts():
+                h.update(part_wkb)
+            return h.hexdigest()[:8]
+
         oriented_geometry = self._get_oriented_geometry_filter()
         if oriented_geometry is not None:
             h = hashlib.new("sha256")
@@ -1417,6 +2026,12 @@ class PbfFileReader:
 
         return clipping_geometry_hash_part
 
+    def _get_normalized_polygon_set_parts(self) -> list[bytes]:
+        # Hash of the polygon set doesn't depend on the parts order, orientation or duplicates
+        parts = shapely.get_parts(self.geometry_filter)
+        rounded_parts = shapely.transform(parts, lambda coords: np.round(coords, 7))
+        return sorted(set(shapely.to_wkb(shapely.normalize(rounded_parts)).tolist()))
+
     def _get_oriented_geometry_filter(
         self,
         geometry: Optional[BaseGeometry] = None,
@@ -1465,8 +2080,313 @@ class PbfFileReader:
 
         return geometry
 
+    def _decode_pbf_file(self, pbf_path: Union[str, Path]) -> DecodedOSMParquetFiles:
+        """Decode the PBF file in a single scan and split elements by kind."""
+        decoded_path = self.tmp_dir_path / "pbf_decoded"
+        decoded_cache_path = self._get_decoded_pbf_cache_dataset_path("pbf_decoded")
+        pbf_index = None
+        if self.pbf_spatial_index and self.geometry_filter is not None and not decoded_cache_path:
+            pbf_index = load_pbf_index(pbf_path)
+
+        if decoded_cache_path is not None and decoded_cache_path.exists():
+            with self.task_progress_tracker.get_spinner("Decoding PBF file"):
+                _copy_parquet_dataset(decoded_cache_path, decoded_path)
+        elif pbf_index is not None:
+            with self.task_progress_tracker.get_bar("Decoding PBF file") as bar:
+                self._decode_pbf_file_to_parquet_with_spatial_index(
+                    pbf_path, decoded_path, pbf_index, bar
+                )
+        elif self.parallel_pbf_decoding or self.pbf_spatial_index:
+            with self.task_progress_tracker.get_bar("Decoding PBF file") as bar:
+                self._decode_pbf_file_to_parquet_in_chunks(pbf_path, decoded_path, bar)
+        else:
+            with self.task_progress_tracker.get_spinner("Decoding PBF file"):
+                self._decode_pbf_file_to_parquet(pbf_path, decoded_path)
+
+        if decoded_cache_path is not None and not decoded_cache_path.exists():
+            _copy_parquet_dataset(decoded_path, decoded_cache_path)
+
+        self._save_empty_decoded_kinds(decoded_path)
+        self._decoded_ways_count = count_parquet_rows(
+            (decoded_path / "kind=way").glob("**/*.parquet")
+        )
+        kinds_columns = {
+            "node": "id, tags, lon, lat",
+            "way": "id, tags, refs",
+            "relation": "id, tags, refs, ref_roles, ref_types",
+        }
+        decoded_relations = {}
+        for kind, columns in kinds_columns.items():
+            kind_path = decoded_path / f"kind={kind}"
+            decoded_relations[kind] = self.connection.sql(
+                f"""
+                SELECT {columns}
+                FROM read_parquet('{kind_path}/**/*.parquet', hive_partitioning = false)
+                """
+            )
+
+        return PbfFileReader.DecodedOSMParquetFiles(
+            nodes=decoded_relations["node"],
+            ways=decoded_relations["way"],
+            relations=decoded_relations["relation"],
+        )
+
+    def _save_empty_decoded_kinds(self, decoded_path: Path) -> None:
+        for kind in ("node", "way", "relation"):
+            kind_path = decoded_path / f"kind={kind}"
+            if kind_path.exists():
+                continue
+
+            kind_path.mkdir(parents=True)
+            self.connection.sql(
+                """
+                SELECT
+                    NULL::BIGINT AS id,
+                    NULL::MAP(VARCHAR, VARCHAR) AS tags,
+                    NULL::BIGINT[] AS refs,
+                    NULL::VARCHAR[] AS ref_roles,
+                    NULL::VARCHAR[] AS ref_types,
+                    NULL::DOUBLE AS lon,
+                    NULL::DOUBLE AS lat
+                WHERE 1=0
+                """
+            ).to_parquet(str(kind_path / "empty.parquet"))
+
+    def _decode_pbf_file_to_parquet(self, pbf_path: Union[str, Path], decoded_path: Path) -> None:
+        self._run_query(
+            _generate_pbf_decoding_query(
+                pbf_path=pbf_path,
+                decoded_path=decoded_path,
+                compression=self.internal_parquet_compression,
+            )
+        )
+        if self.debug_memory:
+            log_message(f"Saved to directory: {decoded_path}")
+
+    def _decode_pbf_file_to_parquet_in_chunks(
+        self, pbf_path: Union[str, Path], decoded_path: Path, progress_bar: TaskProgressBar
+    ) -> None:
+        blobs = read_pbf_blobs(pbf_path)
+        number_of_workers = self._get_number_of_decoding_workers()
+        build_pbf_index = self.pbf_spatial_index and load_pbf_index(pbf_path) is None
+        if build_pbf_index:
+            # Index entries have to be small enough to be selective
+            data_size = sum(blob.size for blob in blobs if blob.blob_type == PBF_DATA_BLOB_TYPE)
+            number_of_chunks = ceil(data_size / PBF_INDEX_CHUNK_SIZE_BYTES)
+        else:
+            # More chunks than workers, because blobs with ways and relations are slower to decode
+            number_of_chunks = number_of_workers * 4
+
+        data_blobs_chunks = split_pbf_blobs_into_chunks(blobs, number_of_chunks=number_of_chunks)
+        self._decode_pbf_chunks_to_parquet(
+            pbf_path=pbf_path,
+            blobs=blobs,
+            data_blobs_chunks=dict(enumerate(data_blobs_chunks)),
+            decoded_path=decoded_path,
+            progress_bar=progress_bar,
+        )
+
+        if build_pbf_index:
+            chunks_statistics = self.connection.sql(
+                f"""
+                SELECT
+                    regexp_extract(filename, 'chunk_(\\d+)_', 1)::BIGINT AS chunk_index,
+                    kind,
+                    min(id) AS min_id,
+                    max(id) AS max_id,
+                    min(lon) AS min_lon,
+                    min(lat) AS min_lat,
+                    max(lon) AS max_lon,
+                    max(lat) AS max_lat
+                FROM read_parquet(
+                    '{decoded_path}/*/*.parquet', filename = true, hive_partitioning = true
+                )
+                GROUP BY 1, 2
+                ORDER BY 1, 2
+                """
+            ).fetch_arrow_table()
+            save_pbf_index(pbf_path, data_blobs_chunks, chunks_statistics)
+
+    def _decode_pbf_file_to_parquet_with_spatial_index(
+        self,
+        pbf_path: Union[str, Path],
+        decoded_path: Path,
+        pbf_index: pa.Table,
+        progress_bar: TaskProgressBar,
+    ) -> None:
+        blobs = read_pbf_blobs(pbf_path)
+        chunks_ranges = {
+            row["chunk_index"]: PbfBlob(
+                offset=row["offset"], size=row["size"], blob_type=PBF_DATA_BLOB_TYPE
+            )
+            for row in pbf_index.select(["chunk_index", "offset", "size"]).to_pylist()
+        }
+
+        # Nodes with bounding box intersecting the geometry filter and all ways and relations
+        selected_chunks = select_chunks_intersecting_geometry(
+            pbf_index, cast("BaseGeometry", self.geometry_filter)
+        )
+        self._decode_pbf_chunks_to_parquet(
+            pbf_path=pbf_path,
+            blobs=blobs,
+            data_blobs_chunks={idx: [chunks_ranges[idx]] for idx in sorted(selected_chunks)},
+            decoded_path=decoded_path,
+            progress_bar=progress_bar,
+        )
+
+        # Nodes outside of the geometry filter required to construct geometries
+        # of intersecting ways and relations
+        required_chunks = self._find_pbf_chunks_with_required_nodes(
+            decoded_path, pbf_index, selected_chunks
+        )
+        if required_chunks:
+            self._decode_pbf_chunks_to_parquet(
+                pbf_path=pbf_path,
+                blobs=blobs,
+                data_blobs_chunks={idx: [chunks_ranges[idx]] for idx in sorted(required_chunks)},
+                decoded_path=decoded_path,
+            )
+
+    def _find_pbf_chunks_with_required_nodes(
+        self, decoded_path: Path, pbf_index: pa.Table, decoded_chunks: set[int]
+    ) -> set[int]:
+        min_lon, min_lat, max_lon, max_lat = cast("BaseGeometry", self.geometry_filter).bounds
+        self._save_empty_decoded_kinds(decoded_path)
+        decoded_chunks_filter = ", ".join(str(idx) for idx in decoded_chunks) or "NULL"
+        self.connection.register("pbf_index", pbf_index)
+        try:
+            required_chunks = self.connection.sql(
+                f"""
+                WITH bbox_nodes AS (
+                    SELECT id
+                    FROM read_parquet('{decoded_path}/kind=node/*.parquet')
+                    WHERE lon BETWEEN {min_lon} AND {max_lon}
+                    AND lat BETWEEN {min_lat} AND {max_lat}
+                ),
+                ways_refs AS (
+                    SELECT id, UNNEST(refs) AS ref
+                    FROM read_parquet('{decoded_path}/kind=way/*.parquet')
+                ),
+                relations_refs AS (
+                    SELECT id, UNNEST(refs) AS ref, UNNEST(ref_types) AS ref_type
+                    FROM read_parquet('{decoded_path}/kind=relation/*.parquet')
+                ),
+                missing_nodes_chunks AS (
+                    SELECT chunk_index, min_id, max_id, min_lon, min_lat, max_lon, max_lat
+                    FROM pbf_index
+                    WHERE kind = 'node'
+                    AND chunk_index NOT IN ({decoded_chunks_filter})
+                ),
+                ways_refs_bounds AS (
+                    SELECT
+                        wr.id,
+                        n.lon AS min_lon,
+                        n.lat AS min_lat,
+                        n.lon AS max_lon,
+                        n.lat AS max_lat
+                    FROM ways_refs wr
+                    JOIN read_parquet('{decoded_path}/kind=node/*.parquet') n ON wr.ref = n.id
+                    UNION ALL
+                    SELECT wr.id, c.min_lon, c.min_lat, c.max_lon, c.max_lat
+                    FROM ways_refs wr
+                    JOIN missing_nodes_chunks c ON wr.ref BETWEEN c.min_id AND c.max_id
+                ),
+                -- Ways can cross the geometry filter without any vertex inside of it,
+                -- so locations of not decoded nodes are bounded by their chunks boxes
+                touching_ways AS (
+                    SELECT id
+                    FROM ways_refs_bounds
+                    GROUP BY id
+                    HAVING min(min_lon) <= {max_lon} AND max(max_lon) >= {min_lon}
+                    AND min(min_lat) <= {max_lat} AND max(max_lat) >= {min_lat}
+                ),
+                touching_relations AS (
+                    SELECT rr.id
+                    FROM relations_refs rr
+                    SEMI JOIN touching_ways w ON rr.ref = w.id
+                    WHERE rr.ref_type = 'way'
+                    UNION
+                    SELECT rr.id
+                    FROM relations_refs rr
+                    SEMI JOIN bbox_nodes n ON rr.ref = n.id
+                    WHERE rr.ref_type = 'node'
+                ),
+                required_ways AS (
+                    SELECT id FROM touching_ways
+                    UNION
+                    SELECT rr.ref AS id
+                    FROM relations_refs rr
+                    SEMI JOIN touching_relations r ON rr.id = r.id
+                    WHERE rr.ref_type = 'way'
+                ),
+                required_nodes AS (
+                    SELECT wr.ref AS id
+                    FROM ways_refs wr
+                    SEMI JOIN required_ways w ON wr.id = w.id
+                    UNION
+                    SELECT rr.ref AS id
+                    FROM relations_refs rr
+                    SEMI JOIN touching_relations r ON rr.id = r.id
+                    WHERE rr.ref_type = 'node'
+                )
+                SELECT DISTINCT c.chunk_index
+                FROM required_nodes n
+                JOIN missing_nodes_chunks c ON n.id BETWEEN c.min_id AND c.max_id
+                """
+            ).fetchnumpy()["chunk_index"]
+        finally:
+            self.connection.unregister("pbf_index")
+
+        return {int(chunk_index) for chunk_index in required_chunks}
+
+    def _get_number_of_decoding_workers(self) -> int:
+        if not self.parallel_pbf_decoding:
+            return 1
+
+        return max(1, min(self.cpu_limit, multiprocessing.cpu_count()))
+
+    def _decode_pbf_chunks_to_parquet(
+        self,
+        pbf_path: Union[str, Path],
+        blobs: list[PbfBlob],
+        data_blobs_chunks: dict[int, list[PbfBlob]],
+        decoded_path: Path,
+        progress_bar: Optional[TaskProgressBar] = None,
+    ) -> None:
+        number_of_workers = max(
+            1, min(self._get_number_of_decoding_workers(), len(data_blobs_chunks))
+        )
+        decoded_path.mkdir(parents=True, exist_ok=True)
+
+        if progress_bar is not None:
+            progress_bar.create_manual_bar(total=len(data_blobs_chunks))
+        try:
+            with multiprocessing.get_context("spawn").Pool(processes=number_of_workers) as pool:
+                decoded_chunks = pool.imap_unordered(
+                    partial(
+                        _decode_pbf_chunk,
+                        pbf_path=pbf_path,
+                        blobs=blobs,
+                        tmp_dir_path=self.tmp_dir_path,
+                        decoded_path=decoded_path,
+                        compression=self.internal_parquet_compression,
+                        threads_limit=max(1, self.cpu_limit // number_of_workers),
+                    ),
+                    data_blobs_chunks.items(),
+                )
+                for finished_chunks, _ in enumerate(decoded_chunks, start=1):
+                    if progress_bar is not None:
+                        progress_bar.update_manual_bar(finished_chunks)
+        except Exception as ex:
+            raise MultiprocessingRuntimeError() from ex
+        finally:
+            self._delete_directories("pbf_chunks", override_debug=True)
+
+        if self.debug_memory:
+            log_message(f"Saved to directory: {decoded_path}")
+
     def _expand_osm_tags_filter(
-        self, elements: "duckdb.DuckDBPyRelation"
+        self, tag_keys_statistics: "duckdb.DuckDBPyRelation"
     ) -> Union[GroupedOsmTagsFilter, OsmTagsFilter]:
         is_any_key_expandable = False
         if is_expected_type(self.tags_filter, GroupedOsmTagsFilter):
@@ -1482,20 +2402,61 @@ class PbfFileReader:
         if not is_any_key_expandable:
             return cast("Union[GroupedOsmTagsFilter, OsmTagsFilter]", self.tags_filter)
 
-        self.task_progress_tracker.major_step_number = -1
-        with self.task_progress_tracker.get_spinner("Preparing OSM tags filter"):
-            if is_expected_type(self.tags_filter, GroupedOsmTagsFilter):
-                grouped_osm_tags_filter = cast("GroupedOsmTagsFilter", self.tags_filter)
-                return {
-                    group: self._expand_single_osm_tags_filter(elements, osm_tags_filter)
-                    for group, osm_tags_filter in grouped_osm_tags_filter.items()
-                }
-            else:
-                osm_tags_filter = cast("OsmTagsFilter", self.tags_filter)
-                return self._expand_single_osm_tags_filter(elements, osm_tags_filter)
+        tag_keys = self.connection.sql(
+            f"SELECT DISTINCT tag FROM ({tag_keys_statistics.sql_query()})"
+        )
+        if is_expected_type(self.tags_filter, GroupedOsmTagsFilter):
+            grouped_osm_tags_filter = cast("GroupedOsmTagsFilter", self.tags_filter)
+            return {
+                group: self._expand_single_osm_tags_filter(tag_keys, osm_tags_filter)
+                for group, osm_tags_filter in grouped_osm_tags_filter.items()
+            }
+        else:
+            osm_tags_filter = cast("OsmTagsFilter", self.tags_filter)
+            return self._expand_single_osm_tags_filter(tag_keys, osm_tags_filter)
+
+    def _get_decoded_tag_keys_statistics(
+        self, decoded_osm_parquet_files: DecodedOSMParquetFiles
+    ) -> "duckdb.DuckDBPyRelation":
+        """Load number of occurences of each tag key per element kind, calculated only once."""
+        statistics_path = (
+            self.tmp_dir_path / "pbf_decoded" / PBF_DECODED_TAG_KEYS_STATISTICS_FILE_NAME
+        )
+        if not statistics_path.exists():
+            self.connection.sql(
+                f"""
+                COPY (
+                    SELECT kind, tag, COUNT(*) AS count
+                    FROM (
+                        SELECT 'node' AS kind, unnest(map_keys(tags)) AS tag
+                        FROM ({decoded_osm_parquet_files.nodes.sql_query()})
+                        WHERE tags IS NOT NULL
+                        UNION ALL
+                        SELECT 'way' AS kind, unnest(map_keys(tags)) AS tag
+                        FROM ({decoded_osm_parquet_files.ways.sql_query()})
+                        WHERE tags IS NOT NULL
+                        UNION ALL
+                        SELECT 'relation' AS kind, unnest(map_keys(tags)) AS tag
+                        FROM ({decoded_osm_parquet_files.relations.sql_query()})
+                        WHERE tags IS NOT NULL
+                    )
+                    GROUP BY kind, tag
+                ) TO '{statistics_path}' (FORMAT parquet)
+                """
+            )
+            decoded_cache_path = self._get_decoded_pbf_cache_dataset_path("pbf_decoded")
+            if decoded_cache_path is not None and decoded_cache_path.exists():
+                shutil.copy2(
+                    statistics_path,
+                    decoded_cache_path / PBF_DECODED_TAG_KEYS_STATISTICS_FILE_NAME,
+                )
+
+        return self.connection.sql(
+            f"SELECT kind, tag, count FROM read_parquet('{statistics_path}')"
+        )
 
     def _expand_single_osm_tags_filter(
-        self, elements: "duckdb.DuckDBPyRelation", osm_tags_filter: OsmTagsFilter
+        self, tag_keys: "duckdb.DuckDBPyRelation", osm_tags_filter: OsmTagsFilter
     ) -> OsmTagsFilter:
         osm_tags_filter_key_value_pairs = []
         for osm_tag_filter_key, osm_tag_filter_value in osm_tags_filter.items():
@@ -1507,12 +2468,7 @@ class PbfFileReader:
                 new_tags_to_add = list(
                     self.connection.sql(
                         f"""
-                        WITH distinct_tags AS (
-                            SELECT DISTINCT unnest(map_keys(tags)) tag
-                            FROM ({elements.sql_query()})
-                            WHERE tags IS NOT NULL
-                        )
-                        SELECT tag FROM distinct_tags
+                        SELECT tag FROM ({tag_keys.sql_query()})
                         WHERE tag LIKE '{sql_like_value}'
                         """
                     ).fetchnumpy()["tag"]
@@ -1533,58 +2489,112 @@ class PbfFileReader:
         return cast("str", sql_escape(value_with_percent))
 
     def _prefilter_elements_ids(
-        self, elements: "duckdb.DuckDBPyRelation", filter_osm_ids: list[str]
+        self, decoded_osm_parquet_files: DecodedOSMParquetFiles, filter_osm_ids: list[str]
     ) -> ConvertedOSMParquetFiles:
-        sql_filter = self._generate_osm_tags_sql_filter()
+        nodes_sql_filter = self._generate_osm_tags_sql_filter("node")
+        ways_sql_filter = self._generate_osm_tags_sql_filter("way")
+        relations_sql_filter = self._generate_osm_tags_sql_filter("relation")
+        is_ways_filter_matching = self._is_tags_filter_matching_kind("way")
+        is_relations_filter_matching = self._is_tags_filter_matching_kind("relation")
         filtered_tags_clause = (
             self._generate_filtered_tags_clause() if self.ignore_metadata_tags else "tags"
         )
         custom_sql_filter = self.custom_sql_filter or "1=1"
 
         is_intersecting = self.geometry_filter is not None
+        geometry_filter_bbox_clause = (
+            self._generate_geometry_filter_bbox_clause() if is_intersecting else "1=1"
+        )
 
         with self.task_progress_tracker.get_spinner("Reading nodes"):
             # NODES - VALID (NV)
             # - select all with kind = 'node'
             # - select all with lat and lon not empty
-            nodes_valid_with_tags = self._sql_to_parquet_file(
+            nodes_valid_with_tags = self._sql_to_cached_parquet_file(
                 sql_query=f"""
                 SELECT
                     id,
                     {filtered_tags_clause},
                     lon,
                     lat
-                FROM ({elements.sql_query()})
-                WHERE kind = 'node'
-                AND lat IS NOT NULL AND lon IS NOT NULL
+                FROM ({decoded_osm_parquet_files.nodes.sql_query()})
+                WHERE lat IS NOT NULL AND lon IS NOT NULL
                 """,
                 file_path=self.tmp_dir_path / "nodes_valid_with_tags",
+                cache_path=self._get_decoded_pbf_cache_dataset_path("nodes_valid_with_tags"),
             )
         # NODES - INTERSECTING (NI)
         # - select all from NV which intersect given geometry filter
         # NODES - FILTERED (NF)
         # - select all from NI with tags filter
         filter_osm_node_ids_filter = self._generate_elements_filter(filter_osm_ids, "node")
+        nodes_intersecting_ids_cache_path = self._get_geometry_intersection_cache_dataset_path(
+            "nodes_intersecting_ids"
+        )
+        is_nodes_intersection_cached = (
+            nodes_intersecting_ids_cache_path is not None
+            and nodes_intersecting_ids_cache_path.exists()
+        )
         if is_intersecting:
-            with self.task_progress_tracker.get_bar("Filtering nodes - intersection") as bar:
-                intersect_nodes_with_geometry(
-                    tmp_dir_path=self.tmp_dir_path,
-                    geometry_filter=self.geometry_filter,
-                    progress_bar=bar,
-                )
+            if is_nodes_intersection_cached:
+                with self.task_progress_tracker.get_spinner("Filtering nodes - intersection"):
+                    nodes_intersecting_ids = self._read_cached_parquet_file(
+                        cache_path=cast("Path", nodes_intersecting_ids_cache_path),
+                        file_path=self.tmp_dir_path / "nodes_intersecting_ids",
+                    )
+            else:
+                with self.task_progress_tracker.get_bar("Filtering nodes - intersection") as bar:
+                    # Only nodes within boxes covering the geometry filter are intersected exactly
+                    nodes_bbox_candidates_path = self.tmp_dir_path / "nodes_bbox_candidates"
+                    nodes_bbox_candidates = self._sql_to_parquet_file(
+                        sql_query=f"""
+                        SELECT id, lon, lat
+                        FROM ({nodes_valid_with_tags.sql_query()})
+                        WHERE {geometry_filter_bbox_clause}
+                        """,
+                        file_path=nodes_bbox_candidates_path,
+                    )
+                    if self._select_intersection_engine(nodes_bbox_candidates) == "duckdb":
+                        geometry_filter_wkb_hex = cast("BaseGeometry", self.geometry_filter).wkb_hex
+                        bar.create_manual_bar(total=1)
+                        nodes_intersecting_ids = self._sql_to_parquet_file(
+                            sql_query=f"""
+                            SELECT id
+                            FROM ({nodes_bbox_candidates.sql_query()})
+                            WHERE ST_Intersects(
+                                ST_Point(lon, lat),
+                                ST_GeomFromHEXWKB('{geometry_filter_wkb_hex}')
+                            )
+                            """,
+                            file_path=self.tmp_dir_path / "nodes_intersecting_ids",
+                        )
+                        bar.update_manual_bar(current_progress=1)
+                    else:
+                        nodes_intersecting_ids = self._intersect_nodes_in_worker_pool(
+                            nodes_bbox_candidates_path, bar
+                        )
 
-                nodes_intersecting_ids = self.connection.read_parquet(
-                    str(self.tmp_dir_path / "nodes_intersecting_ids" / "*.parquet")
-                )
+                    if nodes_intersecting_ids_cache_path is not None:
+                        # Python engine results are saved as Arrow files, cache keeps parquet
+                        nodes_intersecting_ids_parquet_path = (
+                            self.tmp_dir_path / "nodes_intersecting_ids_parquet"
+                        )
+                        self._save_parquet_file(
+                            nodes_intersecting_ids, nodes_intersecting_ids_parquet_path
+                        )
+                        _copy_parquet_dataset(
+                            nodes_intersecting_ids_parquet_path, nodes_intersecting_ids_cache_path
+                        )
 
             with self.task_progress_tracker.get_spinner("Filtering nodes - tags"):
                 self._sql_to_parquet_file(
                     sql_query=f"""
                     SELECT id FROM ({nodes_valid_with_tags.sql_query()}) n
                     SEMI JOIN ({nodes_intersecting_ids.sql_query()}) ni ON n.id = ni.id
-                    WHERE tags IS NOT NULL
+                    WHERE ({geometry_filter_bbox_clause})
+                    AND tags IS NOT NULL
                     AND cardinality(tags) > 0
-                    AND ({sql_filter})
+                    AND ({nodes_sql_filter})
                     AND ({filter_osm_node_ids_filter})
                     AND ({custom_sql_filter})
                     """,
@@ -1600,7 +2610,7 @@ class PbfFileReader:
                     SELECT id FROM ({nodes_valid_with_tags.sql_query()}) n
                     WHERE tags IS NOT NULL
                     AND cardinality(tags) > 0
-                    AND ({sql_filter})
+                    AND ({nodes_sql_filter})
                     AND ({filter_osm_node_ids_filter})
                     AND ({custom_sql_filter})
                     """,
@@ -1610,6 +2620,7 @@ class PbfFileReader:
             nodes_filtered_ids = self._calculate_unique_ids_to_parquet(
                 self.tmp_dir_path / "nodes_filtered_non_distinct_ids",
                 self.tmp_dir_path / "nodes_filtered_ids",
+                are_ids_unique=self.is_pbf_file_sorted,
             )
 
         with self.task_progress_tracker.get_spinner("Reading ways"):
@@ -1621,11 +2632,11 @@ class PbfFileReader:
             self.connection.sql(
                 f"""
                 SELECT *
-                FROM ({elements.sql_query()}) w
-                WHERE kind = 'way' AND len(refs) >= 2
+                FROM ({decoded_osm_parquet_files.ways.sql_query()}) w
+                WHERE len(refs) >= 2
                 """
             ).to_view("ways", replace=True)
-            ways_all_with_tags = self._sql_to_parquet_file(
+            ways_all_with_tags = self._sql_to_cached_parquet_file(
                 sql_query=f"""
                 WITH filtered_tags AS (
                     SELECT id, {filtered_tags_clause}, tags as raw_tags
@@ -1637,17 +2648,21 @@ class PbfFileReader:
                 WHERE tags IS NOT NULL AND cardinality(tags) > 0
                 """,
                 file_path=self.tmp_dir_path / "ways_all_with_tags",
+                cache_path=self._get_decoded_pbf_cache_dataset_path("ways_all_with_tags"),
             )
         with self.task_progress_tracker.get_spinner("Unnesting ways"):
-            ways_with_unnested_nodes_refs = self._sql_to_parquet_file(
+            ways_with_unnested_nodes_refs = self._sql_to_cached_parquet_file(
                 sql_query="""
                 SELECT w.id, UNNEST(refs) as ref, UNNEST(range(length(refs))) as ref_idx
                 FROM ways w
                 """,
                 file_path=self.tmp_dir_path / "ways_with_unnested_nodes_refs",
+                cache_path=self._get_decoded_pbf_cache_dataset_path(
+                    "ways_with_unnested_nodes_refs"
+                ),
             )
         with self.task_progress_tracker.get_spinner("Filtering ways - valid refs"):
-            ways_valid_ids = self._sql_to_parquet_file(
+            ways_valid_ids = self._sql_to_cached_parquet_file(
                 sql_query=f"""
                 WITH total_ways_with_nodes_refs AS (
                     SELECT id
@@ -1663,21 +2678,44 @@ class PbfFileReader:
                 ANTI JOIN unmatched_ways_with_nodes_refs USING (id)
                 """,
                 file_path=self.tmp_dir_path / "ways_valid_ids",
+                cache_path=self._get_decoded_pbf_cache_dataset_path("ways_valid_ids"),
             )
 
         with self.task_progress_tracker.get_spinner("Filtering ways - intersection"):
             # WAYS - INTERSECTING (WI)
-            # - select all from WV with joining any from NV on ref
-            if is_intersecting:
-                ways_intersecting_ids = self._sql_to_parquet_file(
-                    sql_query=f"""
-                    SELECT DISTINCT uwr.id
-                    FROM ({ways_with_unnested_nodes_refs.sql_query()}) uwr
-                    SEMI JOIN ({ways_valid_ids.sql_query()}) wv ON uwr.id = wv.id
-                    SEMI JOIN ({nodes_intersecting_ids.sql_query()}) n ON n.id = uwr.ref
-                    """,
+            # - select all from WV with bounding box inside the geometry filter
+            # - select all from WV on the boundary with joining any from NI on ref
+            #   or with the line crossing the geometry filter
+            # - skipped if tags filter cannot match any way or relation
+            if is_intersecting and not (is_ways_filter_matching or is_relations_filter_matching):
+                ways_intersecting_ids = self._save_parquet_file(
+                    relation=self.connection.sql("SELECT NULL::BIGINT as id WHERE 1=0"),
                     file_path=self.tmp_dir_path / "ways_intersecting_ids",
+                    run_in_separate_process=False,
+                )
+            elif is_intersecting:
+                ways_intersecting_ids_cache_path = (
+                    self._get_geometry_intersection_cache_dataset_path("ways_intersecting_ids")
                 )
+                if ways_intersecting_ids_cache_path is not None and (
+                    ways_intersecting_ids_cache_path.exists()
+                ):
+                    ways_intersecting_ids = self._read_cached_parquet_file(
+                        cache_path=ways_intersecting_ids_cache_path,
+                        file_path=self.tmp_dir_path / "ways_intersecting_ids",
+                    )
+                else:
+                    ways_intersecting_ids = self._intersect_ways_with_geometry(
+                        ways_with_unnested_nodes_refs=ways_with_unnested_nodes_refs,
+                        ways_valid_ids=ways_valid_ids,
+                        nodes_locations=self._get_nodes_locations(nodes_valid_with_tags),
+                        nodes_intersecting_ids=nodes_intersecting_ids,
+                    )
+                    if ways_intersecting_ids_cache_path is not None:
+                        _copy_parquet_dataset(
+                            self.tmp_dir_path / "ways_intersecting_ids",
+                            ways_intersecting_ids_cache_path,
+                        )
             else:
                 ways_intersecting_ids = ways_valid_ids
         with self.task_progress_tracker.get_spinner("Filtering ways - tags"):
@@ -1688,7 +2726,7 @@ class PbfFileReader:
                 sql_query=f"""
                 SELECT id FROM ({ways_all_with_tags.sql_query()}) w
                 SEMI JOIN ({ways_intersecting_ids.sql_query()}) wi ON w.id = wi.id
-                WHERE ({sql_filter})
+                WHERE ({ways_sql_filter})
                 AND ({filter_osm_way_ids_filter})
                 AND ({custom_sql_filter})
                 """,
@@ -1699,6 +2737,7 @@ class PbfFileReader:
             ways_filtered_ids = self._calculate_unique_ids_to_parquet(
                 self.tmp_dir_path / "ways_filtered_non_distinct_ids",
                 self.tmp_dir_path / "ways_filtered_ids",
+                are_ids_unique=self.is_pbf_file_sorted,
             )
 
         with self.task_progress_tracker.get_spinner("Reading relations"):
@@ -1716,13 +2755,13 @@ class PbfFileReader:
             self.connection.sql(
                 f"""
                 SELECT *
-                FROM ({elements.sql_query()})
-                WHERE kind = 'relation' AND len(refs) > 0
+                FROM ({decoded_osm_parquet_files.relations.sql_query()})
+                WHERE len(refs) > 0
                 AND list_contains(map_keys(tags), 'type')
                 {relation_type_filter}
                 """
             ).to_view("relations", replace=True)
-            relations_all_with_tags = self._sql_to_parquet_file(
+            relations_all_with_tags = self._sql_to_cached_parquet_file(
                 sql_query=f"""
                 WITH unnested_relation_refs AS (
                     SELECT
@@ -1760,10 +2799,11 @@ class PbfFileReader:
                 WHERE tags IS NOT NULL AND cardinality(tags) > 0
                 """,
                 file_path=self.tmp_dir_path / "relations_all_with_tags",
+                cache_path=self._get_decoded_pbf_cache_dataset_path("relations_all_with_tags"),
             )
 
         with self.task_progress_tracker.get_spinner("Unnesting relations"):
-            relations_with_unnested_way_refs = self._sql_to_parquet_file(
+            relations_with_unnested_way_refs = self._sql_to_cached_parquet_file(
                 sql_query="""
                 WITH unnested_relation_refs AS (
                     SELECT
@@ -1779,6 +2819,9 @@ class PbfFileReader:
                 WHERE ref_type = 'way'
                 """,
                 file_path=self.tmp_dir_path / "relations_with_unnested_way_refs",
+                cache_path=self._get_decoded_pbf_cache_dataset_path(
+                    "relations_with_unnested_way_refs"
+                ),
             )
 
         # Process node-only relations (relations with zero ways) if enabled
@@ -1830,7 +2873,7 @@ class PbfFileReader:
 
         with self.task_progress_tracker.get_spinner("Filtering relations - valid refs"):
             # Validate way-based relations
-            relations_valid_ids = self._sql_to_parquet_file(
+            relations_valid_ids = self._sql_to_cached_parquet_file(
                 sql_query=f"""
                 WITH total_relation_refs AS (
                     SELECT id
@@ -1846,6 +2889,7 @@ class PbfFileReader:
                 ANTI JOIN unmatched_relation_refs USING (id)
                 """,
                 file_path=self.tmp_dir_path / "relations_valid_ids",
+                cache_path=self._get_decoded_pbf_cache_dataset_path("relations_valid_ids"),
             )
 
             # Validate node-only relations (if enabled)
@@ -1882,8 +2926,20 @@ class PbfFileReader:
         with self.task_progress_tracker.get_spinner("Filtering relations - intersection"):
             # RELATIONS - INTERSECTING (RI)
             # - select all from RW with joining any from RV on ref
-            if is_intersecting:
-                relations_intersecting_ids = self._sql_to_parquet_file(
+            # - skipped if tags filter cannot match any relation
+            if is_intersecting and not is_relations_filter_matching:
+                relations_intersecting_ids = self._save_parquet_file(
+                    relation=self.connection.sql("SELECT NULL::BIGINT as id WHERE 1=0"),
+                    file_path=self.tmp_dir_path / "relations_intersecting_ids",
+                    run_in_separate_process=False,
+                )
+                relations_node_only_intersecting_ids = self._save_parquet_file(
+                    relation=self.connection.sql("SELECT NULL::BIGINT as id WHERE 1=0"),
+                    file_path=self.tmp_dir_path / "relations_node_only_intersecting_ids",
+                    run_in_separate_process=False,
+                )
+            elif is_intersecting:
+                relations_intersecting_ids = self._sql_to_cached_parquet_file(
                     sql_query=f"""
                     SELECT frr.id
                     FROM ({relations_with_unnested_way_refs.sql_query()}) frr
@@ -1891,11 +2947,14 @@ class PbfFileReader:
                     SEMI JOIN ({ways_intersecting_ids.sql_query()}) wi ON wi.id = frr.ref
                     """,
                     file_path=self.tmp_dir_path / "relations_intersecting_ids",
+                    cache_path=self._get_geometry_intersection_cache_dataset_path(
+                        "relations_intersecting_ids"
+                    ),
                 )
 
                 # Node-only relations intersecting (if enabled)
                 if self.include_node_only_relations:
-                    relations_node_only_intersecting_ids = self._sql_to_parquet_file(
+                    relations_node_only_intersecting_ids = self._sql_to_cached_parquet_file(
                         sql_query=f"""
                         SELECT rnr.id
                         FROM ({relations_with_node_refs.sql_query()}) rnr
@@ -1903,6 +2962,9 @@ class PbfFileReader:
                         SEMI JOIN ({nodes_intersecting_ids.sql_query()}) ni ON ni.id = rnr.ref
                         """,
                         file_path=self.tmp_dir_path / "relations_node_only_intersecting_ids",
+                        cache_path=self._get_geometry_intersection_cache_dataset_path(
+                            "relations_node_only_intersecting_ids"
+                        ),
                     )
                 else:
                     empty_intersecting_ids = self.connection.sql(
@@ -1931,7 +2993,7 @@ class PbfFileReader:
                 sql_query=f"""
                 SELECT id FROM ({relations_all_with_tags.sql_query()}) r
                 SEMI JOIN ({relations_intersecting_ids.sql_query()}) ri ON r.id = ri.id
-                WHERE ({sql_filter})
+                WHERE ({relations_sql_filter})
                 AND ({filter_osm_relation_ids_filter})
                 AND ({custom_sql_filter})
                 """,
@@ -1943,7 +3005,7 @@ class PbfFileReader:
                     sql_query=f"""
                     SELECT id FROM ({relations_all_with_tags.sql_query()}) r
                     SEMI JOIN ({relations_node_only_intersecting_ids.sql_query()}) rni ON r.id = rni.id
-                    WHERE ({sql_filter})
+                    WHERE ({relations_sql_filter})
                     AND ({filter_osm_relation_ids_filter})
                     AND ({custom_sql_filter})
                     """,
@@ -1952,12 +3014,15 @@ class PbfFileReader:
 
         with self.task_progress_tracker.get_spinner("Calculating distinct filtered relations ids"):
             relations_filtered_ids = self._calculate_unique_ids_to_parquet(
-                relations_ids_path / "filtered", self.tmp_dir_path / "relations_filtered_ids"
+                relations_ids_path / "filtered",
+                self.tmp_dir_path / "relations_filtered_ids",
+                are_ids_unique=self.is_pbf_file_sorted,
             )
             if self.include_node_only_relations:
                 relations_node_only_filtered_ids = self._calculate_unique_ids_to_parquet(
                     relations_ids_path / "filtered_node_only",
                     self.tmp_dir_path / "relations_node_only_filtered_ids",
+                    are_ids_unique=self.is_pbf_file_sorted,
                 )
             else:
                 empty_filtered_ids = self.connection.sql(
@@ -2005,21 +3070,26 @@ class PbfFileReader:
         )
 
     def _delete_directories(
-        self, directories: Union[str, Path, list[Union[str, Path]]], override_debug: bool = False
+        self,
+        directories: Union[str, Path, Sequence[Union[str, Path]]],
+        override_debug: bool = False,
     ) -> None:
         if self.debug_memory and not override_debug:
             return
 
-        _directories = []
+        _directories: Sequence[Union[str, Path]] = []
         if isinstance(directories, (str, Path)):
             _directories = [directories]
         else:
             _directories = directories
-        for directory in _directories:
-            if isinstance(directory, Path):
-                directory_path = directory
-            else:
-                directory_path = self.tmp_dir_path / directory
+        directories_paths = [
+            directory if isinstance(directory, Path) else self.tmp_dir_path / directory
+            for directory in _directories
+        ]
+        if self._run_checkpoint is not None:
+            self._run_checkpoint.mark_deleted(directories_paths)
+
+        for directory_path in directories_paths:
             tries = 100
             while directory_path.exists() and tries > 0:
                 try:
@@ -2039,15 +3109,33 @@ class PbfFileReader:
             return dir_path
         raise RuntimeError("Cannot prepare debug directory when debug mode is not activated.")
 
-    def _generate_osm_tags_sql_filter(self) -> str:
-        """Prepare features filter clauses based on tags filter."""
+    def _generate_osm_tags_sql_filter(self, kind: Optional[str] = None) -> str:
+        """
+        Prepare features filter clauses based on tags filter.
+
+        If element kind is passed, positive clauses are ordered by the tag key frequency
+        and clauses with keys missing from all elements of this kind are removed.
+        """
         positive_filter_clauses: list[str] = []
         negative_filter_clauses: list[str] = []
+        is_any_positive_filter_key = False
+        tag_keys_counts: Optional[dict[str, int]] = None
+        if kind is not None and self.tag_keys_statistics is not None:
+            tag_keys_counts = self.tag_keys_statistics[kind]
 
         if self.merged_tags_filter:
             positive_filter_clauses.clear()
 
-            for filter_tag_key, filter_tag_value in self.merged_tags_filter.items():
+            filter_tag_items = list(self.merged_tags_filter.items())
+            if tag_keys_counts is not None:
+                filter_tag_items.sort(key=lambda item: -tag_keys_counts.get(item[0], 0))
+
+            for filter_tag_key, filter_tag_value in filter_tag_items:
+                is_any_positive_filter_key |= filter_tag_value != False  # noqa: E712
+                if tag_keys_counts is not None and filter_tag_key not in tag_keys_counts:
+                    # Clause for a missing key is constant for all elements of this kind
+                    continue
+
                 if filter_tag_value == True:  # noqa: E712
                     positive_filter_clauses.append(
                         f"(list_contains(map_keys(tags), '{filter_tag_key}'))"
@@ -2077,7 +3165,7 @@ class PbfFileReader:
                             )
 
         if not positive_filter_clauses:
-            positive_filter_clauses.append("(1=1)")
+            positive_filter_clauses.append("(1=0)" if is_any_positive_filter_key else "(1=1)")
 
         joined_filter_clauses = " OR ".join(positive_filter_clauses)
         if negative_filter_clauses:
@@ -2087,6 +3175,217 @@ class PbfFileReader:
 
         return joined_filter_clauses
 
+    def _select_intersection_engine(
+        self, nodes_bbox_candidates: "duckdb.DuckDBPyRelation"
+    ) -> Literal["python", "duckdb"]:
+        # Polygon sets are always tested with an STRtree of their parts
+        if is_polygon_set(cast("BaseGeometry", self.geometry_filter)):
+            return "python"
+
+        if self.intersection_engine != "auto":
+            return self.intersection_engine
+
+        number_of_vertices = shapely.get_num_coordinates(self.geometry_filter)
+        if number_of_vertices <= INTERSECTION_ENGINE_AUTO_MAX_DUCKDB_VERTICES:
+            return "duckdb"
+
+        number_of_nodes = nodes_bbox_candidates.count("id").fetchone()[0]
+        if number_of_nodes * number_of_vertices <= INTERSECTION_ENGINE_AUTO_MAX_DUCKDB_COST:
+            return "duckdb"
+
+        return "python"
+
+    def _get_geometry_filter_grid_cache_path(self) -> Path:
+        return (
+            Path(self.working_directory)
+            / "geometry_filter_grid_cache"
+            / f"{self._generate_geometry_hash()}_{GEOMETRY_FILTER_GRID_SIZE}.npz"
+        )
+
+    def _intersect_ways_with_geometry(
+        self,
+        ways_with_unnested_nodes_refs: "duckdb.DuckDBPyRelation",
+        ways_valid_ids: "duckdb.DuckDBPyRelation",
+        nodes_locations: "duckdb.DuckDBPyRelation",
+        nodes_intersecting_ids: "duckdb.DuckDBPyRelation",
+    ) -> "duckdb.DuckDBPyRelation":
+        # Ways bounding boxes don't depend on the geometry filter. They are calculated
+        # from narrow fixed-point nodes locations and enlarged by a single unit,
+        # so rounding can only move a way to the boundary class.
+        self._sql_to_cached_parquet_file(
+            sql_query=f"""
+            SELECT
+                uwr.id,
+                (min(nl.lon) - 1) / {NODES_COORDINATES_SCALE} AS min_lon,
+                (min(nl.lat) - 1) / {NODES_COORDINATES_SCALE} AS min_lat,
+                (max(nl.lon) + 1) / {NODES_COORDINATES_SCALE} AS max_lon,
+                (max(nl.lat) + 1) / {NODES_COORDINATES_SCALE} AS max_lat
+            FROM ({ways_with_unnested_nodes_refs.sql_query()}) uwr
+            SEMI JOIN ({ways_valid_ids.sql_query()}) wv ON uwr.id = wv.id
+            JOIN ({nodes_locations.sql_query()}) nl ON nl.id = uwr.ref
+            GROUP BY uwr.id
+            """,
+            file_path=self.tmp_dir_path / "ways_bboxes",
+            cache_path=self._get_decoded_pbf_cache_dataset_path("ways_bboxes"),
+        )
+        classify_ways_bboxes_with_geometry(
+            dataset_path=self.tmp_dir_path / "ways_bboxes",
+            destination_path=self.tmp_dir_path / "ways_bboxes_classes",
+            geometry_filter=cast("BaseGeometry", self.geometry_filter),
+            geometry_filter_grid_cache_path=self._get_geometry_filter_grid_cache_path(),
+        )
+        ways_bboxes_classes = self.connection.sql(
+            f"SELECT * FROM read_parquet('{self.tmp_dir_path / 'ways_bboxes_classes'}/*.parquet')"
+        )
+        # Only ways with bounding boxes on the geometry filter boundary are checked
+        # with intersecting nodes and, if there are none, with the exact line geometry
+        boundary_ways_clause = f"""
+            boundary_ways_refs AS (
+                SELECT uwr.id, uwr.ref, uwr.ref_idx
+                FROM ({ways_with_unnested_nodes_refs.sql_query()}) uwr
+                SEMI JOIN (
+                    SELECT id
+                    FROM ({ways_bboxes_classes.sql_query()})
+                    WHERE bbox_class = {GRID_CELL_BOUNDARY}
+                ) bw ON uwr.id = bw.id
+            ),
+            boundary_ways_with_intersecting_nodes AS (
+                SELECT DISTINCT bwr.id
+                FROM boundary_ways_refs bwr
+                SEMI JOIN ({nodes_intersecting_ids.sql_query()}) n ON n.id = bwr.ref
+            ),
+            boundary_ways_lines AS (
+                SELECT
+                    bwr.id,
+                    ST_MakeLine(
+                        list(
+                            ST_Point(
+                                nl.lon / {NODES_COORDINATES_SCALE},
+                                nl.lat / {NODES_COORDINATES_SCALE}
+                            )
+                            ORDER BY bwr.ref_idx
+                        )
+                    ) AS geometry
+                FROM boundary_ways_refs bwr
+                ANTI JOIN boundary_ways_with_intersecting_nodes bwi ON bwr.id = bwi.id
+                JOIN ({nodes_locations.sql_query()}) nl ON nl.id = bwr.ref
+                GROUP BY bwr.id
+            )
+        """
+        geometry_filter = cast("BaseGeometry", self.geometry_filter)
+        if is_polygon_set(geometry_filter):
+            # Polygon sets are tested with an STRtree of their parts in Python
+            # instead of a single huge geometry constant in DuckDB
+            ways_crossing_ids_path = self.tmp_dir_path / "ways_crossing_ids"
+            intersect_lines_with_geometry(
+                lines_reader=self.connection.sql(
+                    f"""
+                    WITH {boundary_ways_clause}
+                    SELECT id, ST_AsWKB(geometry) AS wkb
+                    FROM boundary_ways_lines
+                    """
+                ).fetch_arrow_reader(batch_size=100_000),
+                destination_path=ways_crossing_ids_path,
+                geometry_filter=geometry_filter,
+            )
+            boundary_ways_crossing_query = (
+                f"SELECT id FROM read_parquet('{ways_crossing_ids_path}/*.parquet')"
+            )
+        else:
+            boundary_ways_crossing_query = f"""
+                SELECT id
+                FROM boundary_ways_lines
+                WHERE ST_Intersects(geometry, ST_GeomFromHEXWKB('{geometry_filter.wkb_hex}'))
+            """
+
+        return self._sql_to_parquet_file(
+            sql_query=f"""
+            WITH {boundary_ways_clause},
+            boundary_ways_crossing AS ({boundary_ways_crossing_query})
+            SELECT id
+            FROM ({ways_bboxes_classes.sql_query()})
+            WHERE bbox_class = {GRID_CELL_INSIDE}
+            UNION ALL
+            SELECT id FROM boundary_ways_with_intersecting_nodes
+            UNION ALL
+            SELECT id FROM boundary_ways_crossing
+            """,
+            file_path=self.tmp_dir_path / "ways_intersecting_ids",
+        )
+
+    def _intersect_nodes_in_worker_pool(
+        self, nodes_bbox_candidates_path: Path, progress_bar: TaskProgressBar
+    ) -> "duckdb.DuckDBPyRelation":
+        intersect_nodes_with_geometry(
+            tmp_dir_path=self.tmp_dir_path,
+            geometry_filter=self.geometry_filter,
+            progress_bar=progress_bar,
+            geometry_filter_grid_cache_path=self._get_geometry_filter_grid_cache_path(),
+            dataset_path=nodes_bbox_candidates_path,
+            worker_pool=self._get_worker_pool(),
+            result_format="arrow",
+        )
+        if self.debug_times:
+            for worker_statistics in self._get_worker_pool().last_map_statistics:
+                log_message(
+                    f"Worker {worker_statistics.pid}: {worker_statistics.tasks} tasks,"
+                    f" {worker_statistics.rows} rows"
+                    f" ({worker_statistics.decoded_rows} decoded),"
+                    f" {worker_statistics.busy_seconds:.2f}s busy"
+                )
+
+        # Ids are registered directly from memory-mapped Arrow files
+        self.connection.register(
+            "nodes_intersecting_ids",
+            read_arrow_dataset(self.tmp_dir_path / "nodes_intersecting_ids"),
+        )
+        return self.connection.view("nodes_intersecting_ids")
+
+    def _get_worker_pool(self) -> ParquetWorkerPool:
+        """Get worker pool reused between conversions, started lazily on the first use."""
+        if self._worker_pool is None:
+            self._worker_pool = ParquetWorkerPool(number_of_workers=self.cpu_limit)
+
+        return self._worker_pool
+
+    def _generate_geometry_filter_bbox_clause(self) -> str:
+        """Generate lon/lat predicate with boxes covering the geometry filter parts."""
+        geometry_filter = cast("BaseGeometry", self.geometry_filter)
+        geometry_parts = (
+            list(geometry_filter.geoms)
+            if isinstance(geometry_filter, BaseMultipartGeometry)
+            and len(geometry_filter.geoms) <= GEOMETRY_FILTER_MAX_COVERING_BOXES
+            else [geometry_filter]
+        )
+        bbox_clauses = [
+            f"(lon BETWEEN {min_lon}::DOUBLE AND {max_lon}::DOUBLE"
+            f" AND lat BETWEEN {min_lat}::DOUBLE AND {max_lat}::DOUBLE)"
+            for min_lon, min_lat, max_lon, max_lat in (
+                geometry_part.bounds
+                for geometry_part in geometry_parts
+                if not geometry_part.is_empty
+            )
+        ]
+        return " OR ".join(bbox_clauses) or "1=0"
+
+    def _is_tags_filter_matching_kind(self, kind: str) -> bool:
+        """Check if positive tags filter keys exist in any element of a given kind."""
+        if not self.merged_tags_filter or self.tag_keys_statistics is None:
+            return True
+
+        positive_filter_keys = [
+            filter_tag_key
+            for filter_tag_key, filter_tag_value in self.merged_tags_filter.items()
+            if filter_tag_value != False  # noqa: E712
+        ]
+        if not positive_filter_keys:
+            return True
+
+        return any(
+            filter_tag_key in self.tag_keys_statistics[kind]
+            for filter_tag_key in positive_filter_keys
+        )
+
     def _generate_filtered_tags_clause(self) -> str:
         """Prepare filtered tags clause by removing tags commonly ignored by OGR."""
         escaped_tags_to_ignore = [f"'{tag}'" for tag in METADATA_TAGS_TO_IGNORE]
@@ -2123,6 +3422,26 @@ class PbfFileReader:
         relation = self.connection.sql(sql_query)
         return self._save_parquet_file(relation, file_path)
 
+    def _sql_to_cached_parquet_file(
+        self, sql_query: str, file_path: Path, cache_path: Optional[Path]
+    ) -> "duckdb.DuckDBPyRelation":
+        if cache_path is None:
+            return self._sql_to_parquet_file(sql_query, file_path)
+
+        if cache_path.exists():
+            return self._read_cached_parquet_file(cache_path, file_path)
+
+        self._sql_to_parquet_file(sql_query, file_path)
+        _copy_parquet_dataset(file_path, cache_path)
+
+        return self.connection.sql(f"SELECT * FROM read_parquet('{file_path}/**/*.parquet')")
+
+    def _read_cached_parquet_file(
+        self, cache_path: Path, file_path: Path
+    ) -> "duckdb.DuckDBPyRelation":
+        _copy_parquet_dataset(cache_path, file_path)
+        return self.connection.sql(f"SELECT * FROM read_parquet('{file_path}/**/*.parquet')")
+
     def _save_parquet_file(
         self,
         relation: "duckdb.DuckDBPyRelation",
@@ -2238,8 +3557,15 @@ class PbfFileReader:
                     raise
 
     def _calculate_unique_ids_to_parquet(
-        self, file_path: Path, result_path: Optional[Path] = None
+        self, file_path: Path, result_path: Optional[Path] = None, are_ids_unique: bool = False
     ) -> "duckdb.DuckDBPyRelation":
+        if are_ids_unique and result_path is not None:
+            # Ids selected from elements of a single kind are already distinct
+            # if the file is sorted, so the global aggregation can be skipped.
+            self._delete_directories(result_path, override_debug=True)
+            file_path.rename(result_path)
+            return self.connection.sql(f"SELECT * FROM read_parquet('{result_path}/**/*.parquet')")
+
         if result_path is None:
             result_path = file_path / "distinct"
 
@@ -2271,6 +3597,54 @@ class PbfFileReader:
 
         return self.connection.sql(f"SELECT * FROM read_parquet('{result_path}/**/*.parquet')")
 
+    def _get_nodes_locations(
+        self, nodes_valid_with_tags: "duckdb.DuckDBPyRelation"
+    ) -> "duckdb.DuckDBPyRelation":
+        """Get ids and fixed-point coordinates of valid nodes, saved lazily on the first use."""
+        # NODES - LOCATIONS (NL)
+        # - select ids and fixed-point coordinates from NV
+        # - sort by id, unless the PBF file is already sorted
+        file_path = self.tmp_dir_path / "nodes_locations"
+        cache_path = self._get_decoded_pbf_cache_dataset_path("nodes_locations")
+        if file_path.exists():
+            return self.connection.sql(f"SELECT * FROM read_parquet('{file_path}/**/*.parquet')")
+
+        if cache_path is not None and cache_path.exists():
+            _copy_parquet_dataset(cache_path, file_path)
+        else:
+            file_path.mkdir(parents=True, exist_ok=True)
+            # Without per thread output, files are saved in order and each
+            # row group covers a narrow range of ids. Nodes of a sorted PBF file
+            # are decoded in ordered chunks, so ranges stay narrow without sorting.
+            order_by_clause = "" if self.is_pbf_file_sorted else "ORDER BY id"
+            self._run_query(
+                f"""
+                COPY (
+                    SELECT
+                        id,
+                        round(lon * {NODES_COORDINATES_SCALE})::INTEGER lon,
+                        round(lat * {NODES_COORDINATES_SCALE})::INTEGER lat
+                    FROM ({nodes_valid_with_tags.sql_query()})
+                    {order_by_clause}
+                ) TO '{file_path}' (
+                    FORMAT 'parquet',
+                    {PbfFileReader.parquet_version_query}
+                    OVERWRITE true,
+                    FILE_SIZE_BYTES '128MB',
+                    ROW_GROUP_SIZE_BYTES '16MB',
+                    COMPRESSION '{self.internal_parquet_compression}'
+                )
+                """
+            )
+            if not any(file_path.iterdir()):
+                self.connection.sql(
+                    "SELECT NULL::BIGINT id, NULL::INTEGER lon, NULL::INTEGER lat WHERE 1=0"
+                ).to_parquet(str(file_path / "empty.parquet"))
+            if cache_path is not None:
+                _copy_parquet_dataset(file_path, cache_path)
+
+        return self.connection.sql(f"SELECT * FROM read_parquet('{file_path}/**/*.parquet')")
+
     def _get_filtered_nodes_with_geometry(
         self,
         osm_parquet_files: ConvertedOSMParquetFiles,
@@ -2297,14 +3671,17 @@ class PbfFileReader:
         self,
         osm_parquet_files: ConvertedOSMParquetFiles,
     ) -> "duckdb.DuckDBPyRelation":
+        nodes_locations = self._get_nodes_locations(osm_parquet_files.nodes_valid_with_tags)
         ways_refs_with_nodes_structs = self.connection.sql(
             f"""
             SELECT
                 w.id,
                 w.ref,
                 w.ref_idx,
-                struct_pack(x := round(n.lon, 7), y := round(n.lat, 7))::POINT_2D point
-            FROM ({osm_parquet_files.nodes_valid_with_tags.sql_query()}) n
+                struct_pack(
+                    x := n.lon / {NODES_COORDINATES_SCALE}, y := n.lat / {NODES_COORDINATES_SCALE}
+                )::POINT_2D point
+            FROM ({nodes_locations.sql_query()}) n
             JOIN ({osm_parquet_files.ways_with_unnested_nodes_refs.sql_query()}) w ON w.ref = n.id
             """
         )
@@ -2315,50 +3692,60 @@ class PbfFileReader:
             )
         return ways_refs_parquet
 
-    def _get_filtered_ways_with_linestrings(
+    def _get_filtered_and_required_ways_with_linestrings(
         self,
         osm_parquet_files: ConvertedOSMParquetFiles,
-    ) -> "duckdb.DuckDBPyRelation":
-        grouped_ways_path = self.tmp_dir_path / "filtered_ways_grouped"
-        grouped_ways_tmp_path = self.tmp_dir_path / "filtered_ways_tmp"
-        destination_dir_path = self.tmp_dir_path / "filtered_ways_with_linestrings"
+    ) -> tuple["duckdb.DuckDBPyRelation", "duckdb.DuckDBPyRelation"]:
+        # Filtered and required ways overlap heavily, so linestrings are constructed
+        # once for all of them and both sets are selected using membership flags.
+        ways_ids_with_membership = self._save_parquet_file(
+            relation=self.connection.sql(
+                f"""
+                SELECT
+                    COALESCE(fw.id, rw.id) AS id,
+                    fw.id IS NOT NULL AS is_filtered,
+                    rw.id IS NOT NULL AS is_required
+                FROM ({osm_parquet_files.ways_filtered_ids.sql_query()}) fw
+                FULL OUTER JOIN ({osm_parquet_files.ways_required_ids.sql_query()}) rw
+                ON fw.id = rw.id
+                """
+            ),
+            file_path=self.tmp_dir_path / "ways_ids_with_membership",
+        )
 
-        return self._get_ways_with_linestrings(
-            ways_ids=osm_parquet_files.ways_filtered_ids,
-            mode="filtered",
+        ways_with_linestrings = self._get_ways_with_linestrings(
+            ways_ids=self.connection.sql(
+                f"SELECT id FROM ({ways_ids_with_membership.sql_query()})"
+            ),
             osm_parquet_files=osm_parquet_files,
-            destination_dir_path=destination_dir_path,
-            grouped_ways_path=grouped_ways_path,
-            grouped_ways_tmp_path=grouped_ways_tmp_path,
+            destination_dir_path=self.tmp_dir_path / "ways_with_linestrings",
+            grouped_ways_path=self.tmp_dir_path / "ways_grouped",
+            grouped_ways_tmp_path=self.tmp_dir_path / "ways_grouped_tmp",
         )
 
-    def _get_required_ways_with_linestrings(
-        self,
-        osm_parquet_files: ConvertedOSMParquetFiles,
-    ) -> "duckdb.DuckDBPyRelation":
-        grouped_ways_path = self.tmp_dir_path / "required_ways_grouped"
-        grouped_ways_tmp_path = self.tmp_dir_path / "required_ways_tmp"
-        destination_dir_path = self.tmp_dir_path / "required_ways_with_linestrings"
-
-        return self._get_ways_with_linestrings(
-            ways_ids=osm_parquet_files.ways_required_ids,
-            mode="required",
-            osm_parquet_files=osm_parquet_files,
-            destination_dir_path=destination_dir_path,
-            grouped_ways_path=grouped_ways_path,
-            grouped_ways_tmp_path=grouped_ways_tmp_path,
+        filtered_ways_with_linestrings, required_ways_with_linestrings = (
+            self.connection.sql(
+                f"""
+                SELECT w.id, w.linestring
+                FROM ({ways_with_linestrings.sql_query()}) w
+                SEMI JOIN ({ways_ids_with_membership.sql_query()}) m
+                ON w.id = m.id AND m.{membership_column}
+                """
+            )
+            for membership_column in ("is_filtered", "is_required")
         )
+        return filtered_ways_with_linestrings, required_ways_with_linestrings
 
     def _get_ways_with_linestrings(
         self,
         ways_ids: "duckdb.DuckDBPyRelation",
-        mode: Literal["filtered", "required"],
         osm_parquet_files: ConvertedOSMParquetFiles,
         destination_dir_path: Path,
         grouped_ways_tmp_path: Path,
         grouped_ways_path: Path,
     ) -> "duckdb.DuckDBPyRelation":
         finished_operation = False
+        self.internal_rows_per_group = self._estimate_ways_rows_per_group()
 
         while not finished_operation:
             reset_steps = 1
@@ -2366,7 +3753,6 @@ class PbfFileReader:
             try:
                 groups = self._group_ways(
                     ways_ids=ways_ids,
-                    mode=mode,
                     osm_parquet_files=osm_parquet_files,
                     destination_dir_path=destination_dir_path,
                     grouped_ways_tmp_path=grouped_ways_tmp_path,
@@ -2379,9 +3765,7 @@ class PbfFileReader:
 
                 self._delete_directories(grouped_ways_tmp_path)
 
-                with self.task_progress_tracker.get_bar(
-                    f"Saving {mode} ways with linestrings"
-                ) as bar:
+                with self.task_progress_tracker.get_bar("Saving ways with linestrings") as bar:
                     self._construct_ways_linestrings(
                         bar=bar,
                         groups=groups,
@@ -2419,6 +3803,29 @@ class PbfFileReader:
         )
         return ways_parquet
 
+    def _estimate_ways_rows_per_group(self) -> int:
+        """Estimate rows per group from the unnested ways refs metadata and available memory."""
+        number_of_refs = count_parquet_rows(
+            (self.tmp_dir_path / "ways_with_unnested_nodes_refs").glob("**/*.parquet")
+        )
+        if not self._decoded_ways_count or not number_of_refs:
+            return self.internal_rows_per_group
+
+        # Memory budget is shared by all groups constructed in parallel
+        rows_per_group = estimate_rows_per_group(
+            average_refs_per_way=number_of_refs / self._decoded_ways_count,
+            available_memory=psutil.virtual_memory().available,
+            min_rows_per_group=PbfFileReader.ROWS_PER_GROUP_MEMORY_CONFIG[0],
+            max_rows_per_group=self.internal_rows_per_group,
+            number_of_workers=self._get_max_linestrings_workers(),
+        )
+        if self.debug_memory:
+            log_message(
+                f"Estimated rows per group: {rows_per_group}"
+                f" (average refs per way: {number_of_refs / self._decoded_ways_count:.2f})."
+            )
+        return rows_per_group
+
     def _group_ways(
         self,
         ways_ids: "duckdb.DuckDBPyRelation",
@@ -2426,7 +3833,6 @@ class PbfFileReader:
         destination_dir_path: Path,
         grouped_ways_tmp_path: Path,
         grouped_ways_path: Path,
-        mode: Literal["filtered", "required"],
         group_all_at_once: bool = True,
     ) -> int:
         total_required_ways = ways_ids.count("id").fetchone()[0]
@@ -2446,7 +3852,7 @@ class PbfFileReader:
         grouped_ways_ids_with_points_path = grouped_ways_tmp_path / "ids_with_points"
 
         with self.task_progress_tracker.get_spinner(
-            f"Grouping {mode} ways - assigning groups", with_minor_step=True
+            "Grouping ways - assigning groups", with_minor_step=True
         ):
             ways_ids_grouped_relation = self.connection.sql(
                 f"""
@@ -2461,21 +3867,36 @@ class PbfFileReader:
                 relation=ways_ids_grouped_relation, file_path=grouped_ways_ids_with_group_path
             )
 
-        if group_all_at_once:
+        nodes_locations = self._get_nodes_locations(osm_parquet_files.nodes_valid_with_tags)
+        if self.nodes_locations_index:
+            with self.task_progress_tracker.get_spinner(
+                "Grouping ways - joining with nodes", next_step="minor"
+            ):
+                ways_with_nodes_points_relation_parquet = (
+                    self._join_ways_with_nodes_locations_index(
+                        ways_ids_grouped=ways_ids_grouped_relation_parquet,
+                        osm_parquet_files=osm_parquet_files,
+                        destination_path=grouped_ways_ids_with_points_path,
+                    )
+                )
+        elif group_all_at_once:
             with self.task_progress_tracker.get_spinner(
-                f"Grouping {mode} ways - joining with nodes", next_step="minor"
+                "Grouping ways - joining with nodes", next_step="minor"
             ):
                 ways_with_nodes_points_relation = self.connection.sql(
                     f"""
                     SELECT
                         w.id,
-                        struct_pack(x := round(n.lon, 7), y := round(n.lat, 7))::POINT_2D point,
+                        struct_pack(
+                            x := n.lon / {NODES_COORDINATES_SCALE},
+                            y := n.lat / {NODES_COORDINATES_SCALE}
+                        )::POINT_2D point,
                         w.ref_idx,
                         rw."group"
                     FROM ({ways_ids_grouped_relation_parquet.sql_query()}) rw
                     JOIN ({osm_parquet_files.ways_with_unnested_nodes_refs.sql_query()}) w
                     ON rw.id = w.id
-                    JOIN ({osm_parquet_files.nodes_valid_with_tags.sql_query()}) n
+                    JOIN ({nodes_locations.sql_query()}) n
                     ON w.ref = n.id
                     """
                 )
@@ -2493,7 +3914,7 @@ class PbfFileReader:
                 (self.tmp_dir_path / "ways_with_unnested_nodes_refs").glob("**/*.parquet")
             )
             with self.task_progress_tracker.get_bar(
-                f"Grouping {mode} ways - joining with nodes", next_step="minor"
+                "Grouping ways - joining with nodes", next_step="minor"
             ) as bar:
                 for current_step, (
                     ways_ids_grouped_parquet_file,
@@ -2515,13 +3936,16 @@ class PbfFileReader:
                         f"""
                         SELECT
                             w.id,
-                            struct_pack(x := round(n.lon, 7), y := round(n.lat, 7))::POINT_2D point,
+                            struct_pack(
+                                x := n.lon / {NODES_COORDINATES_SCALE},
+                                y := n.lat / {NODES_COORDINATES_SCALE}
+                            )::POINT_2D point,
                             w.ref_idx,
                             rw."group"
                         FROM read_parquet('{ways_ids_grouped_parquet_file}') rw
                         JOIN read_parquet('{ways_with_unnested_nodes_refs_parquet_file}') w
                         ON rw.id = w.id
-                        JOIN ({osm_parquet_files.nodes_valid_with_tags.sql_query()}) n
+                        JOIN ({nodes_locations.sql_query()}) n
                         ON w.ref = n.id
                         """
                     )
@@ -2540,7 +3964,7 @@ class PbfFileReader:
             )
 
         with self.task_progress_tracker.get_spinner(
-            f"Grouping {mode} ways - partitioning by group", next_step="minor"
+            "Grouping ways - partitioning by group", next_step="minor"
         ):
             self._run_query(
                 f"""
@@ -2566,6 +3990,79 @@ class PbfFileReader:
 
         return groups
 
+    def _join_ways_with_nodes_locations_index(
+        self,
+        ways_ids_grouped: "duckdb.DuckDBPyRelation",
+        osm_parquet_files: ConvertedOSMParquetFiles,
+        destination_path: Path,
+    ) -> "duckdb.DuckDBPyRelation":
+        if self._nodes_locations_index is None:
+            self._nodes_locations_index = NodesLocationsIndex.build(
+                nodes_locations_files=sorted(
+                    (self.tmp_dir_path / "nodes_locations").glob("**/*.parquet")
+                ),
+                index_dir_path=self.tmp_dir_path / "nodes_locations_index",
+            )
+
+        ways_refs = self.connection.sql(
+            f"""
+            SELECT w.id, w.ref, w.ref_idx, rw."group"
+            FROM ({ways_ids_grouped.sql_query()}) rw
+            JOIN ({osm_parquet_files.ways_with_unnested_nodes_refs.sql_query()}) w
+            ON rw.id = w.id
+            """
+        )
+        destination_path.mkdir(parents=True, exist_ok=True)
+        result_file_path = destination_path / "ways_with_points.parquet"
+        point_type = pa.struct([("x", pa.float64()), ("y", pa.float64())])
+
+        writer = None
+        try:
+            for batch in ways_refs.fetch_arrow_reader(batch_size=1_000_000):
+                is_found, coordinates = self._nodes_locations_index.lookup(
+                    batch.column("ref").to_numpy()
+                )
+                found_batch = batch.filter(pa.array(is_found))
+                points = pa.StructArray.from_arrays(
+                    [
+                        pa.array(coordinates[:, 0] / NODES_COORDINATES_SCALE),
+                        pa.array(coordinates[:, 1] / NODES_COORDINATES_SCALE),
+                    ],
+                    fields=list(point_type),
+                )
+                table = pa.table(
+                    {
+                        "id": found_batch.column("id"),
+                        "point": points,
+                        "ref_idx": found_batch.column("ref_idx"),
+                        "group": found_batch.column("group"),
+                    }
+                )
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        result_file_path,
+                        table.schema,
+                        compression=self.internal_parquet_compression,
+                    )
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            self.connection.sql(
+                """
+                SELECT
+                    NULL::BIGINT id,
+                    NULL::STRUCT(x DOUBLE, y DOUBLE) point,
+                    NULL::BIGINT ref_idx,
+                    NULL::INTEGER "group"
+                WHERE 1=0
+                """
+            ).to_parquet(str(result_file_path))
+
+        return self.connection.sql(f"SELECT * FROM read_parquet('{destination_path}/*.parquet')")
+
     def _construct_ways_linestrings(
         self,
         bar: TaskProgressBar,
@@ -2573,41 +4070,130 @@ class PbfFileReader:
         destination_dir_path: Path,
         grouped_ways_path: Path,
     ) -> None:
-        for group in bar.track(range(groups + 1)):
+        groups_range = range(groups + 1)
+        number_of_workers, worker_memory_limit = self._get_linestrings_workers_configuration(
+            [grouped_ways_path / f"group={group}" for group in groups_range]
+        )
+
+        if number_of_workers > 1:
+            self._construct_ways_linestrings_in_pool(
+                bar=bar,
+                groups=groups_range,
+                destination_dir_path=destination_dir_path,
+                grouped_ways_path=grouped_ways_path,
+                number_of_workers=number_of_workers,
+                worker_memory_limit=worker_memory_limit,
+            )
+            return
+
+        for group in bar.track(groups_range):
             current_ways_group_path = grouped_ways_path / f"group={group}"
             current_destination_path = destination_dir_path / f"group={group}"
             current_destination_path.mkdir(parents=True, exist_ok=True)
 
-            self._run_query(
-                f"""
-                COPY (
-                    SELECT id, list(point ORDER BY ref_idx ASC) AS linestring
-                    FROM read_parquet('{current_ways_group_path}/*.parquet')
-                    GROUP BY id
-                ) TO '{current_destination_path}' (
-                    FORMAT 'parquet',
-                    {PbfFileReader.parquet_version_query}
-                    OVERWRITE true,
-                    PER_THREAD_OUTPUT true,
-                    ROW_GROUP_SIZE 25000,
-                    COMPRESSION '{self.internal_parquet_compression}'
+            if self.way_assembly_engine == "numpy":
+                _assemble_ways_group_linestrings(
+                    ways_group_path=current_ways_group_path,
+                    destination_path=current_destination_path,
+                    compression=self.internal_parquet_compression,
+                )
+            else:
+                self._run_query(
+                    _generate_ways_linestrings_query(
+                        ways_group_path=current_ways_group_path,
+                        destination_path=current_destination_path,
+                        compression=self.internal_parquet_compression,
+                    ),
+                    run_in_separate_process=(
+                        self.internal_rows_per_group > PbfFileReader.ROWS_PER_GROUP_MEMORY_CONFIG[0]
+                    ),
                 )
-                """,
-                run_in_separate_process=(
-                    self.internal_rows_per_group > PbfFileReader.ROWS_PER_GROUP_MEMORY_CONFIG[0]
-                ),
-            )
 
             if self.debug_memory:
                 log_message(f"Saved to directory: {current_destination_path}")
 
             self._delete_directories(current_ways_group_path)
 
+    def _get_max_linestrings_workers(self) -> int:
+        return max(1, min(self.cpu_limit, multiprocessing.cpu_count()))
+
+    def _get_linestrings_workers_configuration(
+        self, ways_groups_paths: list[Path]
+    ) -> tuple[int, int]:
+        # Each grouped row is a single way point, groups (except the last one)
+        # have the same number of ways
+        groups_memory = []
+        for group_path in ways_groups_paths:
+            number_of_refs = count_parquet_rows(group_path.glob("*.parquet"))
+            number_of_ways = min(self.internal_rows_per_group, number_of_refs)
+            groups_memory.append(
+                estimate_group_memory(
+                    rows_per_group=number_of_ways,
+                    average_refs_per_way=number_of_refs / number_of_ways if number_of_ways else 0,
+                )
+            )
+
+        available_memory = psutil.virtual_memory().available
+        number_of_workers = estimate_number_of_workers(
+            groups_memory=groups_memory,
+            available_memory=available_memory,
+            max_number_of_workers=min(self._get_max_linestrings_workers(), len(ways_groups_paths)),
+        )
+        return number_of_workers, max(
+            get_memory_budget(available_memory) // number_of_workers,
+            LINESTRINGS_WORKER_MIN_MEMORY,
+        )
+
+    def _construct_ways_linestrings_in_pool(
+        self,
+        bar: TaskProgressBar,
+        groups: range,
+        destination_dir_path: Path,
+        grouped_ways_path: Path,
+        number_of_workers: int,
+        worker_memory_limit: int,
+    ) -> None:
+        bar.create_manual_bar(total=len(groups))
+        actual_memory = psutil.virtual_memory()
+        percentage_threshold = 95
+        if (actual_memory.total * 0.05) > MEMORY_1GB:
+            percentage_threshold = 100 * (actual_memory.total - MEMORY_1GB) / actual_memory.total
+
+        with multiprocessing.get_context("spawn").Pool(processes=number_of_workers) as pool:
+            finished_groups = pool.imap_unordered(
+                partial(
+                    _construct_ways_group_linestrings,
+                    grouped_ways_path=grouped_ways_path,
+                    destination_dir_path=destination_dir_path,
+                    tmp_dir_path=self.tmp_dir_path,
+                    compression=self.internal_parquet_compression,
+                    memory_limit_mb=worker_memory_limit // 1024**2,
+                    threads_limit=max(1, self.cpu_limit // number_of_workers),
+                    way_assembly_engine=self.way_assembly_engine,
+                ),
+                groups,
+            )
+            for finished_groups_count in range(1, len(groups) + 1):
+                while True:
+                    try:
+                        group = finished_groups.next(timeout=0.5)
+                        break
+                    except multiprocessing.TimeoutError:
+                        if psutil.virtual_memory().percent > percentage_threshold:
+                            raise MemoryError() from None
+
+                # Finished groups are already saved, so their inputs can be removed
+                # while other groups are still processed
+                if self.debug_memory:
+                    log_message(f"Saved to directory: {destination_dir_path / f'group={group}'}")
+                self._delete_directories(grouped_ways_path / f"group={group}")
+                bar.update_manual_bar(finished_groups_count)
+
     def _get_filtered_ways_with_proper_geometry(
         self,
         osm_parquet_files: ConvertedOSMParquetFiles,
         required_ways_with_linestrings: "duckdb.DuckDBPyRelation",
-    ) -> "duckdb.DuckDBPyRelation":
+    ) -> Path:
         osm_way_polygon_features_filter_clauses = [
             "list_contains(map_keys(raw_tags), 'area') AND "
             "list_extract(map_extract(raw_tags, 'area'), 1) = 'yes'"
@@ -2636,6 +4222,44 @@ class PbfFileReader:
                 f" list_has_any(map_extract(raw_tags, '{osm_tag_key}'), [{escaped_values}])"
             )
 
+        result_path = self.tmp_dir_path / "filtered_ways_with_geometry"
+        if self.way_assembly_engine == "numpy":
+            with self.task_progress_tracker.get_spinner(
+                "Saving filtered ways with geometries - building geometries",
+                with_minor_step=True,
+            ):
+                ways_with_proper_geometry = self._build_ways_geometries_with_numpy(
+                    filtered_ways_with_polygon_candidates=self.connection.sql(
+                        f"""
+                        SELECT
+                            w.id,
+                            w.tags,
+                            w_l.linestring,
+                            (
+                                raw_tags IS NOT NULL
+                                AND NOT (
+                                    list_contains(map_keys(raw_tags), 'area')
+                                    AND list_extract(map_extract(raw_tags, 'area'), 1) = 'no'
+                                )
+                                AND ({" OR ".join(osm_way_polygon_features_filter_clauses)})
+                            ) AS is_polygon_candidate
+                        FROM ({required_ways_with_linestrings.sql_query()}) w_l
+                        SEMI JOIN ({osm_parquet_files.ways_filtered_ids.sql_query()}) fw
+                        ON w_l.id = fw.id
+                        JOIN ({osm_parquet_files.ways_all_with_tags.sql_query()}) w
+                        ON w.id = w_l.id
+                        """
+                    ),
+                    destination_path=self.tmp_dir_path / "filtered_ways_with_wkb_geometry",
+                )
+            self._save_parquet_file_with_geometry(
+                relation=ways_with_proper_geometry,
+                file_path=result_path,
+                step_name="Saving filtered ways with geometries - validating geometries",
+                next_step="minor",
+            )
+            return result_path
+
         ways_with_proper_geometry = self.connection.sql(
             f"""
             WITH required_ways_with_linestrings AS (
@@ -2680,7 +4304,6 @@ class PbfFileReader:
             SELECT 'way/' || id as feature_id, tags, geometry FROM proper_geometries
             """
         )
-        result_path = self.tmp_dir_path / "filtered_ways_with_geometry"
         self._save_parquet_file_with_geometry(
             relation=ways_with_proper_geometry,
             file_path=result_path,
@@ -2688,6 +4311,49 @@ class PbfFileReader:
         )
         return result_path
 
+    def _build_ways_geometries_with_numpy(
+        self,
+        filtered_ways_with_polygon_candidates: "duckdb.DuckDBPyRelation",
+        destination_path: Path,
+    ) -> "duckdb.DuckDBPyRelation":
+        destination_path.mkdir(parents=True, exist_ok=True)
+        result_file_path = destination_path / "ways_with_geometry.parquet"
+
+        ways_reader = filtered_ways_with_polygon_candidates.fetch_arrow_reader(batch_size=1_000_000)
+        result_schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ways_reader.schema.field("tags"),
+                ("geometry", pa.large_binary()),
+            ]
+        )
+        with pq.ParquetWriter(
+            result_file_path, result_schema, compression=self.internal_parquet_compression
+        ) as writer:
+            for batch in ways_reader:
+                geometries, _ = build_ways_geometries(
+                    linestrings=batch.column("linestring"),
+                    is_polygon_candidate=pc.fill_null(
+                        batch.column("is_polygon_candidate"), False
+                    ).to_numpy(zero_copy_only=False),
+                )
+                writer.write_table(
+                    pa.table(
+                        [batch.column("id").cast(pa.int64()), batch.column("tags"), geometries],
+                        schema=result_schema,
+                    )
+                )
+
+        if self.debug_memory:
+            log_message(f"Saved to directory: {destination_path}")
+
+        return self.connection.sql(
+            f"""
+            SELECT 'way/' || id as feature_id, tags, ST_GeomFromWKB(geometry) AS geometry
+            FROM read_parquet('{result_file_path}')
+            """
+        )
+
     def _get_filtered_relations_with_geometry(
         self,
         osm_parquet_files: ConvertedOSMParquetFiles,
@@ -2875,6 +4541,7 @@ class PbfFileReader:
             Path to parquet file with node-only relation geometries.
         """
         # Get node geometries for node-only relations
+        nodes_locations = self._get_nodes_locations(osm_parquet_files.nodes_valid_with_tags)
         node_only_relations_with_geometry = self.connection.sql(
             f"""
             WITH relation_node_refs AS (
@@ -2888,9 +4555,11 @@ class PbfFileReader:
             relation_nodes_with_geom AS (
                 SELECT
                     rnr.relation_id,
-                    ST_Point(round(n.lon, 7), round(n.lat, 7)) as geometry
+                    ST_Point(
+                        n.lon / {NODES_COORDINATES_SCALE}, n.lat / {NODES_COORDINATES_SCALE}
+                    ) as geometry
                 FROM relation_node_refs rnr
-                JOIN ({osm_parquet_files.nodes_valid_with_tags.sql_query()}) n
+                JOIN ({nodes_locations.sql_query()}) n
                 ON n.id = rnr.node_id
             ),
             relation_multipoint_geometries AS (
@@ -3774,6 +5443,136 @@ def _run_query(
     db_file_path.unlink(missing_ok=True)
 
 
+def _generate_pbf_decoding_query(
+    pbf_path: Union[str, Path],
+    decoded_path: Path,
+    compression: str,
+    filename_pattern: Optional[str] = None,
+) -> str:
+    overwrite_clause = (
+        f"OVERWRITE_OR_IGNORE true, FILENAME_PATTERN '{filename_pattern}',"
+        if filename_pattern
+        else "OVERWRITE true,"
+    )
+    return f"""
+    COPY (
+        SELECT
+            kind::VARCHAR AS kind,
+            id,
+            tags,
+            refs,
+            ref_roles,
+            ref_types::VARCHAR[] AS ref_types,
+            lon,
+            lat
+        FROM ST_READOSM('{Path(pbf_path)}')
+        WHERE kind IN ('node', 'way', 'relation')
+    ) TO '{decoded_path}' (
+        FORMAT 'parquet',
+        {PbfFileReader.parquet_version_query}
+        {overwrite_clause}
+        PARTITION_BY (kind),
+        ROW_GROUP_SIZE_BYTES '16MB',
+        COMPRESSION '{compression}'
+    )
+    """
+
+
+def _generate_ways_linestrings_query(
+    ways_group_path: Path, destination_path: Path, compression: str
+) -> str:
+    return f"""
+    COPY (
+        SELECT id, list(point ORDER BY ref_idx ASC) AS linestring
+        FROM read_parquet('{ways_group_path}/*.parquet')
+        GROUP BY id
+    ) TO '{destination_path}' (
+        FORMAT 'parquet',
+        {PbfFileReader.parquet_version_query}
+        OVERWRITE true,
+        PER_THREAD_OUTPUT true,
+        ROW_GROUP_SIZE 25000,
+        COMPRESSION '{compression}'
+    )
+    """
+
+
+def _assemble_ways_group_linestrings(
+    ways_group_path: Path, destination_path: Path, compression: str
+) -> None:
+    ways_points = pq.read_table(ways_group_path, columns=["id", "point", "ref_idx"])
+    pq.write_table(
+        assemble_ways_linestrings(ways_points),
+        destination_path / "data_0.parquet",
+        row_group_size=25000,
+        compression=compression,
+    )
+
+
+def _construct_ways_group_linestrings(
+    group: int,
+    grouped_ways_path: Path,
+    destination_dir_path: Path,
+    tmp_dir_path: Path,
+    compression: str,
+    memory_limit_mb: int,
+    threads_limit: Optional[int] = None,
+    way_assembly_engine: WAY_ASSEMBLY_ENGINE = "duckdb",
+) -> int:  # pragma: no cover
+    destination_path = destination_dir_path / f"group={group}"
+    destination_path.mkdir(parents=True, exist_ok=True)
+    if way_assembly_engine == "numpy":
+        _assemble_ways_group_linestrings(
+            ways_group_path=grouped_ways_path / f"group={group}",
+            destination_path=destination_path,
+            compression=compression,
+        )
+        return group
+
+    _run_query(
+        [
+            f"SET memory_limit = '{memory_limit_mb}MB';",
+            _generate_ways_linestrings_query(
+                ways_group_path=grouped_ways_path / f"group={group}",
+                destination_path=destination_path,
+                compression=compression,
+            ),
+        ],
+        tmp_dir_path=tmp_dir_path,
+        threads_limit=threads_limit,
+    )
+    return group
+
+
+def _decode_pbf_chunk(
+    chunk: tuple[int, list[PbfBlob]],
+    pbf_path: Union[str, Path],
+    blobs: list[PbfBlob],
+    tmp_dir_path: Path,
+    decoded_path: Path,
+    compression: str,
+    threads_limit: Optional[int] = None,
+) -> None:  # pragma: no cover
+    chunk_index, data_blobs = chunk
+    chunk_path = write_pbf_chunk(
+        pbf_path=pbf_path,
+        blobs=blobs,
+        data_blobs=data_blobs,
+        destination_path=tmp_dir_path / "pbf_chunks" / f"{chunk_index}.osm.pbf",
+    )
+    _run_query(
+        _generate_pbf_decoding_query(
+            pbf_path=chunk_path,
+            decoded_path=decoded_path,
+            compression=compression,
+            filename_pattern=f"chunk_{chunk_index}_{{i}}",
+        ),
+        tmp_dir_path=tmp_dir_path,
+        threads_limit=threads_limit,
+    )
+    chunk_path.unlink()
+
+
 def _run_in_multiprocessing_pool(function: Callable[..., None], args: Any) -> None:
     try:
         with multiprocessing.get_context("spawn").Pool() as pool:
@@ -3825,6 +5624,34 @@ def _drop_duplicates_in_pyarrow_table(
     pq.write_table(joined_parquet_table, output_file_name)
 
 
+def _copy_parquet_dataset(source_path: Path, destination_path: Path) -> None:
+    """
+    Copy parquet dataset directory using hard links where possible.
+
+    Destination directory is created atomically, so interrupted copies are never visible.
+    """
+    if destination_path.exists():
+        shutil.rmtree(destination_path)
+
+    destination_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_destination_path = destination_path.with_name(
+        f"{destination_path.name}_{secrets.token_hex(4)}.tmp"
+    )
+
+    def _link_or_copy(src: str, dst: str) -> None:
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    shutil.copytree(source_path, tmp_destination_path, copy_function=_link_or_copy)
+    try:
+        tmp_destination_path.rename(destination_path)
+    except OSError:
+        # Other process already saved the same dataset
+        shutil.rmtree(tmp_destination_path, ignore_errors=True)
+
+
 def _is_url_path(path: Union[str, Path]) -> bool:
     # schemes known to pooch library
     known_schemes = {"ftp", "https", "http", "sftp", "doi"}
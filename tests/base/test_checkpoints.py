@@ -0,0 +1,68 @@
+"""Tests for conversion stages checkpoints."""
+
+from pathlib import Path
+
+from quackosm._checkpoints import RunCheckpoint
+
+
+def test_completed_stages_are_saved(tmp_path: Path) -> None:
+    """Test if completed stages and their outputs are read back from the run directory."""
+    run_checkpoint = RunCheckpoint(tmp_path)
+    assert run_checkpoint.get_stale_paths(fingerprint="abc") == []
+    run_checkpoint.complete("first_stage", {"path": "first"})
+    run_checkpoint.complete("second_stage", {"path": "second"})
+
+    reopened_checkpoint = RunCheckpoint(tmp_path)
+
+    assert reopened_checkpoint.is_completed("first_stage")
+    assert reopened_checkpoint.is_completed("second_stage")
+    assert not reopened_checkpoint.is_completed("third_stage")
+    assert reopened_checkpoint.last_completed_stage == "second_stage"
+    assert reopened_checkpoint.get_outputs("first_stage") == {"path": "first"}
+
+
+def test_directories_of_interrupted_stage_are_stale(tmp_path: Path) -> None:
+    """Test if only directories created after the last completed stage are stale."""
+    run_checkpoint = RunCheckpoint(tmp_path)
+    run_checkpoint.get_stale_paths(fingerprint="abc")
+    (tmp_path / "completed").mkdir()
+    run_checkpoint.complete("first_stage", {})
+    (tmp_path / "interrupted").mkdir()
+    (tmp_path / "db.duckdb.tmp").mkdir()
+
+    stale_paths = RunCheckpoint(tmp_path).get_stale_paths(fingerprint="abc")
+
+    assert stale_paths == [tmp_path / "interrupted"]
+
+
+def test_checkpoint_is_reset_for_different_fingerprint(tmp_path: Path) -> None:
+    """Test if all stages are discarded when the input file changes."""
+    run_checkpoint = RunCheckpoint(tmp_path)
+    run_checkpoint.get_stale_paths(fingerprint="abc")
+    (tmp_path / "completed").mkdir()
+    run_checkpoint.complete("first_stage", {})
+
+    reopened_checkpoint = RunCheckpoint(tmp_path)
+    stale_paths = reopened_checkpoint.get_stale_paths(fingerprint="def")
+
+    assert stale_paths == [tmp_path / "completed"]
+    assert reopened_checkpoint.last_completed_stage is None
+    assert not reopened_checkpoint.is_completed("first_stage")
+
+
+def test_deleted_datasets_are_recorded(tmp_path: Path) -> None:
+    """Test if datasets deleted on purpose are saved until they are created again."""
+    run_checkpoint = RunCheckpoint(tmp_path)
+    run_checkpoint.get_stale_paths(fingerprint="abc")
+    run_checkpoint.mark_deleted([tmp_path / "first", tmp_path / "first" / "nested", tmp_path])
+    run_checkpoint.mark_deleted([tmp_path / "second"])
+
+    reopened_checkpoint = RunCheckpoint(tmp_path)
+    assert reopened_checkpoint.get_deleted_paths() == [tmp_path / "first", tmp_path / "second"]
+
+    (tmp_path / "second").mkdir()
+    reopened_checkpoint.complete("first_stage", {})
+
+    assert RunCheckpoint(tmp_path).get_deleted_paths() == [tmp_path / "first"]
+    assert reopened_checkpoint.get_stale_paths(fingerprint="def") == [tmp_path / "second"]
+    assert reopened_checkpoint.get_deleted_paths() == []
@@ -128,6 +128,41 @@ def test_transient_mode(monaco_pbf_file_path_fixture: str) -> None:
     ["--ignore-metadata-tags"],
     "files/monaco_nofilter_noclip_compact_sorted.parquet",
 )  # type: ignore
+@P.case(
+    "Cache decoded PBF",
+    ["--cache-decoded-pbf"],
+    "files/monaco_nofilter_noclip_compact_sorted.parquet",
+)  # type: ignore
+@P.case(
+    "Parallel PBF decoding",
+    ["--parallel-pbf-decoding"],
+    "files/monaco_nofilter_noclip_compact_sorted.parquet",
+)  # type: ignore
+@P.case(
+    "Nodes locations index",
+    ["--nodes-locations-index"],
+    "files/monaco_nofilter_noclip_compact_sorted.parquet",
+)  # type: ignore
+@P.case(
+    "DuckDB intersection engine",
+    ["--intersection-engine", "duckdb"],
+    "files/monaco_nofilter_noclip_compact_sorted.parquet",
+)  # type: ignore
+@P.case(
+    "Cache geometry intersection",
+    ["--cache-geometry-intersection"],
+    "files/monaco_nofilter_noclip_compact_sorted.parquet",
+)  # type: ignore
+@P.case(
+    "Numpy way assembly engine",
+    ["--way-assembly-engine", "numpy"],
+    "files/monaco_nofilter_noclip_compact_sorted.parquet",
+)  # type: ignore
+@P.case(
+    "Checkpoint stages",
+    ["--checkpoint-stages"],
+    "files/monaco_nofilter_noclip_compact_sorted.parquet",
+)  # type: ignore
 @P.case(
     "Output with working directory",
     ["--working-directory", "files/workdir", "-o", "files/monaco_output.parquet"],
@@ -5,11 +5,27 @@ from pathlib import Path
 
 import duckdb
 import geoarrow.pyarrow as ga
+import numpy as np
 import pyarrow as pa
 import pyarrow.parquet as pq
+import shapely
+from shapely import GeometryCollection, Point, Polygon
 
 from quackosm import geocode_to_geometry
-from quackosm._intersection import intersect_nodes_with_geometry
+from quackosm._intersection import (
+    GRID_CELL_BOUNDARY,
+    GRID_CELL_INSIDE,
+    GRID_CELL_OUTSIDE,
+    POLYGON_SET_MIN_PARTS,
+    _intersect_nodes,
+    classify_ways_bboxes_with_geometry,
+    intersect_lines_with_geometry,
+    intersect_nodes_with_geometry,
+    is_polygon_set,
+    load_geometry_filter_grid,
+    merge_geometries,
+)
+from quackosm._parquet_multiprocessing import read_arrow_dataset
 
 
 def test_nodes_intersection() -> None:
@@ -59,3 +75,196 @@ def test_nodes_intersection() -> None:
         ).read()
 
         assert set(intersecting_points["id"]) == set(intersecting_ids_array)
+
+
+def test_nodes_intersection_on_geometry_boundary() -> None:
+    """Test if points on the geometry boundary and outside of its bbox are handled."""
+    geometry_filter = Polygon([(0, 0), (2, 0), (2, 2), (1, 1), (0, 2)])
+    table = pa.table(
+        {
+            "id": pa.array(range(7), type=pa.int64()),
+            "lon": [0.5, 0.0, 1.0, 1.0, 1.5, 3.0, -1.0],
+            "lat": [0.5, 1.0, 1.0, 1.5, 1.9, 1.0, -1.0],
+        }
+    )
+
+    result = _intersect_nodes(table, geometry_filter)
+
+    assert result["id"].to_pylist() == [0, 1, 2]
+
+
+def test_nodes_intersection_with_geometry_filter_grid(tmp_path: Path) -> None:
+    """Test if classifying nodes with the grid gives the same result as exact intersection."""
+    rng = np.random.default_rng(42)
+    angles = np.linspace(0, 2 * np.pi, 5000, endpoint=False)
+    radius = 1 + 0.3 * np.sin(angles * 20) + rng.uniform(-0.01, 0.01, len(angles))
+    geometry_filter = Polygon(np.column_stack((radius * np.cos(angles), radius * np.sin(angles))))
+    table = pa.table(
+        {
+            "id": np.arange(100_000, dtype=np.int64),
+            "lon": rng.uniform(-1.5, 1.5, 100_000),
+            "lat": rng.uniform(-1.5, 1.5, 100_000),
+        }
+    )
+
+    cache_path = tmp_path / "grid.npz"
+    grid = load_geometry_filter_grid(geometry_filter, cache_path=cache_path)
+    cached_grid = load_geometry_filter_grid(geometry_filter, cache_path=cache_path)
+
+    assert cache_path.exists()
+    assert cached_grid.bounds == grid.bounds
+    assert np.array_equal(cached_grid.cells, grid.cells)
+    assert set(np.unique(grid.cells).tolist()) == {
+        GRID_CELL_OUTSIDE,
+        GRID_CELL_INSIDE,
+        GRID_CELL_BOUNDARY,
+    }
+    assert _intersect_nodes(table, geometry_filter, cached_grid).equals(
+        _intersect_nodes(table, geometry_filter)
+    )
+
+
+def test_polygon_set_nodes_intersection() -> None:
+    """Test if intersecting nodes with a polygon set gives the same result as with the union."""
+    rng = np.random.default_rng(42)
+    parts = shapely.buffer(
+        shapely.points(rng.uniform(-1, 1, (POLYGON_SET_MIN_PARTS, 2))),
+        rng.uniform(0.01, 0.2, POLYGON_SET_MIN_PARTS),
+    )
+    polygon_set = merge_geometries(parts)
+    union = merge_geometries(parts[: POLYGON_SET_MIN_PARTS - 1])
+    table = pa.table(
+        {
+            "id": np.arange(100_000, dtype=np.int64),
+            "lon": rng.uniform(-1.5, 1.5, 100_000),
+            "lat": rng.uniform(-1.5, 1.5, 100_000),
+        }
+    )
+
+    assert is_polygon_set(polygon_set)
+    assert not is_polygon_set(union)
+    assert _intersect_nodes(table, polygon_set, load_geometry_filter_grid(polygon_set)).equals(
+        _intersect_nodes(table, shapely.union_all(parts))
+    )
+
+
+def test_polygon_set_parts_types() -> None:
+    """Test if only collections of polygonal parts are treated as polygon sets."""
+    polygon = Point(0, 0).buffer(1)
+
+    assert is_polygon_set(GeometryCollection([polygon, polygon.buffer(1).difference(polygon)]))
+    assert not is_polygon_set(GeometryCollection([polygon, Point(5, 5)]))
+    assert not is_polygon_set(GeometryCollection([polygon, polygon.exterior]))
+    assert not is_polygon_set(polygon)
+
+
+def test_polygon_set_lines_intersection(tmp_path: Path) -> None:
+    """Test if intersecting lines with a polygon set gives the same result as with the union."""
+    rng = np.random.default_rng(42)
+    parts = shapely.buffer(
+        shapely.points(rng.uniform(-1, 1, (POLYGON_SET_MIN_PARTS, 2))),
+        rng.uniform(0.01, 0.2, POLYGON_SET_MIN_PARTS),
+    )
+    polygon_set = merge_geometries(parts)
+    lines_start = rng.uniform(-1.5, 1.5, (10_000, 2))
+    lines = shapely.linestrings(
+        np.stack((lines_start, lines_start + rng.normal(0, 0.1, (10_000, 2))), axis=1)
+    )
+    lines_table = pa.table({"id": np.arange(10_000, dtype=np.int64), "wkb": shapely.to_wkb(lines)})
+
+    for geometry_filter, destination_name in (
+        (polygon_set, "polygon_set"),
+        (shapely.union_all(parts), "union"),
+    ):
+        intersect_lines_with_geometry(
+            lines_reader=pa.RecordBatchReader.from_batches(
+                lines_table.schema, lines_table.to_batches(max_chunksize=1_000)
+            ),
+            destination_path=tmp_path / destination_name,
+            geometry_filter=geometry_filter,
+        )
+
+    polygon_set_ids = pq.read_table(tmp_path / "polygon_set")["id"].to_numpy()
+    union_ids = pq.read_table(tmp_path / "union")["id"].to_numpy()
+
+    assert len(polygon_set_ids) > 0
+    assert polygon_set_ids.tolist() == union_ids.tolist()
+
+
+def test_ways_bboxes_classification(tmp_path: Path) -> None:
+    """Test if ways bounding boxes are classified consistently with exact geometry."""
+    rng = np.random.default_rng(42)
+    angles = np.linspace(0, 2 * np.pi, 5000, endpoint=False)
+    radius = 1 + 0.3 * np.sin(angles * 20) + rng.uniform(-0.01, 0.01, len(angles))
+    geometry_filter = Polygon(np.column_stack((radius * np.cos(angles), radius * np.sin(angles))))
+    min_lon = rng.uniform(-2, 2, 10_000)
+    min_lat = rng.uniform(-2, 2, 10_000)
+    max_lon = min_lon + rng.exponential(0.05, 10_000)
+    max_lat = min_lat + rng.exponential(0.05, 10_000)
+
+    dataset_path = tmp_path / "ways_bboxes"
+    dataset_path.mkdir()
+    pq.write_table(
+        pa.table(
+            {
+                "id": np.arange(10_000, dtype=np.int64),
+                "min_lon": min_lon,
+                "min_lat": min_lat,
+                "max_lon": max_lon,
+                "max_lat": max_lat,
+            }
+        ),
+        dataset_path / "data_0.parquet",
+    )
+    classify_ways_bboxes_with_geometry(
+        dataset_path=dataset_path,
+        destination_path=tmp_path / "ways_bboxes_classes",
+        geometry_filter=geometry_filter,
+    )
+    result = pq.read_table(tmp_path / "ways_bboxes_classes")
+    bboxes_classes = np.full(10_000, GRID_CELL_OUTSIDE, dtype=np.uint8)
+    bboxes_classes[result["id"].to_numpy()] = result["bbox_class"].to_numpy()
+
+    bboxes = shapely.box(min_lon, min_lat, max_lon, max_lat)
+    is_within = shapely.within(bboxes, geometry_filter)
+    is_intersecting = shapely.intersects(bboxes, geometry_filter)
+
+    assert set(np.unique(bboxes_classes).tolist()) == {
+        GRID_CELL_OUTSIDE,
+        GRID_CELL_INSIDE,
+        GRID_CELL_BOUNDARY,
+    }
+    assert is_within[bboxes_classes == GRID_CELL_INSIDE].all()
+    assert not is_intersecting[bboxes_classes == GRID_CELL_OUTSIDE].any()
+
+
+def test_nodes_intersection_arrow_results(tmp_path: Path) -> None:
+    """Test if intersecting nodes ids saved as Arrow IPC files are the same as parquet ones."""
+    rng = np.random.default_rng(42)
+    dataset_path = tmp_path / "nodes_valid_with_tags"
+    dataset_path.mkdir()
+    pq.write_table(
+        pa.table(
+            {
+                "id": np.arange(10_000, dtype=np.int64),
+                "lon": rng.uniform(-1, 1, 10_000),
+                "lat": rng.uniform(-1, 1, 10_000),
+            }
+        ),
+        dataset_path / "data.parquet",
+        row_group_size=1_000,
+    )
+    geometry_filter = Polygon([(0, 0), (1, 0), (0, 1)])
+
+    intersect_nodes_with_geometry(tmp_dir_path=tmp_path, geometry_filter=geometry_filter)
+    parquet_ids = pq.ParquetDataset(tmp_path / "nodes_intersecting_ids").read()["id"]
+    (tmp_path / "nodes_intersecting_ids").rename(tmp_path / "nodes_intersecting_ids_parquet")
+
+    intersect_nodes_with_geometry(
+        tmp_dir_path=tmp_path, geometry_filter=geometry_filter, result_format="arrow"
+    )
+    arrow_ids = read_arrow_dataset(tmp_path / "nodes_intersecting_ids")
+
+    assert arrow_ids is not None
+    assert len(parquet_ids) > 0
+    assert sorted(arrow_ids["id"].to_pylist()) == sorted(parquet_ids.to_pylist())
@@ -1,5 +1,6 @@
 """Tests for Parquet multiprocessing wrapper."""
 
+import os
 import tempfile
 from pathlib import Path
 from random import random
@@ -7,13 +8,20 @@ from time import sleep
 from typing import Any
 
 import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
 from quackosm._exceptions import MultiprocessingRuntimeError
-from quackosm._parquet_multiprocessing import map_parquet_dataset
+from quackosm._parquet_multiprocessing import ParquetWorkerPool, map_parquet_dataset
 from quackosm.pbf_file_reader import _run_in_multiprocessing_pool
 
 
+def add_worker_pid(table: pa.Table) -> pa.Table:
+    """Function for saving worker process id."""
+    return table.append_column("pid", pa.array([os.getpid()] * len(table)))
+
+
 def raise_error(pa: Any) -> Any:
     """Function for raising error."""
     sleep(random())
@@ -57,3 +65,99 @@ def test_pool_exception_wrapping() -> None:
     """Test if multiprocessing pool exception raising works."""
     with pytest.raises(MultiprocessingRuntimeError):
         _run_in_multiprocessing_pool(raise_error, (None,))
+
+
+def test_worker_pool_reuse(tmp_path: Path) -> None:
+    """Test if worker pool keeps the same processes between calls and restarts after errors."""
+    dataset_path = tmp_path / "dataset"
+    dataset_path.mkdir()
+    pq.write_table(
+        pa.table({"id": list(range(100))}), dataset_path / "data.parquet", row_group_size=10
+    )
+
+    worker_pool = ParquetWorkerPool(number_of_workers=2)
+    try:
+        workers_pids = []
+        for destination_name in ("first", "second"):
+            worker_pool.map(
+                dataset_path=dataset_path,
+                destination_path=tmp_path / destination_name,
+                function=add_worker_pid,
+            )
+            result = pq.ParquetDataset(tmp_path / destination_name).read()
+            assert sorted(result["id"].to_pylist()) == list(range(100))
+            workers_pids.append(set(result["pid"].to_pylist()))
+
+        assert workers_pids[0] == workers_pids[1]
+
+        with pytest.raises(MultiprocessingRuntimeError):
+            worker_pool.map(
+                dataset_path=dataset_path, destination_path=tmp_path / "error", function=raise_error
+            )
+
+        worker_pool.map(
+            dataset_path=dataset_path, destination_path=tmp_path / "third", function=add_worker_pid
+        )
+        result = pq.ParquetDataset(tmp_path / "third").read()
+        assert sorted(result["id"].to_pylist()) == list(range(100))
+        assert set(result["pid"].to_pylist()).isdisjoint(workers_pids[0])
+    finally:
+        worker_pool.close()
+
+
+def test_worker_pool_row_groups_slicing(tmp_path: Path) -> None:
+    """Test if row groups are split into bounded tasks and workers statistics are saved."""
+    dataset_path = tmp_path / "dataset"
+    dataset_path.mkdir()
+    pq.write_table(
+        pa.table({"id": list(range(1_000))}), dataset_path / "data.parquet", row_group_size=400
+    )
+
+    worker_pool = ParquetWorkerPool(number_of_workers=2)
+    try:
+        worker_pool.map(
+            dataset_path=dataset_path,
+            destination_path=tmp_path / "result",
+            function=add_worker_pid,
+            max_rows_per_task=150,
+        )
+    finally:
+        worker_pool.close()
+
+    result = pq.ParquetDataset(tmp_path / "result").read()
+    assert sorted(result["id"].to_pylist()) == list(range(1_000))
+    # Row groups with 400, 400 and 200 rows are split into 3, 3 and 2 tasks
+    assert sum(statistics.tasks for statistics in worker_pool.last_map_statistics) == 8
+    assert sum(statistics.rows for statistics in worker_pool.last_map_statistics) == 1_000
+    assert {statistics.pid for statistics in worker_pool.last_map_statistics} == set(
+        result["pid"].to_pylist()
+    )
+
+
+def test_worker_pool_splits_big_row_group(tmp_path: Path) -> None:
+    """Test if slices of a single big row group are spread over multiple workers."""
+    dataset_path = tmp_path / "dataset"
+    dataset_path.mkdir()
+    pq.write_table(
+        pa.table({"id": list(range(10_000))}), dataset_path / "data.parquet", row_group_size=10_000
+    )
+
+    worker_pool = ParquetWorkerPool(number_of_workers=4)
+    try:
+        worker_pool.map(
+            dataset_path=dataset_path,
+            destination_path=tmp_path / "result",
+            function=add_worker_pid,
+            max_rows_per_task=500,
+        )
+    finally:
+        worker_pool.close()
+
+    result = pq.ParquetDataset(tmp_path / "result").read()
+    assert sorted(result["id"].to_pylist()) == list(range(10_000))
+    assert len(set(result["pid"].to_pylist())) > 1
+    assert (
+        len([statistics for statistics in worker_pool.last_map_statistics if statistics.rows > 0])
+        > 1
+    )
+    assert sum(statistics.rows for statistics in worker_pool.last_map_statistics) == 10_000
@@ -0,0 +1,102 @@
+"""Tests for memory-mapped nodes locations index."""
+
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from quackosm._nodes_locations_index import NodesLocationsIndex
+from quackosm.pbf_file_reader import PbfFileReader
+
+MONACO_PBF_FILE = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+
+
+@pytest.mark.parametrize(
+    "nodes_ids",
+    [
+        np.arange(1, 1001, dtype=np.int64),
+        np.arange(1, 1001, dtype=np.int64) * 1_000_000,
+        np.array([], dtype=np.int64),
+    ],
+)  # type: ignore
+def test_nodes_locations_lookup(nodes_ids: np.ndarray, tmp_path: Path) -> None:
+    """Test if nodes locations are found in dense and sparse index."""
+    rng = np.random.default_rng(42)
+    lons = rng.integers(-1_800_000_000, 1_800_000_000, len(nodes_ids), dtype=np.int32)
+    lats = rng.integers(-900_000_000, 900_000_000, len(nodes_ids), dtype=np.int32)
+    # Extreme values and the (0, 0) location
+    lons[:2] = [-1_800_000_000, 0][: len(nodes_ids)]
+    lats[:2] = [900_000_000, 0][: len(nodes_ids)]
+
+    files = []
+    for file_idx, nodes_slice in enumerate(np.array_split(np.arange(len(nodes_ids)), 3)):
+        file_path = tmp_path / "nodes" / f"data_{2 - file_idx}.parquet"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            pa.table(
+                {
+                    "id": nodes_ids[nodes_slice],
+                    "lon": lons[nodes_slice],
+                    "lat": lats[nodes_slice],
+                }
+            ),
+            file_path,
+        )
+        files.append(file_path)
+
+    index = NodesLocationsIndex.build(files, tmp_path / "index")
+
+    missing_ids = np.array([0, -5, 3_000_000_000, 1_500_000], dtype=np.int64)
+    lookup_ids = np.concatenate([nodes_ids[::-1], missing_ids])
+    is_found, coordinates = index.lookup(lookup_ids)
+
+    assert is_found.tolist() == [True] * len(nodes_ids) + [False] * len(missing_ids)
+    assert coordinates[:, 0].tolist() == lons[::-1].tolist()
+    assert coordinates[:, 1].tolist() == lats[::-1].tolist()
+
+
+def test_nodes_locations_lookup_unsorted_files(tmp_path: Path) -> None:
+    """Test if nodes locations are found in sparse index built from unsorted files."""
+    rng = np.random.default_rng(42)
+    nodes_ids = rng.permutation(np.arange(1, 1001, dtype=np.int64) * 1_000_000)
+    lons = rng.integers(-1_800_000_000, 1_800_000_000, len(nodes_ids), dtype=np.int32)
+    lats = rng.integers(-900_000_000, 900_000_000, len(nodes_ids), dtype=np.int32)
+
+    files = []
+    for file_idx, nodes_slice in enumerate(np.array_split(np.arange(len(nodes_ids)), 3)):
+        file_path = tmp_path / "nodes" / f"data_{file_idx}.parquet"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            pa.table(
+                {
+                    "id": nodes_ids[nodes_slice],
+                    "lon": lons[nodes_slice],
+                    "lat": lats[nodes_slice],
+                }
+            ),
+            file_path,
+        )
+        files.append(file_path)
+
+    index = NodesLocationsIndex.build(files, tmp_path / "index")
+    is_found, coordinates = index.lookup(nodes_ids)
+
+    assert not index.is_dense
+    assert is_found.all()
+    assert coordinates[:, 0].tolist() == lons.tolist()
+    assert coordinates[:, 1].tolist() == lats.tolist()
+
+
+def test_nodes_locations_index_ways_grouping(tmp_path: Path) -> None:
+    """Test if grouping ways with the nodes locations index gives the same geometries."""
+    expected_result = PbfFileReader(working_directory=tmp_path).convert_pbf_to_geodataframe(
+        pbf_path=MONACO_PBF_FILE, ignore_cache=True
+    )
+    result = PbfFileReader(
+        working_directory=tmp_path, nodes_locations_index=True
+    ).convert_pbf_to_geodataframe(pbf_path=MONACO_PBF_FILE, ignore_cache=True)
+
+    assert len(result) == len(expected_result)
+    assert result.sort_index().geometry.equals(expected_result.sort_index().geometry)
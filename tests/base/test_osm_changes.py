@@ -0,0 +1,152 @@
+"""Tests for applying osmChange files to converted results."""
+
+import gzip
+from pathlib import Path
+
+import duckdb
+import geopandas as gpd
+import pytest
+
+from quackosm._constants import FEATURES_INDEX
+from quackosm._osm_changes import get_decoded_pbf_state, read_osm_changes
+from quackosm.pbf_file_reader import PbfFileReader
+
+MONACO_PBF_FILE = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+CREATED_NODE_ID = 99_999_999_999
+
+
+@pytest.mark.parametrize("compress", [False, True])  # type: ignore
+def test_read_osm_changes(compress: bool, tmp_path: Path) -> None:
+    """Test if the last change of each element is kept."""
+    osc_content = """<?xml version="1.0" encoding="UTF-8"?>
+    <osmChange version="0.6">
+        <create>
+            <node id="1" version="1" lat="1.0" lon="2.0"><tag k="amenity" v="bench"/></node>
+            <way id="2" version="1"><nd ref="1"/><nd ref="3"/></way>
+        </create>
+        <modify>
+            <node id="1" version="2" lat="1.5" lon="2.5"/>
+            <relation id="4" version="2">
+                <member type="way" ref="2" role="outer"/>
+                <tag k="type" v="multipolygon"/>
+            </relation>
+        </modify>
+        <delete>
+            <way id="2" version="2"/>
+        </delete>
+    </osmChange>
+    """
+    osc_path = tmp_path / ("changes.osc.gz" if compress else "changes.osc")
+    if compress:
+        with gzip.open(osc_path, "wt") as osc_file:
+            osc_file.write(osc_content)
+    else:
+        osc_path.write_text(osc_content)
+
+    osm_changes = read_osm_changes(osc_path)
+
+    assert osm_changes.changed_ids == {"node": [1], "way": [2], "relation": [4]}
+    assert osm_changes.changed_elements["node"].to_pylist() == [
+        dict(id=1, tags=None, refs=None, ref_roles=None, ref_types=None, lon=2.5, lat=1.5)
+    ]
+    assert osm_changes.changed_elements["way"].num_rows == 0
+    assert osm_changes.changed_elements["relation"].to_pylist() == [
+        dict(
+            id=4,
+            tags=[("type", "multipolygon")],
+            refs=[2],
+            ref_roles=["outer"],
+            ref_types=["way"],
+            lon=None,
+            lat=None,
+        )
+    ]
+
+
+def test_apply_changes(tmp_path: Path) -> None:
+    """Test if only features affected by changes are replaced in the result file."""
+    duckdb.load_extension("spatial")
+    (changed_way_id, changed_way_refs), (deleted_way_id, _) = duckdb.sql(
+        f"""
+        SELECT id, refs FROM ST_READOSM('{MONACO_PBF_FILE}')
+        WHERE kind = 'way' AND tags['building'] IS NOT NULL
+        ORDER BY id
+        LIMIT 2
+        """
+    ).fetchall()
+    moved_node_id, moved_node_lat, moved_node_lon = duckdb.sql(
+        f"""
+        SELECT id, lat, lon FROM ST_READOSM('{MONACO_PBF_FILE}')
+        WHERE kind = 'node' AND id = {changed_way_refs[1]}
+        """
+    ).fetchone()  # type: ignore[misc]
+
+    osc_path = tmp_path / "changes.osc"
+    osc_path.write_text(
+        f"""<?xml version="1.0" encoding="UTF-8"?>
+        <osmChange version="0.6">
+            <modify>
+                <node
+                    id="{moved_node_id}" version="2"
+                    lat="{moved_node_lat + 0.001}" lon="{moved_node_lon + 0.001}"
+                />
+            </modify>
+            <delete><way id="{deleted_way_id}" version="2"/></delete>
+            <create>
+                <node id="{CREATED_NODE_ID}" version="1" lat="43.73" lon="7.42">
+                    <tag k="amenity" v="bench"/>
+                </node>
+            </create>
+        </osmChange>
+        """
+    )
+
+    reader = PbfFileReader(working_directory=tmp_path)
+    result_file_path = reader.convert_pbf_to_parquet(
+        MONACO_PBF_FILE, result_file_path=tmp_path / "result.parquet", ignore_cache=True
+    )
+    original_result = gpd.read_parquet(result_file_path).set_index(FEATURES_INDEX)
+
+    reader.apply_changes(MONACO_PBF_FILE, osc_path, result_file_path)
+    changed_result = gpd.read_parquet(result_file_path).set_index(FEATURES_INDEX)
+
+    assert get_decoded_pbf_state(result_file_path) is not None
+    assert changed_result.index.is_unique
+    assert f"way/{deleted_way_id}" not in changed_result.index
+    assert dict(changed_result.loc[f"node/{CREATED_NODE_ID}", "tags"]) == {"amenity": "bench"}
+    assert not changed_result.loc[f"way/{changed_way_id}"].geometry.equals(
+        original_result.loc[f"way/{changed_way_id}"].geometry
+    )
+
+    common_index = original_result.index.intersection(changed_result.index)
+    changed_geometries = ~original_result.loc[common_index].geometry.geom_equals_exact(
+        changed_result.loc[common_index].geometry, tolerance=0
+    )
+    assert set(common_index[changed_geometries]) <= {
+        f"way/{changed_way_id}",
+        *(
+            f"way/{way_id}"
+            for (way_id,) in duckdb.sql(
+                f"""
+                SELECT id FROM ST_READOSM('{MONACO_PBF_FILE}')
+                WHERE kind = 'way' AND list_contains(refs, {moved_node_id})
+                """
+            ).fetchall()
+        ),
+    }
+    assert len(changed_result) == len(original_result)
+
+    # Second changes file is applied to the previous state of decoded elements
+    osc_path.write_text(
+        f"""<?xml version="1.0" encoding="UTF-8"?>
+        <osmChange version="0.6">
+            <delete><node id="{CREATED_NODE_ID}" version="2"/></delete>
+        </osmChange>
+        """
+    )
+    reader.apply_changes(MONACO_PBF_FILE, osc_path, result_file_path)
+    changed_result = gpd.read_parquet(result_file_path).set_index(FEATURES_INDEX)
+
+    assert f"node/{CREATED_NODE_ID}" not in changed_result.index
+    assert f"way/{deleted_way_id}" not in changed_result.index
+    assert len(changed_result) == len(original_result) - 1
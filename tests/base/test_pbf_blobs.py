@@ -0,0 +1,95 @@
+"""Tests for PBF file blobs indexing and splitting."""
+
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from quackosm._pbf_blobs import (
+    PBF_DATA_BLOB_TYPE,
+    PBF_HEADER_BLOB_TYPE,
+    PBF_SORTED_FEATURE,
+    read_pbf_blobs,
+    read_pbf_header_optional_features,
+    split_pbf_blobs_into_chunks,
+    write_pbf_chunk,
+)
+from quackosm.pbf_file_reader import PbfFileReader
+
+MONACO_PBF_FILE = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+
+
+def test_blobs_indexing() -> None:
+    """Test if blobs cover the whole file."""
+    blobs = read_pbf_blobs(MONACO_PBF_FILE)
+
+    assert blobs[0].blob_type == PBF_HEADER_BLOB_TYPE
+    assert all(blob.blob_type == PBF_DATA_BLOB_TYPE for blob in blobs[1:])
+    assert blobs[0].offset == 0
+    assert all(
+        previous_blob.offset + previous_blob.size == blob.offset
+        for previous_blob, blob in zip(blobs, blobs[1:])
+    )
+    assert blobs[-1].offset + blobs[-1].size == MONACO_PBF_FILE.stat().st_size
+
+
+def test_pbf_header_optional_features(tmp_path: Path) -> None:
+    """Test if sorting feature is read from the file header."""
+    assert PBF_SORTED_FEATURE in read_pbf_header_optional_features(MONACO_PBF_FILE)
+
+    blobs = read_pbf_blobs(MONACO_PBF_FILE)
+    data_blobs_only_path = tmp_path / "data_blobs_only.osm.pbf"
+    data_blobs_only_path.write_bytes(
+        MONACO_PBF_FILE.read_bytes()[blobs[1].offset : blobs[1].offset + blobs[1].size]
+    )
+    assert read_pbf_header_optional_features(data_blobs_only_path) == []
+
+    empty_file_path = tmp_path / "empty.osm.pbf"
+    empty_file_path.touch()
+    assert read_pbf_header_optional_features(empty_file_path) == []
+
+
+@pytest.mark.parametrize("number_of_chunks", [1, 2, 3, 100])  # type: ignore
+def test_blobs_chunks_decoding(number_of_chunks: int, tmp_path: Path) -> None:
+    """Test if decoded chunks contain the same elements as the whole file."""
+    blobs = read_pbf_blobs(MONACO_PBF_FILE)
+    chunks = split_pbf_blobs_into_chunks(blobs, number_of_chunks=number_of_chunks)
+    data_blobs = [blob for blob in blobs if blob.blob_type == PBF_DATA_BLOB_TYPE]
+
+    assert 1 <= len(chunks) <= min(number_of_chunks, len(data_blobs))
+    assert [blob for chunk in chunks for blob in chunk] == data_blobs
+
+    duckdb.load_extension("spatial")
+    chunks_paths = [
+        str(write_pbf_chunk(MONACO_PBF_FILE, blobs, chunk, tmp_path / f"{idx}.osm.pbf"))
+        for idx, chunk in enumerate(chunks)
+    ]
+    chunks_elements = duckdb.sql(
+        f"""
+        SELECT kind, id FROM ST_READOSM('{chunks_paths[0]}')
+        {" ".join(f"UNION ALL SELECT kind, id FROM ST_READOSM('{p}')" for p in chunks_paths[1:])}
+        """
+    )
+    file_elements = duckdb.sql(f"SELECT kind, id FROM ST_READOSM('{MONACO_PBF_FILE}')")
+
+    assert chunks_elements.count("*").fetchone() == file_elements.count("*").fetchone()
+    assert duckdb.sql(
+        f"""
+        SELECT COUNT(*) FROM (
+            ({file_elements.sql_query()}) EXCEPT ({chunks_elements.sql_query()})
+        )
+        """
+    ).fetchone() == (0,)
+
+
+def test_parallel_pbf_decoding(tmp_path: Path) -> None:
+    """Test if parallel decoding gives the same result as the default one."""
+    expected_result = PbfFileReader(working_directory=tmp_path).convert_pbf_to_geodataframe(
+        pbf_path=MONACO_PBF_FILE, ignore_cache=True
+    )
+    result = PbfFileReader(
+        working_directory=tmp_path, parallel_pbf_decoding=True
+    ).convert_pbf_to_geodataframe(pbf_path=MONACO_PBF_FILE, ignore_cache=True)
+
+    assert len(result) == len(expected_result)
+    assert set(result.index) == set(expected_result.index)
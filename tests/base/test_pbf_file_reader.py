@@ -2,6 +2,7 @@
 
 import json
 import random
+import shutil
 import warnings
 from functools import partial
 from itertools import permutations
@@ -43,8 +44,10 @@ from quackosm._constants import FEATURES_INDEX, GEOMETRY_COLUMN, METADATA_TAGS_T
 from quackosm._exceptions import (
     GeometryNotCoveredError,
     GeometryNotCoveredWarning,
+    InconsistentCheckpointError,
     InvalidGeometryFilter,
 )
+from quackosm._intersection import INTERSECTION_ENGINE
 from quackosm._osm_tags_filters import GroupedOsmTagsFilter, OsmTagsFilter
 from quackosm._rich_progress import VERBOSITY_MODE
 from quackosm.cli import (
@@ -175,6 +178,329 @@ def test_pbf_reader_geometry_filtering() -> None:
     assert len(features_gdf) == 0
 
 
+def test_multipart_geometry_filter_covering_boxes(tmp_path: Path) -> None:
+    """Test if nodes prefiltered with boxes of geometry parts give the same result."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    geometry_parts = [box(7.41, 43.72, 7.415, 43.725), box(7.42, 43.73, 7.425, 43.74)]
+
+    features_ids = set()
+    for geometry_part in geometry_parts:
+        features_ids.update(
+            PbfFileReader(geometry_filter=geometry_part, working_directory=tmp_path)
+            .convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+            .index
+        )
+    multipart_reader = PbfFileReader(
+        geometry_filter=MultiPolygon(geometry_parts), working_directory=tmp_path
+    )
+    multipart_features_gdf = multipart_reader.convert_pbf_to_geodataframe(
+        pbf_path=pbf_file, ignore_cache=True
+    )
+
+    assert multipart_reader._generate_geometry_filter_bbox_clause().count("BETWEEN") == 4
+    assert set(multipart_features_gdf.index) == features_ids
+
+
+def test_way_crossing_geometry_filter_without_nodes(tmp_path: Path) -> None:
+    """Test if a way crossing the geometry filter without any node inside is intersecting."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    duckdb.load_extension("spatial")
+    way_id, start_lon, start_lat, end_lon, end_lat = duckdb.sql(
+        f"""
+        WITH ways AS (
+            SELECT id, refs[1] AS start_ref, refs[2] AS end_ref
+            FROM ST_READOSM('{pbf_file}')
+            WHERE kind = 'way' AND tags['highway'] IS NOT NULL AND refs[1] != refs[-1]
+        ),
+        nodes AS (
+            SELECT id, lon, lat FROM ST_READOSM('{pbf_file}') WHERE kind = 'node'
+        )
+        SELECT w.id, s.lon, s.lat, e.lon, e.lat
+        FROM ways w
+        JOIN nodes s ON s.id = w.start_ref
+        JOIN nodes e ON e.id = w.end_ref
+        ORDER BY (s.lon - e.lon) ^ 2 + (s.lat - e.lat) ^ 2 DESC
+        LIMIT 1
+        """
+    ).fetchone()  # type: ignore[misc]
+    middle_lon, middle_lat = (start_lon + end_lon) / 2, (start_lat + end_lat) / 2
+    segment_length = ((start_lon - end_lon) ** 2 + (start_lat - end_lat) ** 2) ** 0.5
+    geometry_filter = Point(middle_lon, middle_lat).buffer(segment_length / 10)
+
+    features_gdf = PbfFileReader(
+        tags_filter={"highway": True},
+        geometry_filter=geometry_filter,
+        working_directory=tmp_path,
+    ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+    assert f"way/{way_id}" in features_gdf.index
+    assert not any(
+        geometry_filter.intersects(Point(coords))
+        for coords in features_gdf.loc[f"way/{way_id}"].geometry.coords
+    )
+
+
+@pytest.mark.parametrize("intersection_engine", ["auto", "duckdb"])  # type: ignore
+def test_polygon_set_geometry_filter(
+    intersection_engine: INTERSECTION_ENGINE, tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Test if polygon set gives the same features as the union of its parts."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    parts = [Point(7.41 + idx * 0.001, 43.73 + idx * 0.0005).buffer(0.002) for idx in range(20)]
+    polygon_set = GeometryCollection(parts)
+
+    engine_spy = mocker.spy(PbfFileReader, "_select_intersection_engine")
+    reader = PbfFileReader(
+        geometry_filter=polygon_set,
+        working_directory=tmp_path,
+        intersection_engine=intersection_engine,
+    )
+    polygon_set_result = reader.convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+    union_result = PbfFileReader(
+        geometry_filter=unary_union(parts), working_directory=tmp_path
+    ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+    assert engine_spy.spy_return == "python"
+    assert len(polygon_set_result) > 0
+    assert set(polygon_set_result.index) == set(union_result.index)
+
+    # Hash doesn't depend on the parts order, orientation and duplicates
+    reordered_polygon_set = GeometryCollection(
+        [polygon.orient(part, sign=-1.0) for part in parts[::-1]] + parts[:3]
+    )
+    assert (
+        PbfFileReader(geometry_filter=reordered_polygon_set)._generate_geometry_hash()
+        == reader._generate_geometry_hash()
+    )
+
+
+def test_intersection_engines(tmp_path: Path) -> None:
+    """Test if DuckDB and Python intersection engines give the same result."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    geometry_filter = Point(7.42, 43.735).buffer(0.005)
+
+    results = {}
+    for intersection_engine in ("python", "duckdb"):
+        reader = PbfFileReader(
+            geometry_filter=geometry_filter,
+            working_directory=tmp_path,
+            intersection_engine=intersection_engine,
+        )
+        results[intersection_engine] = reader.convert_pbf_to_geodataframe(
+            pbf_path=pbf_file, ignore_cache=True
+        )
+
+    assert len(results["python"]) > 0
+    assert set(results["python"].index) == set(results["duckdb"].index)
+
+
+def test_geometry_intersection_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if cached intersecting elements ids are reused with different tags filters."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    geometry_filter = Point(7.42, 43.735).buffer(0.005)
+    tags_filters: list[OsmTagsFilter] = [{"building": True}, {"highway": True, "amenity": True}]
+
+    expected_results = [
+        PbfFileReader(
+            tags_filter=tags_filter, geometry_filter=geometry_filter, working_directory=tmp_path
+        ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+        for tags_filter in tags_filters
+    ]
+
+    for run_idx, (tags_filter, expected_result) in enumerate(zip(tags_filters, expected_results)):
+        if run_idx > 0:
+            monkeypatch.setattr(
+                PbfFileReader,
+                "_select_intersection_engine",
+                lambda *args, **kwargs: pytest.fail("Nodes intersection should be cached"),
+            )
+        result = PbfFileReader(
+            tags_filter=tags_filter,
+            geometry_filter=geometry_filter,
+            working_directory=tmp_path,
+            cache_geometry_intersection=True,
+        ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+        assert len(result) > 0
+        assert set(result.index) == set(expected_result.index)
+
+    assert len(list((tmp_path / "geometry_intersection_cache").iterdir())) == 1
+
+
+def test_shared_ways_linestrings_construction(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test if filtered and required ways linestrings are constructed in one pass."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    ways_spy = mocker.spy(PbfFileReader, "_get_ways_with_linestrings")
+    result = PbfFileReader(
+        tags_filter={"building": True, "boundary": True}, working_directory=tmp_path
+    ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+    assert ways_spy.call_count == 1
+    assert result.index.str.startswith("way/").any()
+    assert result.index.str.startswith("relation/").any()
+
+
+def test_parallel_ways_linestrings_construction(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+) -> None:
+    """Test if constructing ways groups linestrings in parallel gives the same geometries."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    expected_result = PbfFileReader(working_directory=tmp_path).convert_pbf_to_geodataframe(
+        pbf_path=pbf_file, ignore_cache=True
+    )
+
+    monkeypatch.setattr(PbfFileReader, "ROWS_PER_GROUP_MEMORY_CONFIG", {0: 1_000})
+    monkeypatch.setattr(
+        PbfFileReader,
+        "_get_linestrings_workers_configuration",
+        lambda *args, **kwargs: (2, 512 * 1024**2),
+    )
+    pool_spy = mocker.spy(PbfFileReader, "_construct_ways_linestrings_in_pool")
+    result = PbfFileReader(working_directory=tmp_path).convert_pbf_to_geodataframe(
+        pbf_path=pbf_file, ignore_cache=True
+    )
+
+    assert any(len(call.kwargs["groups"]) > 1 for call in pool_spy.call_args_list)
+    assert len(result) == len(expected_result)
+    assert result.sort_index().geometry.equals(expected_result.sort_index().geometry)
+
+
+def test_parallel_ways_linestrings_construction_memory_error_retry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test if parallel ways linestrings construction is retried with smaller groups."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    expected_result = PbfFileReader(working_directory=tmp_path).convert_pbf_to_geodataframe(
+        pbf_path=pbf_file, ignore_cache=True
+    )
+
+    monkeypatch.setattr(PbfFileReader, "ROWS_PER_GROUP_MEMORY_CONFIG", {0: 500, 1: 2_000})
+    monkeypatch.setattr(
+        PbfFileReader,
+        "_get_linestrings_workers_configuration",
+        lambda *args, **kwargs: (2, 512 * 1024**2),
+    )
+    construct_in_pool = PbfFileReader._construct_ways_linestrings_in_pool
+    rows_per_group_in_calls = []
+
+    def _fail_first_call(self: PbfFileReader, *args: Any, **kwargs: Any) -> None:
+        rows_per_group_in_calls.append(self.internal_rows_per_group)
+        if len(rows_per_group_in_calls) == 1:
+            raise MemoryError()
+        construct_in_pool(self, *args, **kwargs)
+
+    monkeypatch.setattr(PbfFileReader, "_construct_ways_linestrings_in_pool", _fail_first_call)
+    result = PbfFileReader(working_directory=tmp_path).convert_pbf_to_geodataframe(
+        pbf_path=pbf_file, ignore_cache=True
+    )
+
+    assert rows_per_group_in_calls == [2_000, 500]
+    assert len(result) == len(expected_result)
+    assert result.sort_index().geometry.equals(expected_result.sort_index().geometry)
+
+
+@pytest.mark.parametrize(
+    "interrupted_stage_method,completed_stage_method",
+    [
+        ("_get_filtered_nodes_with_geometry", "_decode_pbf_file"),
+        (
+            "_get_filtered_ways_with_proper_geometry",
+            "_get_filtered_and_required_ways_with_linestrings",
+        ),
+        ("_concatenate_results_to_geoparquet", "_get_filtered_relations_with_geometry"),
+    ],
+)  # type: ignore
+def test_stages_checkpoint_resume(
+    interrupted_stage_method: str,
+    completed_stage_method: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test if interrupted conversion is resumed from the last completed stage."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    tags_filter: OsmTagsFilter = {"building": True, "highway": True, "boundary": True}
+    expected_result = PbfFileReader(
+        tags_filter=tags_filter, working_directory=tmp_path
+    ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+    def _interrupt(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("Conversion interrupted")
+
+    with monkeypatch.context() as m:
+        m.setattr(PbfFileReader, interrupted_stage_method, _interrupt)
+        with pytest.raises(RuntimeError, match="Conversion interrupted"):
+            PbfFileReader(
+                tags_filter=tags_filter, working_directory=tmp_path, checkpoint_stages=True
+            ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+    assert len(list((tmp_path / "runs").iterdir())) == 1
+
+    monkeypatch.setattr(
+        PbfFileReader,
+        completed_stage_method,
+        lambda *args, **kwargs: pytest.fail("Completed stage should be resumed"),
+    )
+    result = PbfFileReader(
+        tags_filter=tags_filter, working_directory=tmp_path, checkpoint_stages=True
+    ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+    assert not any((tmp_path / "runs").iterdir())
+    assert len(result) == len(expected_result)
+    assert set(result.index) == set(expected_result.index)
+
+
+def test_reader_closes_worker_pool(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test if reader and one-shot functions stop worker processes after conversion."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    geometry_filter = Point(7.42, 43.735).buffer(0.005)
+
+    with PbfFileReader(
+        geometry_filter=geometry_filter, working_directory=tmp_path, intersection_engine="python"
+    ) as reader:
+        reader.convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+        assert reader._worker_pool is not None
+
+    assert reader._worker_pool is None
+
+    close_spy = mocker.spy(PbfFileReader, "close")
+    convert_pbf_to_parquet(
+        pbf_path=pbf_file,
+        geometry_filter=geometry_filter,
+        working_directory=tmp_path,
+        intersection_engine="python",
+        ignore_cache=True,
+    )
+
+    assert close_spy.call_count == 1
+
+
+def test_inconsistent_stages_checkpoint(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if resuming with unexpectedly missing files of a completed stage raises an error."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+
+    def _interrupt(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("Conversion interrupted")
+
+    with monkeypatch.context() as m:
+        m.setattr(PbfFileReader, "_get_filtered_ways_with_proper_geometry", _interrupt)
+        with pytest.raises(RuntimeError, match="Conversion interrupted"):
+            PbfFileReader(
+                working_directory=tmp_path, checkpoint_stages=True
+            ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+    (run_dir_path,) = (tmp_path / "runs").iterdir()
+    checkpoint = json.loads((run_dir_path / "checkpoint.json").read_text())
+    # Filtered nodes ids are deleted on purpose, while valid nodes are still needed
+    assert "nodes_filtered_ids" in checkpoint["deleted_directories"]
+    assert "nodes_valid_with_tags" not in checkpoint["deleted_directories"]
+    shutil.rmtree(run_dir_path / "nodes_valid_with_tags")
+
+    with pytest.raises(InconsistentCheckpointError, match="inconsistent"):
+        PbfFileReader(
+            working_directory=tmp_path, checkpoint_stages=True
+        ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+
 @pytest.mark.parametrize(
     "geometry",
     [
@@ -665,6 +991,94 @@ def test_metadata_tags_ignoring(ignore_metadata_tags: bool) -> None:
         assert any(tag in all_tags for tag in METADATA_TAGS_TO_IGNORE)
 
 
+@pytest.mark.parametrize(
+    "tags_filter,geometry_filter",
+    [
+        (None, None),
+        (HEX2VEC_FILTER, None),
+        ({"building": True, "addr:*": True}, geometry_box()),
+    ],
+)  # type: ignore
+def test_decoded_pbf_cache(
+    tags_filter: Optional[OsmTagsFilter], geometry_filter: Optional[BaseGeometry], tmp_path: Path
+) -> None:
+    """Test if decoded PBF cache is reused and gives the same results."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    expected_result = PbfFileReader(
+        tags_filter=tags_filter, geometry_filter=geometry_filter, working_directory=tmp_path
+    ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+    for _ in range(2):
+        result = PbfFileReader(
+            tags_filter=tags_filter,
+            geometry_filter=geometry_filter,
+            working_directory=tmp_path,
+            cache_decoded_pbf=True,
+        ).convert_pbf_to_geodataframe(pbf_path=pbf_file, ignore_cache=True)
+
+        assert (tmp_path / "decoded_pbf_cache").exists()
+        assert len(result) == len(expected_result)
+        assert set(result.index) == set(expected_result.index)
+
+
+def test_wildcard_tags_filter_expansion(tmp_path: Path) -> None:
+    """Test if wildcard keys are expanded using the tag keys catalog."""
+    pbf_file = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+    duckdb.load_extension("spatial")
+    expected_keys = {
+        row[0]
+        for row in duckdb.sql(
+            f"SELECT DISTINCT unnest(map_keys(tags)) FROM ST_READOSM('{pbf_file}')"
+        ).fetchall()
+        if row[0].startswith("addr:") or row[0].startswith("name:")
+    }
+
+    for _ in range(2):
+        reader = PbfFileReader(
+            tags_filter={"addr:*": True, "name:*": True},
+            working_directory=tmp_path,
+            cache_decoded_pbf=True,
+        )
+        reader.convert_pbf_to_parquet(pbf_path=pbf_file, ignore_cache=True)
+
+        assert reader.expanded_tags_filter is not None
+        assert set(reader.expanded_tags_filter.keys()) == expected_keys
+        assert reader.decoded_pbf_cache_path is not None
+        assert (
+            reader.decoded_pbf_cache_path / "pbf_decoded" / "tag_keys_statistics.parquet"
+        ).exists()
+
+
+def test_tags_filter_per_element_kind() -> None:
+    """Test if tags filter clauses are adjusted to tag keys statistics of each element kind."""
+    reader = PbfFileReader(tags_filter={"building": True, "amenity": "bench", "area": False})
+    reader.merged_tags_filter = {"building": True, "amenity": "bench", "area": False}
+    reader.tag_keys_statistics = {
+        "node": {"amenity": 100, "building": 1},
+        "way": {"building": 1000, "area": 10},
+        "relation": {"type": 10},
+    }
+
+    nodes_filter = reader._generate_osm_tags_sql_filter("node")
+    assert nodes_filter.index("'amenity'") < nodes_filter.index("'building'")
+    assert "'area'" not in nodes_filter
+
+    ways_filter = reader._generate_osm_tags_sql_filter("way")
+    assert "'building'" in ways_filter and "'amenity'" not in ways_filter
+    assert "not list_contains(map_keys(tags), 'area')" in ways_filter
+
+    assert reader._generate_osm_tags_sql_filter("relation") == "(1=0)"
+    assert reader._is_tags_filter_matching_kind("node")
+    assert reader._is_tags_filter_matching_kind("way")
+    assert not reader._is_tags_filter_matching_kind("relation")
+
+    reader.tag_keys_statistics = None
+    assert reader._is_tags_filter_matching_kind("relation")
+    assert (
+        reader._generate_osm_tags_sql_filter("relation") == reader._generate_osm_tags_sql_filter()
+    )
+
+
 def check_if_relation_in_osm_is_valid_based_on_tags(pbf_file: str, relation_id: str) -> bool:
     """Check if given relation in OSM is valid."""
     duckdb.load_extension("spatial")
@@ -0,0 +1,122 @@
+"""Tests for PBF file sidecar spatial index."""
+
+import shutil
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from pytest_mock import MockerFixture
+from shapely.geometry import box
+
+from quackosm._pbf_index import get_pbf_index_path, load_pbf_index
+from quackosm.pbf_file_reader import PbfFileReader
+
+MONACO_PBF_FILE = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+# Two clusters of nodes saved in separate blobs and a way connecting them
+CROSSING_WAY_PBF_FILE = Path(__file__).parent.parent / "test_files" / "crossing_way.osm.pbf"
+GEOMETRY_FILTER = box(7.41, 43.72, 7.43, 43.74)
+
+
+@pytest.fixture  # type: ignore
+def pbf_file_copy(tmp_path: Path, mocker: MockerFixture) -> Path:
+    """Copy of the Monaco PBF file with index divided into multiple chunks."""
+    mocker.patch("quackosm.pbf_file_reader.PBF_INDEX_CHUNK_SIZE_BYTES", 16 * 1024)
+    pbf_path = tmp_path / MONACO_PBF_FILE.name
+    shutil.copy(MONACO_PBF_FILE, pbf_path)
+    return pbf_path
+
+
+def test_pbf_index_building(pbf_file_copy: Path) -> None:
+    """Test if index is saved next to the PBF file and describes all elements kinds."""
+    PbfFileReader(
+        working_directory=pbf_file_copy.parent, pbf_spatial_index=True
+    ).convert_pbf_to_parquet(pbf_path=pbf_file_copy, ignore_cache=True)
+
+    assert get_pbf_index_path(pbf_file_copy).exists()
+    index_table = load_pbf_index(pbf_file_copy)
+    assert index_table is not None
+    assert set(index_table["kind"].to_pylist()) == {"node", "way", "relation"}
+    assert len(set(index_table["chunk_index"].to_pylist())) > 1
+
+    with pbf_file_copy.open("ab") as pbf_file:
+        pbf_file.write(b"\x00")
+
+    assert load_pbf_index(pbf_file_copy) is None
+
+
+@pytest.mark.parametrize("move_nodes_chunks", [False, True])  # type: ignore
+def test_pbf_index_geometry_filtering(pbf_file_copy: Path, move_nodes_chunks: bool) -> None:
+    """Test if reading with the index gives the same result as reading the whole file."""
+    expected_result = PbfFileReader(
+        geometry_filter=GEOMETRY_FILTER, working_directory=pbf_file_copy.parent
+    ).convert_pbf_to_geodataframe(pbf_path=pbf_file_copy, ignore_cache=True)
+
+    PbfFileReader(
+        working_directory=pbf_file_copy.parent, pbf_spatial_index=True
+    ).convert_pbf_to_parquet(pbf_path=pbf_file_copy, ignore_cache=True)
+
+    if move_nodes_chunks:
+        # Every other nodes chunk will be treated as disjoint with the geometry filter
+        # and has to be read only because of ways referencing its nodes.
+        index_table = load_pbf_index(pbf_file_copy)
+        assert index_table is not None
+        is_moved = [
+            kind == "node" and idx % 2 == 1
+            for idx, kind in enumerate(index_table["kind"].to_pylist())
+        ]
+        for column, value in (("min_lon", 50.0), ("max_lon", 51.0)):
+            index_table = index_table.set_column(
+                index_table.schema.get_field_index(column),
+                column,
+                pa.array(
+                    [
+                        value if moved else current_value
+                        for moved, current_value in zip(is_moved, index_table[column].to_pylist())
+                    ]
+                ),
+            )
+        pq.write_table(index_table, get_pbf_index_path(pbf_file_copy))
+
+    result = PbfFileReader(
+        geometry_filter=GEOMETRY_FILTER,
+        working_directory=pbf_file_copy.parent,
+        pbf_spatial_index=True,
+    ).convert_pbf_to_geodataframe(pbf_path=pbf_file_copy, ignore_cache=True)
+
+    assert len(result) == len(expected_result)
+    assert set(result.index) == set(expected_result.index)
+
+
+@pytest.mark.parametrize("pbf_spatial_index", [False, True])  # type: ignore
+def test_pbf_index_crossing_way(
+    tmp_path: Path, mocker: MockerFixture, pbf_spatial_index: bool
+) -> None:
+    """Test if ways crossing the geometry filter without any vertex inside are kept."""
+    mocker.patch("quackosm.pbf_file_reader.PBF_INDEX_CHUNK_SIZE_BYTES", 100)
+    pbf_path = tmp_path / CROSSING_WAY_PBF_FILE.name
+    shutil.copy(CROSSING_WAY_PBF_FILE, pbf_path)
+    geometry_filter = box(0.4, -0.01, 0.6, 0.01)
+
+    if pbf_spatial_index:
+        PbfFileReader(working_directory=tmp_path, pbf_spatial_index=True).convert_pbf_to_parquet(
+            pbf_path=pbf_path, ignore_cache=True
+        )
+        index_table = load_pbf_index(pbf_path)
+        assert index_table is not None
+        # Both nodes chunks are disjoint with the geometry filter
+        assert not any(
+            geometry_filter.intersects(
+                box(row["min_lon"], row["min_lat"], row["max_lon"], row["max_lat"])
+            )
+            for row in index_table.to_pylist()
+            if row["kind"] == "node"
+        )
+
+    result = PbfFileReader(
+        geometry_filter=geometry_filter,
+        working_directory=tmp_path,
+        pbf_spatial_index=pbf_spatial_index,
+    ).convert_pbf_to_geodataframe(pbf_path=pbf_path, ignore_cache=True)
+
+    assert list(result.index) == ["way/1"]
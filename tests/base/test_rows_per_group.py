@@ -0,0 +1,131 @@
+"""Tests for ways rows per group estimation."""
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from quackosm._rows_per_group import (
+    ROWS_PER_GROUP_MEMORY_BUDGET_FRACTION,
+    count_parquet_rows,
+    estimate_group_memory,
+    estimate_number_of_workers,
+    estimate_rows_per_group,
+    get_memory_budget,
+)
+
+MEMORY_1GB = 1024**3
+
+
+def test_count_parquet_rows(tmp_path: Path) -> None:
+    """Test if rows are counted from parquet metadata."""
+    for file_index, number_of_rows in enumerate((10, 0, 25)):
+        pq.write_table(
+            pa.table({"id": pa.array(range(number_of_rows), type=pa.int64())}),
+            tmp_path / f"{file_index}.parquet",
+        )
+
+    assert count_parquet_rows(tmp_path.glob("*.parquet")) == 35
+
+
+@pytest.mark.parametrize("average_refs_per_way", [1.0, 4.5, 12.0, 250.0])  # type: ignore
+@pytest.mark.parametrize("available_memory", [MEMORY_1GB, 8 * MEMORY_1GB, 32 * MEMORY_1GB])  # type: ignore
+def test_estimated_group_fits_in_memory(average_refs_per_way: float, available_memory: int) -> None:
+    """Test if estimated group fits in the memory budget and the next bigger one doesn't."""
+    rows_per_group = estimate_rows_per_group(
+        average_refs_per_way=average_refs_per_way,
+        available_memory=available_memory,
+        min_rows_per_group=1,
+        max_rows_per_group=1_000_000_000,
+    )
+    memory_budget = available_memory * ROWS_PER_GROUP_MEMORY_BUDGET_FRACTION
+
+    assert estimate_group_memory(rows_per_group, average_refs_per_way) <= memory_budget
+    assert estimate_group_memory(rows_per_group + 1, average_refs_per_way) > memory_budget
+
+
+def test_estimated_rows_per_group_is_bounded() -> None:
+    """Test if estimated rows per group respects provided bounds."""
+    assert (
+        estimate_rows_per_group(
+            average_refs_per_way=10_000,
+            available_memory=MEMORY_1GB,
+            min_rows_per_group=10_000,
+            max_rows_per_group=48_000_000,
+        )
+        == 10_000
+    )
+    assert (
+        estimate_rows_per_group(
+            average_refs_per_way=2,
+            available_memory=1024 * MEMORY_1GB,
+            min_rows_per_group=10_000,
+            max_rows_per_group=48_000_000,
+        )
+        == 48_000_000
+    )
+
+
+def test_rows_per_group_decreases_with_refs_per_way() -> None:
+    """Test if ways with more refs are split into smaller groups."""
+    rows_per_group = [
+        estimate_rows_per_group(
+            average_refs_per_way=average_refs_per_way,
+            available_memory=16 * MEMORY_1GB,
+            min_rows_per_group=1,
+            max_rows_per_group=1_000_000_000,
+        )
+        for average_refs_per_way in (2, 8, 32)
+    ]
+
+    assert rows_per_group == sorted(rows_per_group, reverse=True)
+    assert len(set(rows_per_group)) == 3
+
+
+@pytest.mark.parametrize("number_of_workers", [1, 2, 8])  # type: ignore
+def test_estimated_groups_fit_in_memory_together(number_of_workers: int) -> None:
+    """Test if groups processed by all workers at the same time fit in the memory budget."""
+    average_refs_per_way = 6.0
+    available_memory = 8 * MEMORY_1GB
+    rows_per_group = estimate_rows_per_group(
+        average_refs_per_way=average_refs_per_way,
+        available_memory=available_memory,
+        min_rows_per_group=1,
+        max_rows_per_group=1_000_000_000,
+        number_of_workers=number_of_workers,
+    )
+    group_memory = estimate_group_memory(rows_per_group, average_refs_per_way)
+
+    assert group_memory * number_of_workers <= get_memory_budget(available_memory)
+    assert (
+        estimate_number_of_workers(
+            groups_memory=[group_memory] * 16,
+            available_memory=available_memory,
+            max_number_of_workers=number_of_workers,
+        )
+        == number_of_workers
+    )
+
+
+@pytest.mark.parametrize(
+    "groups_memory,max_number_of_workers,expected_number_of_workers",
+    [
+        ([MEMORY_1GB, 2 * MEMORY_1GB], 8, 2),
+        ([MEMORY_1GB // 4] * 10, 4, 4),
+        ([16 * MEMORY_1GB], 8, 1),
+        ([], 4, 4),
+    ],
+)  # type: ignore
+def test_estimated_number_of_workers(
+    groups_memory: list[int], max_number_of_workers: int, expected_number_of_workers: int
+) -> None:
+    """Test if number of workers is limited by the biggest group memory."""
+    assert (
+        estimate_number_of_workers(
+            groups_memory=groups_memory,
+            available_memory=8 * MEMORY_1GB,
+            max_number_of_workers=max_number_of_workers,
+        )
+        == expected_number_of_workers
+    )
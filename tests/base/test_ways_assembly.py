@@ -0,0 +1,147 @@
+"""Tests for vectorised ways geometries assembly."""
+
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from quackosm._ways_assembly import POINT_TYPE, assemble_ways_linestrings, build_ways_geometries
+from quackosm.pbf_file_reader import PbfFileReader, _set_up_duckdb_connection
+
+MONACO_PBF_FILE = Path(__file__).parent.parent / "test_files" / "monaco.osm.pbf"
+
+
+@pytest.mark.parametrize(
+    "coordinates,is_polygon_candidate,expected_wkt",
+    [
+        ([(0, 0), (1, 0), (1, 1), (0, 0)], True, "POLYGON ((0 0, 1 0, 1 1, 0 0))"),
+        ([(0, 0), (1, 0), (1, 1), (0, 0)], False, "LINESTRING (0 0, 1 0, 1 1, 0 0)"),
+        ([(0, 0), (1, 0), (1, 0), (1, 1), (0, 0)], True, "POLYGON ((0 0, 1 0, 1 1, 0 0))"),
+        ([(0, 0), (1, 0), (1, 0), (0, 0)], True, "LINESTRING (0 0, 1 0, 0 0)"),
+        ([(0, 0), (1, 0), (1, 0)], True, "LINESTRING (0 0, 1 0)"),
+        ([(0, 0), (0, 0), (0, 0)], False, "LINESTRING (0 0, 0 0)"),
+        ([(0, 0)], False, "LINESTRING (0 0)"),
+        ([(0.123456789, 0), (0.12345679, 0), (1, 1)], False, "LINESTRING (0.1234568 0, 1 1)"),
+        # Endpoints are equal only after rounding, so the way isn't closed
+        ([(0, 0), (1, 0), (1, 1), (1e-8, 0)], True, "LINESTRING (0 0, 1 0, 1 1, 0 0)"),
+    ],
+)  # type: ignore
+def test_build_ways_geometries(
+    coordinates: list[tuple[float, float]], is_polygon_candidate: bool, expected_wkt: str
+) -> None:
+    """Test if repeated points are removed and closed ways are detected."""
+    ways_points = pa.table(
+        {
+            "id": pa.array([1] * len(coordinates), type=pa.int64()),
+            "point": pa.array([dict(x=x, y=y) for x, y in coordinates], type=POINT_TYPE),
+            "ref_idx": pa.array(range(len(coordinates)), type=pa.int64()),
+        }
+    )[::-1]
+    linestrings = assemble_ways_linestrings(ways_points)["linestring"].combine_chunks()
+    geometries, is_polygon = build_ways_geometries(linestrings, np.array([is_polygon_candidate]))
+
+    connection = duckdb.connect()
+    connection.load_extension("spatial")
+    (wkt,) = connection.execute(
+        "SELECT ST_AsText(ST_GeomFromWKB(?))", [geometries[0].as_py()]
+    ).fetchone()  # type: ignore[misc]
+
+    assert is_polygon.tolist() == [expected_wkt.startswith("POLYGON")]
+    assert wkt == expected_wkt
+
+
+def test_assemble_ways_linestrings() -> None:
+    """Test if points are sorted by ways ids and references indexes."""
+    ways_points = pa.table(
+        {
+            "id": pa.array([2, 1, 2, 1, 3], type=pa.int64()),
+            "point": pa.array([dict(x=float(x), y=0.0) for x in range(5)], type=POINT_TYPE),
+            "ref_idx": pa.array([1, 1, 0, 0, 0], type=pa.int64()),
+        }
+    )
+    result = assemble_ways_linestrings(ways_points)
+
+    assert result["id"].to_pylist() == [1, 2, 3]
+    assert [[point["x"] for point in ls] for ls in result["linestring"].to_pylist()] == [
+        [3.0, 1.0],
+        [2.0, 0.0],
+        [4.0],
+    ]
+
+
+def test_numpy_way_assembly_engine(tmp_path: Path) -> None:
+    """Test if numpy way assembly engine gives the same geometries."""
+    expected_result = PbfFileReader(working_directory=tmp_path).convert_pbf_to_geodataframe(
+        pbf_path=MONACO_PBF_FILE, ignore_cache=True
+    )
+    result = PbfFileReader(
+        working_directory=tmp_path, way_assembly_engine="numpy"
+    ).convert_pbf_to_geodataframe(pbf_path=MONACO_PBF_FILE, ignore_cache=True)
+
+    assert len(result) == len(expected_result)
+    assert result.sort_index().geometry.equals(expected_result.sort_index().geometry)
+
+
+def test_build_ways_geometries_null_linestrings() -> None:
+    """Test if missing linestrings are kept as nulls."""
+    linestrings = pa.array(
+        [[dict(x=0.0, y=0.0), dict(x=1.0, y=1.0)], None], type=pa.large_list(POINT_TYPE)
+    )
+    geometries, is_polygon = build_ways_geometries(linestrings, np.array([True, True]))
+
+    assert geometries.is_valid().to_pylist() == [True, False]
+    assert is_polygon.tolist() == [False, False]
+
+
+def test_build_ways_geometries_parity_with_duckdb(tmp_path: Path) -> None:
+    """Test if numpy engine builds the same geometries as DuckDB engine for Monaco ways."""
+    connection = _set_up_duckdb_connection(tmp_dir_path=tmp_path)
+    ways_linestrings = connection.sql(
+        f"""
+        WITH elements AS (
+            SELECT * FROM ST_ReadOSM('{MONACO_PBF_FILE}')
+        ),
+        ways_refs AS (
+            SELECT id, UNNEST(refs) AS ref, UNNEST(range(len(refs))) AS ref_idx
+            FROM elements
+            WHERE kind = 'way'
+        )
+        SELECT
+            w.id,
+            list(struct_pack(x := n.lon, y := n.lat) ORDER BY w.ref_idx) AS linestring
+        FROM ways_refs w
+        JOIN elements n ON n.kind = 'node' AND n.id = w.ref
+        GROUP BY w.id
+        UNION ALL
+        SELECT -1, NULL
+        """
+    ).arrow()
+    geometries, _ = build_ways_geometries(
+        ways_linestrings["linestring"].combine_chunks(),
+        np.ones(len(ways_linestrings), dtype=bool),
+    )
+    connection.register("ways_linestrings", ways_linestrings)
+    connection.register(
+        "numpy_geometries", pa.table({"id": ways_linestrings["id"], "wkb": geometries})
+    )
+
+    mismatched_ways = connection.sql(
+        """
+        SELECT w.id
+        FROM ways_linestrings w
+        JOIN numpy_geometries g ON g.id = w.id
+        WHERE ST_AsText(
+            CASE
+                WHEN ST_Equals(w.linestring[1]::POINT_2D, w.linestring[-1]::POINT_2D)
+                AND ST_NPoints(linestring_to_linestring_geometry(w.linestring)) >= 4
+                THEN linestring_to_polygon_geometry(w.linestring)
+                ELSE linestring_to_linestring_geometry(w.linestring)
+            END
+        ) IS DISTINCT FROM ST_AsText(ST_GeomFromWKB(g.wkb))
+        """
+    ).fetchall()
+
+    assert geometries.null_count == 1
+    assert mismatched_ways == []
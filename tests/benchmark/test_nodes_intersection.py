@@ -0,0 +1,71 @@
+"""Benchmark nodes intersection with complex geometry filter."""
+
+import time
+from typing import Any, Callable
+
+import geoarrow.pyarrow as ga
+import numpy as np
+import pyarrow as pa
+from shapely import Polygon, STRtree
+
+from quackosm._intersection import _intersect_nodes, build_geometry_filter_grid
+
+
+def _intersect_nodes_with_points_tree(table: pa.Table, geometry_filter: Polygon) -> pa.Table:
+    points_array = ga.to_geopandas(
+        ga.point().from_geobuffers(None, x=table["lon"].to_numpy(), y=table["lat"].to_numpy())
+    )
+    tree = STRtree(points_array)
+    return pa.table({"id": table["id"].take(tree.query(geometry_filter, predicate="intersects"))})
+
+
+def _generate_complex_boundary(number_of_vertices: int) -> Polygon:
+    rng = np.random.default_rng(42)
+    angles = np.linspace(0, 2 * np.pi, number_of_vertices, endpoint=False)
+    radius = (
+        1
+        + 0.2 * np.sin(angles * 50)
+        + 0.02 * np.sin(angles * 1000)
+        + rng.uniform(-1e-4, 1e-4, number_of_vertices)
+    )
+    return Polygon(np.column_stack((19 + radius * np.cos(angles), 52 + radius * np.sin(angles))))
+
+
+def test_nodes_intersection_benchmark(record_property: Callable[[str, Any], None]) -> None:
+    """Test if prepared geometry and grid intersections are faster than points tree."""
+    geometry_filter = _generate_complex_boundary(100_000)
+    rng = np.random.default_rng(0)
+    number_of_nodes = 1_000_000
+    table = pa.table(
+        {
+            "id": np.arange(number_of_nodes, dtype=np.int64),
+            "lon": rng.uniform(17.5, 20.5, number_of_nodes),
+            "lat": rng.uniform(50.5, 53.5, number_of_nodes),
+        }
+    )
+
+    start_time = time.perf_counter()
+    expected_result = _intersect_nodes_with_points_tree(table, geometry_filter)
+    points_tree_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result = _intersect_nodes(table, geometry_filter)
+    prepared_geometry_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    geometry_filter_grid = build_geometry_filter_grid(geometry_filter)
+    grid_building_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    grid_result = _intersect_nodes(table, geometry_filter, geometry_filter_grid)
+    grid_time = time.perf_counter() - start_time
+
+    record_property("points_tree_seconds", points_tree_time)
+    record_property("prepared_geometry_seconds", prepared_geometry_time)
+    record_property("grid_seconds", grid_time)
+    record_property("grid_building_seconds", grid_building_time)
+
+    assert set(result["id"].to_pylist()) == set(expected_result["id"].to_pylist())
+    assert grid_result.equals(result)
+    assert prepared_geometry_time < points_tree_time
+    assert grid_time < prepared_geometry_time
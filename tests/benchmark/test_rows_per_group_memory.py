@@ -0,0 +1,83 @@
+"""Benchmark memory used by ways groups linestrings assembly to calibrate rows per group."""
+
+import multiprocessing
+import resource
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from quackosm._rows_per_group import WAY_MEMORY_BYTES, WAY_POINT_MEMORY_BYTES
+from quackosm._ways_assembly import POINT_TYPE
+from quackosm.pbf_file_reader import _construct_ways_group_linestrings
+
+AVERAGE_REFS_PER_WAY = 8
+MEMORY_LIMIT_MB = 16 * 1024
+
+
+def _write_ways_group(group_path: Path, number_of_ways: int) -> None:
+    rng = np.random.default_rng(0)
+    number_of_points = number_of_ways * AVERAGE_REFS_PER_WAY
+    group_path.mkdir(parents=True)
+    pq.write_table(
+        pa.table(
+            {
+                "id": np.repeat(
+                    rng.permutation(number_of_ways).astype(np.int64), AVERAGE_REFS_PER_WAY
+                ),
+                "point": pa.StructArray.from_arrays(
+                    [
+                        pa.array(rng.uniform(-180, 180, number_of_points)),
+                        pa.array(rng.uniform(-90, 90, number_of_points)),
+                    ],
+                    fields=list(POINT_TYPE),
+                ),
+                "ref_idx": np.tile(np.arange(AVERAGE_REFS_PER_WAY, dtype=np.int64), number_of_ways),
+            }
+        ),
+        group_path / "data_0.parquet",
+    )
+
+
+def _measure_peak_memory(number_of_ways: int, way_assembly_engine: str) -> int:
+    with tempfile.TemporaryDirectory() as tmp_dir_name:
+        tmp_dir_path = Path(tmp_dir_name)
+        _write_ways_group(tmp_dir_path / "grouped" / "group=0", number_of_ways)
+        _construct_ways_group_linestrings(
+            group=0,
+            grouped_ways_path=tmp_dir_path / "grouped",
+            destination_dir_path=tmp_dir_path / "linestrings",
+            tmp_dir_path=tmp_dir_path,
+            compression="zstd",
+            memory_limit_mb=MEMORY_LIMIT_MB,
+            way_assembly_engine=way_assembly_engine,  # type: ignore[arg-type]
+        )
+    # Maximum resident set size is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@pytest.mark.parametrize("way_assembly_engine", ["duckdb", "numpy"])  # type: ignore
+def test_rows_per_group_memory_model(
+    way_assembly_engine: str, record_property: Callable[[str, Any], None]
+) -> None:
+    """Check if the memory model covers the measured memory of a single ways group."""
+    measured_memory = {}
+    for number_of_ways in (250_000, 2_000_000):
+        # Each measurement runs in a fresh process to get its own peak memory
+        with multiprocessing.get_context("spawn").Pool(processes=1) as pool:
+            measured_memory[number_of_ways] = pool.apply(
+                _measure_peak_memory, (number_of_ways, way_assembly_engine)
+            )
+
+    (small_group, small_memory), (big_group, big_memory) = measured_memory.items()
+    measured_way_memory = (big_memory - small_memory) / (big_group - small_group)
+    modelled_way_memory = AVERAGE_REFS_PER_WAY * WAY_POINT_MEMORY_BYTES + WAY_MEMORY_BYTES
+
+    record_property("measured_way_memory_bytes", measured_way_memory)
+    record_property("modelled_way_memory_bytes", modelled_way_memory)
+
+    assert measured_way_memory <= modelled_way_memory